@@ -2,6 +2,7 @@ import streamlit as st
 import pandas as pd
 from sqlalchemy import create_engine
 from db import DB_NAME, DB_USER, DB_PASSWORD, DB_HOST, DB_PORT
+from data_cache import CachedDataFetcher, DataChangeListener
 from datetime import datetime
 import math
 
@@ -21,10 +22,10 @@ class DatabaseConnector:
         """Creates a SQLAlchemy engine."""
         return create_engine(f'postgresql://{self.db_user}:{self.db_password}@{self.db_host}:{self.db_port}/{self.db_name}')
 
-    def fetch_data(self, query):
-        """Fetches data from the database using the provided query."""
+    def fetch_data(self, query, params=None):
+        """Fetches data from the database using the provided query and optional parameters."""
         with self.engine.connect() as conn:
-            df = pd.read_sql_query(query, conn)
+            df = pd.read_sql_query(query, conn, params=params)
         return df
 
 class DataFetcher:
@@ -54,82 +55,202 @@ class DataFetcher:
         tags_df = self.db_connector.fetch_data(tags_query)
         return frases_df, autores_df, tags_df
 
+    def get_quotes_page(self, after_id=0, limit=10):
+        """Fetches the quotes that follow `after_id` in frase_id order (keyset pagination)."""
+        query = """
+        SELECT frase.frase_id, frase.frase_texto, autor.autor_id, autor.autor_nombre, autor.autor_apellido, autor.autor_url,
+               COALESCE(array_agg(tag.tag_texto ORDER BY tag.tag_texto) FILTER (WHERE tag.tag_texto IS NOT NULL), '{}') as tags
+        FROM (
+            SELECT frase_id, frase_texto, autor_id
+            FROM frase
+            WHERE frase_id > %(after_id)s
+            ORDER BY frase_id
+            LIMIT %(limit)s
+        ) frase
+        JOIN autor ON frase.autor_id = autor.autor_id
+        LEFT JOIN frase_tag ON frase.frase_id = frase_tag.frase_id
+        LEFT JOIN tag ON frase_tag.tag_id = tag.tag_id
+        GROUP BY frase.frase_id, frase.frase_texto, autor.autor_id, autor.autor_nombre, autor.autor_apellido, autor.autor_url
+        ORDER BY frase.frase_id
+        """
+        return self.db_connector.fetch_data(query, {'after_id': int(after_id), 'limit': int(limit)})
+
+    def get_authors_page(self, after_id=0, limit=10):
+        """Fetches the authors that follow `after_id` in autor_id order (keyset pagination)."""
+        query = """
+        SELECT autor_id, autor_nombre, autor_apellido, autor_fecha_nac, autor_lugar_nac, autor_descripcion
+        FROM autor
+        WHERE autor_id > %(after_id)s
+        ORDER BY autor_id
+        LIMIT %(limit)s
+        """
+        return self.db_connector.fetch_data(query, {'after_id': int(after_id), 'limit': int(limit)})
+
+    def get_quotes_count(self):
+        """Returns the total number of quotes."""
+        return int(self.db_connector.fetch_data("SELECT count(*) FROM frase").iloc[0, 0])
+
+    def get_authors_count(self):
+        """Returns the total number of authors."""
+        return int(self.db_connector.fetch_data("SELECT count(*) FROM autor").iloc[0, 0])
+
+    def get_statistics(self):
+        """Fetches the pre-aggregated statistics maintained by the updater (materialized views)."""
+        frases_por_autor = self.db_connector.fetch_data(
+            "SELECT full_name, counts FROM mv_frases_por_autor ORDER BY full_name")
+        frases_por_tag = self.db_connector.fetch_data(
+            "SELECT tags, counts FROM mv_frases_por_tag ORDER BY tags")
+        totales = self.db_connector.fetch_data(
+            "SELECT total_frases, total_autores, total_tags FROM mv_totales")
+        return frases_por_autor, frases_por_tag, totales
+
+    def data_version(self):
+        """Returns the data version bumped by the updater after each load."""
+        return int(self.db_connector.fetch_data("SELECT version FROM datos_version").iloc[0, 0])
+
     def get_quotes_by_author_id(self, author_id):
         """Fetches quotes by a specific author ID."""
-        query = f"""
+        query = """
         SELECT frase.frase_texto, autor.autor_nombre, autor.autor_apellido, autor.autor_url, array_agg(tag.tag_texto) as tags
         FROM frase
         JOIN autor ON frase.autor_id = autor.autor_id
         JOIN frase_tag ON frase.frase_id = frase_tag.frase_id
         JOIN tag ON frase_tag.tag_id = tag.tag_id
-        WHERE autor.autor_id = {author_id}
+        WHERE autor.autor_id = %(author_id)s
         GROUP BY frase.frase_id, autor.autor_nombre, autor.autor_apellido, autor.autor_url
         """
-        return self.db_connector.fetch_data(query)
+        return self.db_connector.fetch_data(query, {'author_id': int(author_id)})
 
     def get_quotes_by_author(self, author_name):
         """Fetches quotes by a specific author."""
-        query = f"""
+        # The full-name expression matches the trigram index on autor
+        query = """
         SELECT frase.frase_texto, autor.autor_nombre, autor.autor_apellido, autor.autor_url, array_agg(tag.tag_texto) as tags
         FROM frase
         JOIN autor ON frase.autor_id = autor.autor_id
         JOIN frase_tag ON frase.frase_id = frase_tag.frase_id
         JOIN tag ON frase_tag.tag_id = tag.tag_id
-        WHERE autor.autor_nombre ILIKE '%{author_name}%' OR autor.autor_apellido ILIKE '%{author_name}%'
+        WHERE (autor.autor_nombre || ' ' || autor.autor_apellido) ILIKE %(pattern)s
         GROUP BY frase.frase_id, autor.autor_nombre, autor.autor_apellido, autor.autor_url
         """
-        return self.db_connector.fetch_data(query)
+        return self.db_connector.fetch_data(query, {'pattern': self._contains_pattern(author_name)})
 
     def get_quotes_by_tag(self, tag_text):
         """Fetches quotes by a specific tag."""
-        query = f"""
+        query = """
         SELECT frase.frase_texto, autor.autor_nombre, autor.autor_apellido, autor.autor_url, array_agg(tag.tag_texto) as tags
         FROM frase
         JOIN autor ON frase.autor_id = autor.autor_id
         JOIN frase_tag ON frase.frase_id = frase_tag.frase_id
         JOIN tag ON frase_tag.tag_id = tag.tag_id
-        WHERE tag.tag_texto ILIKE '%{tag_text}%'
+        WHERE tag.tag_texto ILIKE %(pattern)s
         GROUP BY frase.frase_id, autor.autor_nombre, autor.autor_apellido, autor.autor_url
         """
-        return self.db_connector.fetch_data(query)
+        return self.db_connector.fetch_data(query, {'pattern': self._contains_pattern(tag_text)})
+
+    @staticmethod
+    def _contains_pattern(text):
+        """Builds an ILIKE pattern that matches `text` literally anywhere in the value."""
+        escaped = text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        return f"%{escaped}%"
+
+    def search(self, query, limit=20):
+        """
+        Ranked search over quote text (full-text), author names and tags (trigram similarity).
+        Uses the GIN indexes created by create_database.py, so latency does not grow with table size.
+        """
+        sql = """
+        WITH q AS (
+            SELECT websearch_to_tsquery('english', %(query)s) AS tsq, %(query)s AS txt
+        ), matches AS (
+            SELECT frase.frase_id, ts_rank(frase.frase_tsv, q.tsq) AS score
+            FROM frase, q
+            WHERE frase.frase_tsv @@ q.tsq
+            UNION ALL
+            SELECT frase.frase_id, 0.8 * word_similarity(q.txt, autor.autor_nombre || ' ' || autor.autor_apellido)
+            FROM autor
+            JOIN frase ON frase.autor_id = autor.autor_id, q
+            WHERE q.txt <%% (autor.autor_nombre || ' ' || autor.autor_apellido)
+            UNION ALL
+            SELECT frase_tag.frase_id, 0.6 * word_similarity(q.txt, tag.tag_texto)
+            FROM tag
+            JOIN frase_tag ON frase_tag.tag_id = tag.tag_id, q
+            WHERE q.txt <%% tag.tag_texto
+        ), ranked AS (
+            SELECT frase_id, max(score) AS score
+            FROM matches
+            GROUP BY frase_id
+            ORDER BY score DESC, frase_id
+            LIMIT %(limit)s
+        )
+        SELECT ranked.score, frase.frase_id, frase.frase_texto, autor.autor_nombre, autor.autor_apellido, autor.autor_url,
+               COALESCE(array_agg(tag.tag_texto ORDER BY tag.tag_texto) FILTER (WHERE tag.tag_texto IS NOT NULL), '{}') as tags
+        FROM ranked
+        JOIN frase ON frase.frase_id = ranked.frase_id
+        JOIN autor ON frase.autor_id = autor.autor_id
+        LEFT JOIN frase_tag ON frase.frase_id = frase_tag.frase_id
+        LEFT JOIN tag ON frase_tag.tag_id = tag.tag_id
+        GROUP BY ranked.score, frase.frase_id, frase.frase_texto, autor.autor_nombre, autor.autor_apellido, autor.autor_url
+        ORDER BY ranked.score DESC, frase.frase_id
+        """
+        return self.db_connector.fetch_data(sql, {'query': query, 'limit': int(limit)})
+
+
+@st.cache_resource
+def get_shared_data_layer():
+    """
+    Creates the database connector and the cached data fetcher once per server process,
+    so every session and rerun shares the same engine and cached query results.
+    """
+    db_connector = DatabaseConnector(
+        db_name=DB_NAME,
+        db_user=DB_USER,
+        db_password=DB_PASSWORD,
+        db_host=DB_HOST,
+        db_port=DB_PORT
+    )
+    data_fetcher = CachedDataFetcher(DataFetcher(db_connector), ttl=600)
+
+    # The updater sends a NOTIFY after each load; refresh the cache as soon as it arrives
+    listener = DataChangeListener(
+        f"dbname={DB_NAME} user={DB_USER} password={DB_PASSWORD} host={DB_HOST} port={DB_PORT}",
+        data_fetcher.invalidate
+    )
+    listener.start()
+    return db_connector, data_fetcher
 
 
 class StreamlitApp:
     def __init__(self):
-        self.db_connector = DatabaseConnector(
-            db_name=DB_NAME,
-            db_user=DB_USER,
-            db_password=DB_PASSWORD,
-            db_host=DB_HOST,
-            db_port=DB_PORT
-        )
-        self.data_fetcher = DataFetcher(self.db_connector)
+        self.db_connector, self.data_fetcher = get_shared_data_layer()
 
     def show_quotes(self):
         st.subheader("Frases")
-        frases_df, _, _ = self.data_fetcher.get_data()
-        self.display_data_with_pagination(frases_df, self.display_quote, 'quotes')
+        self.display_data_with_pagination(self.data_fetcher.get_quotes_page, self.data_fetcher.get_quotes_count(),
+                                          'frase_id', self.display_quote, 'quotes')
 
     def show_authors(self):
         st.subheader("Autores")
-        _, autores_df, _ = self.data_fetcher.get_data()
-        self.display_data_with_pagination(autores_df, self.display_author, 'authors')
+        self.display_data_with_pagination(self.data_fetcher.get_authors_page, self.data_fetcher.get_authors_count(),
+                                          'autor_id', self.display_author, 'authors')
 
-    def display_data_with_pagination(self, data_df, display_func, page_type):
+    def display_data_with_pagination(self, fetch_page, total_items, id_column, display_func, page_type):
         items_per_page = 10
         if page_type not in st.session_state:
             st.session_state[page_type] = 1
+            # Último id de cada página anterior: la página N empieza después de cursors[N - 1]
+            st.session_state[f'{page_type}_cursors'] = [0]
 
-        total_items = len(data_df)
         total_pages = math.ceil(total_items / items_per_page)
         current_page = st.session_state[page_type]
+        cursors = st.session_state[f'{page_type}_cursors']
 
-        start_idx = (current_page - 1) * items_per_page
-        end_idx = min(start_idx + items_per_page, total_items)
+        # Solo se leen de la base de datos las filas de la página actual
+        page_df = fetch_page(cursors[current_page - 1], items_per_page)
 
         # Mostrar datos de la página actual
-        for index in range(start_idx, end_idx):
-            display_func(data_df.iloc[index])
+        for index in range(len(page_df)):
+            display_func(page_df.iloc[index])
 
         # Controles de navegación
         col1, col2, col3 = st.columns([1, 1, 1])
@@ -138,12 +259,15 @@ class StreamlitApp:
             if current_page > 1:
                 if st.button('Anterior', key=f'previous_{page_type}', help="Ir a la página anterior"):
                     st.session_state[page_type] -= 1
+                    del cursors[current_page:]
                     st.experimental_rerun()
 
         with col3:
-            if current_page < total_pages:
+            if current_page < total_pages and not page_df.empty:
                 if st.button('Siguiente', key=f'next_{page_type}', help="Ir a la página siguiente"):
                     st.session_state[page_type] += 1
+                    del cursors[current_page:]
+                    cursors.append(int(page_df.iloc[-1][id_column]))
                     st.experimental_rerun()
 
     def display_quote(self, row):
@@ -256,14 +380,33 @@ class StreamlitApp:
 
 
 
+    def search_quotes(self):
+        st.subheader("Buscar")
+        query = st.text_input("Buscar frases, autores o tags")
+
+        if query.strip():
+            try:
+                results_df = self.data_fetcher.search(query.strip(), limit=20)
+            except Exception as e:
+                st.error(f"Error al buscar: {e}")
+                return
+
+            if not results_df.empty:
+                st.write(f"{len(results_df)} resultados para '{query}':")
+                for index, row in results_df.iterrows():
+                    self.display_quote(row)
+            else:
+                st.write("No se encontraron resultados.")
+
     def show_statistics(self):
         st.subheader("Estadísticas")
-        frases_df, _, _ = self.data_fetcher.get_data()
-
-        frases_por_autor = frases_df.groupby(['autor_nombre', 'autor_apellido']).size().reset_index(name='counts')
-        frases_por_autor['full_name'] = frases_por_autor['autor_nombre'] + ' ' + frases_por_autor['autor_apellido']
+        frases_por_autor, frases_por_tag, totales = self.data_fetcher.get_statistics()
 
-        frases_por_tag = frases_df.explode('tags').groupby('tags').size().reset_index(name='counts')
+        if not totales.empty:
+            col1, col2, col3 = st.columns(3)
+            col1.metric("Frases", int(totales.iloc[0]['total_frases']))
+            col2.metric("Autores", int(totales.iloc[0]['total_autores']))
+            col3.metric("Tags", int(totales.iloc[0]['total_tags']))
 
         st.bar_chart(frases_por_autor.set_index('full_name')['counts'], height=300)
         st.bar_chart(frases_por_tag.set_index('tags')['counts'], height=300)
@@ -298,7 +441,7 @@ class StreamlitApp:
     def run(self):
         """Runs the Streamlit app."""
         st.sidebar.title("Navegación")
-        menu = ["Frases", "Autores", "Buscar Frases por Autor", "Buscar Frases por Tag", "Estadísticas"]
+        menu = ["Frases", "Autores", "Buscar", "Buscar Frases por Autor", "Buscar Frases por Tag", "Estadísticas"]
         choice = st.sidebar.selectbox("Selecciona una opción", menu)
 
         st.title("Frases Célebres")
@@ -307,6 +450,8 @@ class StreamlitApp:
             self.show_quotes()
         elif choice == "Autores":
             self.show_authors()
+        elif choice == "Buscar":
+            self.search_quotes()
         elif choice == "Buscar Frases por Autor":
             self.search_quotes_by_author()
         elif choice == "Buscar Frases por Tag":
@@ -0,0 +1,170 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+class AuthorCache:
+    """
+    Caché de detalles de autores indexada por `autor_url`.
+
+    - En memoria: evita descargar dos veces la página de un mismo autor durante una ejecución,
+      incluso si varias frases del mismo autor se procesan a la vez en distintos hilos.
+    - En disco (opcional): un archivo SQLite reutilizable entre ejecuciones, con caducidad
+      (`ttl` en segundos).
+
+    Las dos tienen un máximo de `max_entries` entradas; al superarlo se eliminan las menos usadas.
+    """
+
+    def __init__(self, path=None, ttl=7 * 24 * 3600, max_entries=10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        # Orden de uso, del menos al más reciente (LRU)
+        self._memory = OrderedDict()
+        self._in_flight = {}
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._conn = None
+        if path:
+            self._open_store()
+
+    def _open_store(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+        CREATE TABLE IF NOT EXISTS author_cache (
+            autor_url TEXT PRIMARY KEY,
+            details TEXT NOT NULL,
+            fetched_at REAL NOT NULL,
+            accessed_at REAL NOT NULL
+        )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_author_cache_accessed ON author_cache (accessed_at)")
+        self._conn.commit()
+
+    def _is_fresh(self, fetched_at):
+        return self.ttl is None or time.time() - fetched_at < self.ttl
+
+    def _remember(self, autor_url, details, fetched_at):
+        with self._lock:
+            self._memory[autor_url] = (details, fetched_at)
+            self._memory.move_to_end(autor_url)
+            if self.max_entries is not None:
+                while len(self._memory) > self.max_entries:
+                    self._memory.popitem(last=False)
+
+    def get(self, autor_url, fetched_after=None):
+        """
+        Devuelve los detalles guardados para `autor_url`, o None si no hay una entrada vigente.
+        Con `fetched_after` (marca de time.time()) solo valen las entradas obtenidas después.
+        """
+        with self._lock:
+            entry = self._memory.get(autor_url)
+            if entry is not None:
+                if self._is_fresh(entry[1]):
+                    if fetched_after is not None and entry[1] < fetched_after:
+                        return None
+                    self._memory.move_to_end(autor_url)
+                    return entry[0]
+                del self._memory[autor_url]
+
+        if self._conn is None:
+            return None
+
+        with self._db_lock:
+            row = self._conn.execute(
+                "SELECT details, fetched_at FROM author_cache WHERE autor_url = ?", (autor_url,)
+            ).fetchone()
+            if row is None:
+                return None
+            details, fetched_at = json.loads(row[0]), row[1]
+            if not self._is_fresh(fetched_at):
+                self._conn.execute("DELETE FROM author_cache WHERE autor_url = ?", (autor_url,))
+                self._conn.commit()
+                return None
+            if fetched_after is not None and fetched_at < fetched_after:
+                return None
+            self._conn.execute(
+                "UPDATE author_cache SET accessed_at = ? WHERE autor_url = ?", (time.time(), autor_url)
+            )
+            self._conn.commit()
+
+        self._remember(autor_url, details, fetched_at)
+        return details
+
+    def set(self, autor_url, details):
+        """
+        Guarda los detalles de un autor en memoria y, si está configurado, en disco.
+        """
+        now = time.time()
+        self._remember(autor_url, details, now)
+
+        if self._conn is None:
+            return
+
+        with self._db_lock:
+            self._conn.execute("""
+            INSERT INTO author_cache (autor_url, details, fetched_at, accessed_at)
+            VALUES (?, ?, ?, ?)
+            ON CONFLICT (autor_url) DO UPDATE SET details = excluded.details,
+                                                  fetched_at = excluded.fetched_at,
+                                                  accessed_at = excluded.accessed_at
+            """, (autor_url, json.dumps(details, ensure_ascii=False), now, now))
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        # Eliminar entradas caducadas y, si aún sobran, las de acceso más antiguo
+        if self.ttl is not None:
+            self._conn.execute("DELETE FROM author_cache WHERE fetched_at < ?", (time.time() - self.ttl,))
+        if self.max_entries is not None:
+            self._conn.execute("""
+            DELETE FROM author_cache WHERE autor_url IN (
+                SELECT autor_url FROM author_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+            )
+            """, (self.max_entries,))
+
+    def get_or_fetch(self, autor_url, fetch, fetched_after=None):
+        """
+        Devuelve los detalles del autor desde la caché o llamando a `fetch(autor_url)`.
+        Si otro hilo ya está descargando el mismo autor, espera a su resultado en vez de
+        repetir la petición. Los resultados None (errores) no se guardan. Con `fetched_after`
+        se ignoran las entradas anteriores a esa marca (ver `get`).
+        """
+        details = self.get(autor_url, fetched_after)
+        if details is not None:
+            return details
+
+        with self._lock:
+            future = self._in_flight.get(autor_url)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[autor_url] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            details = fetch(autor_url)
+            if details is not None:
+                self.set(autor_url, details)
+            future.set_result(details)
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._in_flight[autor_url]
+
+        return details
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
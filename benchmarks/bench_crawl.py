@@ -0,0 +1,199 @@
+"""
+Benchmark de extremo a extremo: recorre con el Scraper una réplica local de quotes.toscrape.com
+(ver quotes_site.py) y carga las filas obtenidas con AsyncDataSaver en un esquema temporal de la
+base de datos configurada en db.py, que se elimina al terminar.
+
+Informa de páginas/s, descargas de autores/s, tiempo de parseo por página, frases/s insertadas
+y memoria máxima (RSS), y guarda los resultados en JSON para comparar ejecuciones. Ejemplo:
+
+    python benchmarks/bench_crawl.py --pages 100 --authors 200 --tags 80 --latency 0.02 --concurrency 8
+
+Con `--store DIR` se guardan además las respuestas en bruto (ver response_store.py); con
+`--replay DIR` se vuelve a parsear ese recorrido desde el almacén, sin servidor ni red.
+Con `--error-rate` el sitio responde 503 a esa fracción de peticiones, para medir los reintentos
+y la concurrencia adaptativa (ver resilience.py).
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+from parsers import PARSERS  # noqa: E402
+from save_data_to_db import AsyncDataSaver  # noqa: E402
+from scraper import Scraper  # noqa: E402
+from transport import HttpTransport  # noqa: E402
+from metrics import Metrics  # noqa: E402
+from resilience import AdaptiveLimiter, ResilientTransport  # noqa: E402
+from response_store import RecordingTransport, ReplayTransport, ResponseStore  # noqa: E402
+from bench_save_to_database import run_mode  # noqa: E402
+from quotes_site import QuotesSite  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+def peak_rss_mb():
+    """
+    Memoria residente máxima del proceso en MB, o None si no se puede medir en esta plataforma.
+    """
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux la da en KB y macOS en bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+def mean_ms(histograms, name, labels):
+    mean = histograms.get(name, {}).get(labels, {}).get('mean')
+    return 1000 * mean if mean is not None else None
+
+def requests_of(counters, page_type):
+    # Peticiones de un tipo de página, sumando todos los códigos de estado
+    return sum(value for key, value in counters.get('scraper_http_requests_total', {}).items()
+               if key.startswith(f'page_type={page_type},'))
+
+def recorded_base_url(store):
+    """
+    URL base del sitio recorrido al grabar el almacén (la de su primera página del listado).
+    """
+    for url in store.urls():
+        if url.endswith('/page/1/'):
+            return url[:-len('page/1/')]
+    raise ValueError(f"El almacén {store.path} no contiene la primera página del listado")
+
+def run_crawl(base_url, transport, concurrency, parser, parse_workers=0, metrics=None):
+    scraper = Scraper(base_url, concurrency=concurrency, transport=transport, parser=parser,
+                      parse_workers=parse_workers, metrics=metrics)
+
+    start = time.perf_counter()
+    if concurrency > 1:
+        frases_df, tags_df = asyncio.run(scraper.scrape_quotes_async())
+    else:
+        frases_df, tags_df = scraper.scrape_quotes()
+    elapsed = time.perf_counter() - start
+
+    summary = scraper.metrics.summary()
+    pages = requests_of(summary['counters'], 'listing')
+    author_fetches = requests_of(summary['counters'], 'author')
+    return {
+        'seconds': elapsed,
+        'listing_pages': pages,
+        'author_fetches': author_fetches,
+        'frases': len(frases_df),
+        'pages_per_second': pages / elapsed if elapsed else float('inf'),
+        'author_fetches_per_second': author_fetches / elapsed if elapsed else float('inf'),
+        'parse_ms_per_listing_page': mean_ms(summary['histograms'], 'scraper_parse_seconds', 'page_type=listing'),
+        'parse_ms_per_author_page': mean_ms(summary['histograms'], 'scraper_parse_seconds', 'page_type=author'),
+        'retries': sum(summary['counters'].get('scraper_retries_total', {}).values()),
+        'concurrency_limit': getattr(getattr(transport, 'limiter', None), 'limit', None),
+        'metrics': summary,
+    }, frases_df, tags_df
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del scraper y de la carga sobre un sitio local")
+    parser.add_argument('--pages', type=int, default=20)
+    parser.add_argument('--quotes-per-page', type=int, default=10)
+    parser.add_argument('--authors', type=int, default=50)
+    parser.add_argument('--tags', type=int, default=30)
+    parser.add_argument('--latency', type=float, default=0.0,
+                        help="Segundos de espera del servidor antes de cada respuesta")
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--error-rate', type=float, default=0.0,
+                        help="Fracción de peticiones a las que el sitio responde 503")
+    parser.add_argument('--retry-after', type=int, default=None,
+                        help="Segundos de la cabecera Retry-After de los 503")
+    parser.add_argument('--fixed-concurrency', action='store_true',
+                        help="Sin concurrencia adaptativa (AIMD): siempre --concurrency peticiones en curso")
+    parser.add_argument('--parser', choices=sorted(PARSERS), default='lxml')
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="Procesos de parseo (0 = en el propio proceso; solo con --concurrency > 1)")
+    parser.add_argument('--modes', nargs='+', default=list(AsyncDataSaver.MODES),
+                        choices=AsyncDataSaver.MODES)
+    parser.add_argument('--store', default=None,
+                        help="Carpeta donde guardar las respuestas del recorrido")
+    parser.add_argument('--replay', default=None, metavar='STORE',
+                        help="Recorrer las respuestas guardadas en STORE en lugar del sitio local")
+    parser.add_argument('--skip-db', action='store_true',
+                        help="Medir solo el scraping, sin PostgreSQL")
+    parser.add_argument('--output', default=None,
+                        help="Archivo JSON de resultados (por defecto en benchmarks/results/)")
+    args = parser.parse_args()
+
+    config = {key: getattr(args, key) for key in
+              ('pages', 'quotes_per_page', 'authors', 'tags', 'latency', 'concurrency', 'parser',
+               'parse_workers', 'replay', 'error_rate', 'retry_after', 'fixed_concurrency')}
+
+    if args.replay:
+        store = ResponseStore(args.replay)
+        print(f"Reproduciendo {len(store)} respuestas de {args.replay}")
+        crawl, frases_df, tags_df = run_crawl(recorded_base_url(store), ReplayTransport(store),
+                                              args.concurrency, args.parser, args.parse_workers)
+        store.close()
+    else:
+        print(f"Sitio: {args.pages} páginas x {args.quotes_per_page} frases, {args.authors} autores, "
+              f"{args.tags} tags, latencia {args.latency} s")
+        with QuotesSite(pages=args.pages, quotes_per_page=args.quotes_per_page, authors=args.authors,
+                        tags=args.tags, latency=args.latency, error_rate=args.error_rate,
+                        retry_after=args.retry_after) as site:
+            metrics = Metrics()
+            limiter = None if args.fixed_concurrency else AdaptiveLimiter(max(args.concurrency, 1))
+            transport = ResilientTransport(HttpTransport(pool_size=max(args.concurrency, 10)), limiter=limiter,
+                                           metrics=metrics)
+            store = ResponseStore(args.store) if args.store else None
+            if store is not None:
+                transport = RecordingTransport(transport, store)
+            crawl, frases_df, tags_df = run_crawl(site.url, transport, args.concurrency, args.parser,
+                                                  args.parse_workers, metrics)
+            if store is not None:
+                store.close()
+
+    print(f"Scraping: {crawl['seconds']:.2f} s, {crawl['pages_per_second']:.1f} páginas/s, "
+          f"{crawl['author_fetches_per_second']:.1f} autores/s, "
+          f"parseo {crawl['parse_ms_per_listing_page'] or 0:.2f} ms/página, {crawl['frases']} frases")
+    if crawl['retries'] or crawl['concurrency_limit'] is not None:
+        print(f"Reintentos: {crawl['retries']}, concurrencia final: {crawl['concurrency_limit']}")
+
+    load = []
+    if not args.skip_db:
+        db_config = {
+            'db_name': db.DB_NAME,
+            'db_user': db.DB_USER,
+            'db_password': db.DB_PASSWORD,
+            'db_host': db.DB_HOST,
+            'db_port': db.DB_PORT
+        }
+        load = [asyncio.run(run_mode(mode, frases_df, tags_df, db_config)) for mode in args.modes]
+        for result in load:
+            print(f"Carga {result['mode']:>6}: {result['seconds']:8.2f} s  "
+                  f"{result['rows_per_second']:10.1f} frases/s")
+
+    results = {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'config': config,
+        'crawl': crawl,
+        'load': load,
+        'peak_rss_mb': peak_rss_mb(),
+    }
+    print(f"Memoria máxima: {results['peak_rss_mb']} MB")
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        output = os.path.join(RESULTS_DIR, f"crawl_{datetime.now():%Y%m%d_%H%M%S}.json")
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"Resultados guardados en {output}")
+
+if __name__ == "__main__":
+    main()
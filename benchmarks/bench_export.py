@@ -0,0 +1,94 @@
+"""
+Benchmark de los formatos de exportación (ver exporters.py) con filas sintéticas como las del
+scraper, escritas por lotes de una página. Informa del tiempo y del tamaño del archivo y, con
+--trace-memory, de la memoria máxima reservada (tracemalloc ralentiza mucho la escritura, así que
+los tiempos de esa ejecución no son comparables). No hace peticiones de red. Ejemplo:
+
+    python benchmarks/bench_export.py --rows 200000 --formats parquet csv
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from exporters import EXPORTERS, get_exporter, tags_path  # noqa: E402
+from quotes_site import SyntheticSite  # noqa: E402
+
+def make_batches(rows, per_page, authors, tags):
+    """
+    Genera lotes de filas (uno por página) a partir del sitio sintético, sin crearlas todas a la vez.
+    """
+    site = SyntheticSite(pages=-(-rows // per_page), quotes_per_page=per_page, authors=authors, tags=tags)
+    tag_ids = {tag: i for i, tag in enumerate(site.tag_names, 1)}
+    batch = []
+    for quote in site.quotes[:rows]:
+        nombre, apellido = site.author_names[quote['author']].split(' ', 1)
+        details = site.author_details[quote['author']]
+        batch.append({
+            'frase_texto': quote['text'],
+            'autor_nombre': nombre,
+            'autor_apellido': apellido,
+            'autor_url': f"https://quotes.example/author/{site.slug(site.author_names[quote['author']])}",
+            'autor_fecha_nac': details['born_date'],
+            'autor_lugar_nac': details['born_location'],
+            'autor_descripcion': details['description'],
+            'Tags': quote['tags'],
+            'Tags_IDs': [tag_ids[tag] for tag in quote['tags']],
+            'fuente': 'quotes.example',
+        })
+        if len(batch) == per_page:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+    yield tag_ids
+
+def run_format(format, args, directory):
+    filename = os.path.join(directory, f"frases{EXPORTERS[format].extension}")
+    if args.trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    with get_exporter(format, filename) as exporter:
+        for batch in make_batches(args.rows, args.quotes_per_page, args.authors, args.tags):
+            if isinstance(batch, dict):
+                exporter.write_tags(batch)
+            else:
+                exporter.write_rows(batch)
+    elapsed = time.perf_counter() - start
+    peak = None
+    if args.trace_memory:
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    size = os.path.getsize(filename) + os.path.getsize(tags_path(filename)) if format != 'excel' \
+        else os.path.getsize(filename)
+    return {'format': format, 'seconds': elapsed, 'rows_per_second': args.rows / elapsed if elapsed else float('inf'),
+            'size_mb': size / (1024 * 1024), 'peak_mb': peak / (1024 * 1024) if peak is not None else None}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los formatos de exportación")
+    parser.add_argument('--rows', type=int, default=50000)
+    parser.add_argument('--quotes-per-page', type=int, default=10)
+    parser.add_argument('--authors', type=int, default=500)
+    parser.add_argument('--tags', type=int, default=100)
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Medir la memoria máxima con tracemalloc")
+    parser.add_argument('--formats', nargs='+', default=sorted(EXPORTERS), choices=sorted(EXPORTERS))
+    args = parser.parse_args()
+
+    print(f"Filas: {args.rows}, {args.authors} autores, {args.tags} tags")
+    with tempfile.TemporaryDirectory() as directory:
+        for format in args.formats:
+            result = run_format(format, args, directory)
+            line = (f"{result['format']:>8}: {result['seconds']:8.2f} s  {result['rows_per_second']:10.1f} frases/s  "
+                    f"{result['size_mb']:8.2f} MB")
+            if result['peak_mb'] is not None:
+                line += f"  memoria máxima {result['peak_mb']:8.1f} MB"
+            print(line)
+
+if __name__ == "__main__":
+    main()
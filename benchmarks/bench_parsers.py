@@ -0,0 +1,67 @@
+"""
+Benchmark de los backends de parseo del scraper ('soup' y 'lxml') sobre las páginas
+guardadas en tests/fixtures. No hace peticiones de red. Ejemplo:
+
+    python benchmarks/bench_parsers.py --repeat 500
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from parsers import PARSERS, get_parser  # noqa: E402
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'tests', 'fixtures')
+BASE_URL = "https://quotes.toscrape.com/"
+
+def load_pages():
+    """
+    Devuelve las páginas del listado y las páginas de autores guardadas.
+    """
+    listing, authors = [], []
+    for name in sorted(os.listdir(FIXTURES_DIR)):
+        with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+            (authors if name.startswith('author_') else listing).append(f.read())
+    return listing, authors
+
+def parse_listing(parser, html):
+    frases = []
+    for element in parser.quote_elements(html):
+        try:
+            frases.append(parser.parse_quote(element, BASE_URL))
+        except Exception:
+            continue
+    return frases
+
+def run_parser(name, listing, authors, repeat):
+    parser = get_parser(name)
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for html in listing:
+            parse_listing(parser, html)
+        for html in authors:
+            parser.parse_author_page(html)
+    elapsed = time.perf_counter() - start
+
+    pages = repeat * (len(listing) + len(authors))
+    return {'parser': name, 'seconds': elapsed, 'pages': pages,
+            'pages_per_second': pages / elapsed if elapsed else float('inf')}
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los backends de parseo del scraper")
+    parser.add_argument('--repeat', type=int, default=200,
+                        help="Veces que se parsea cada página guardada")
+    parser.add_argument('--parsers', nargs='+', default=sorted(PARSERS), choices=sorted(PARSERS))
+    args = parser.parse_args()
+
+    listing, authors = load_pages()
+    print(f"Páginas del listado: {len(listing)}, páginas de autores: {len(authors)}, repeticiones: {args.repeat}")
+    results = [run_parser(name, listing, authors, args.repeat) for name in args.parsers]
+    for result in results:
+        print(f"{result['parser']:>5}: {result['seconds']:8.2f} s  "
+              f"{result['pages_per_second']:10.1f} páginas/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+"""
+Benchmark de AsyncDataSaver: compara la carga fila a fila ('rows') con la carga masiva ('copy').
+
+Cada modo se ejecuta sobre un esquema temporal propio de la base de datos configurada en
+db.py, que se elimina al terminar. Ejemplo:
+
+    python benchmarks/bench_save_to_database.py --quotes 5000 --authors 500 --tags 200
+"""
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+
+import asyncpg
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import db  # noqa: E402
+from create_database import TABLES_SQL  # noqa: E402
+from results import ScrapeResult  # noqa: E402
+from save_data_to_db import AsyncDataSaver  # noqa: E402
+
+class SchemaDataSaver(AsyncDataSaver):
+    """
+    AsyncDataSaver que trabaja sobre un esquema concreto en lugar de `public`.
+    """
+
+    def __init__(self, schema, **kwargs):
+        super().__init__(**kwargs)
+        self.schema = schema
+
+    async def connect(self):
+        self.conn = await asyncpg.connect(
+            database=self.db_name,
+            user=self.db_user,
+            password=self.db_password,
+            host=self.db_host,
+            port=self.db_port,
+            server_settings={'search_path': self.schema}
+        )
+
+def make_frames(n_quotes, n_authors, n_tags, max_tags_per_quote=4, seed=0):
+    """
+    Genera DataFrames sintéticos con la misma forma que los de Scraper.scrape_quotes.
+    """
+    rng = random.Random(seed)
+    tags = [f"tag-{i}" for i in range(1, n_tags + 1)]
+    rows = []
+    for i in range(n_quotes):
+        autor = i % n_authors
+        quote_tags = rng.sample(tags, rng.randint(0, min(max_tags_per_quote, n_tags)))
+        rows.append({
+            'frase_texto': f"“Synthetic quote number {i}”",
+            'autor_nombre': f"Nombre{autor}",
+            'autor_apellido': f"Apellido {autor}",
+            'autor_url': f"https://quotes.toscrape.com/author/autor-{autor}",
+            'autor_fecha_nac': 'January 1, 1900',
+            'autor_lugar_nac': 'in Testland',
+            'autor_descripcion': 'Lorem ipsum dolor sit amet. ' * 40,
+            'Tags': quote_tags,
+            'Tags_IDs': [int(tag.split('-')[1]) for tag in quote_tags]
+        })
+    frases_df = pd.DataFrame(rows)
+    tags_df = pd.DataFrame({'tag_texto': tags, 'tag_id': range(1, n_tags + 1)})
+    return frases_df, tags_df
+
+def make_result(frases_df, tags_df):
+    """
+    El ScrapeResult (tablas normalizadas) equivalente a `frases_df`.
+    """
+    result = ScrapeResult()
+    result.add_rows(frases_df.to_dict('records'))
+    result.add_tags(dict(zip(tags_df['tag_texto'], tags_df['tag_id'])))
+    return result
+
+async def run_mode(mode, frases_df, tags_df, db_config, result=None):
+    schema = f"bench_{mode}_{os.getpid()}"
+    admin = await asyncpg.connect(
+        database=db_config['db_name'], user=db_config['db_user'], password=db_config['db_password'],
+        host=db_config['db_host'], port=db_config['db_port']
+    )
+    try:
+        await admin.execute(f"CREATE SCHEMA {schema}")
+        await admin.execute(f"SET search_path TO {schema}")
+        for statement in TABLES_SQL:
+            await admin.execute(statement)
+
+        saver = SchemaDataSaver(schema, mode=mode, **db_config)
+        start = time.perf_counter()
+        if result is not None:
+            await saver.save_result(result)
+        else:
+            await saver.save_to_database(frases_df, tags_df)
+        elapsed = time.perf_counter() - start
+
+        frases = await admin.fetchval("SELECT count(*) FROM frase")
+        links = await admin.fetchval("SELECT count(*) FROM frase_tag")
+    finally:
+        await admin.execute(f"DROP SCHEMA IF EXISTS {schema} CASCADE")
+        await admin.close()
+
+    return {'mode': mode, 'seconds': elapsed, 'frases': frases, 'frase_tag': links,
+            'rows_per_second': len(frases_df) / elapsed if elapsed else float('inf')}
+
+async def main():
+    parser = argparse.ArgumentParser(description="Benchmark de los modos de carga de AsyncDataSaver")
+    parser.add_argument('--quotes', type=int, default=2000)
+    parser.add_argument('--authors', type=int, default=200)
+    parser.add_argument('--tags', type=int, default=100)
+    parser.add_argument('--modes', nargs='+', default=list(AsyncDataSaver.MODES),
+                        choices=AsyncDataSaver.MODES)
+    parser.add_argument('--normalized', action='store_true',
+                        help="Guardar un ScrapeResult (tablas normalizadas) en lugar de los DataFrames planos")
+    args = parser.parse_args()
+
+    db_config = {
+        'db_name': db.DB_NAME,
+        'db_user': db.DB_USER,
+        'db_password': db.DB_PASSWORD,
+        'db_host': db.DB_HOST,
+        'db_port': db.DB_PORT
+    }
+    frases_df, tags_df = make_frames(args.quotes, args.authors, args.tags)
+    result = make_result(frases_df, tags_df)
+
+    print(f"Frases: {args.quotes}, autores: {args.authors}, tags: {args.tags}")
+    print(f"Memoria: DataFrame plano {frases_df.memory_usage(deep=True).sum() / 1e6:.1f} MB, "
+          f"ScrapeResult {result.memory_usage() / 1e6:.1f} MB")
+    results = [await run_mode(mode, frases_df, tags_df, db_config, result if args.normalized else None)
+               for mode in args.modes]
+    for result in results:
+        print(f"{result['mode']:>6}: {result['seconds']:8.2f} s  "
+              f"{result['rows_per_second']:10.1f} frases/s  "
+              f"(frase={result['frases']}, frase_tag={result['frase_tag']})")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,305 @@
+"""
+Réplica local y sintética de quotes.toscrape.com para benchmarks y pruebas sin red.
+
+El sitio tiene el mismo marcado que el original (listado paginado en /page/N/ y páginas
+de autores en /author/<slug>, páginas de cada tag en /tag/<tag>/page/N/ y enlaces 'Next'),
+un tamaño configurable, una latencia opcional por petición y errores 503 al azar (`error_rate`).
+Ejemplo:
+
+    with QuotesSite(pages=50, authors=100, tags=40, latency=0.02) as site:
+        scraper = Scraper(site.url)
+"""
+import hashlib
+import html
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+QUOTE_HTML = """
+    <div class="quote" itemscope itemtype="http://schema.org/CreativeWork">
+        <span class="text" itemprop="text">{text}</span>
+        <span>by <small class="author" itemprop="author">{author}</small>
+        <a href="/author/{slug}">(about)</a>
+        </span>
+        <div class="tags">
+            Tags:
+            <meta class="keywords" itemprop="keywords" content="{keywords}" /    >
+{tags}
+        </div>
+    </div>
+"""
+
+TAG_HTML = '            <a class="tag" href="/tag/{tag}/page/1/">{tag}</a>\n'
+
+NEXT_HTML = """
+    <nav>
+        <ul class="pager">
+            <li class="next">
+                <a href="{href}">Next <span aria-hidden="true">&rarr;</span></a>
+            </li>
+        </ul>
+    </nav>
+"""
+
+PAGE_HTML = """<!DOCTYPE html>
+<html lang="en">
+<head>
+	<meta charset="UTF-8">
+	<title>Quotes to Scrape</title>
+</head>
+<body>
+    <div class="container">
+<div class="row">
+    <div class="col-md-8">
+{body}
+    </div>
+</div>
+    </div>
+</body>
+</html>
+"""
+
+AUTHOR_HTML = """
+<div class="author-details">
+    <h3 class="author-title">{author}
+    </h3>
+    <p><strong>Born:</strong> <span class="author-born-date">{born_date}</span> <span class="author-born-location">{born_location}</span></p>
+    <p><strong>Description:</strong></p>
+    <div class="author-description">
+        {description}
+    </div>
+</div>
+"""
+
+NO_QUOTES_HTML = "No quotes found!"
+
+MONTHS = ['January', 'February', 'March', 'April', 'May', 'June', 'July', 'August',
+          'September', 'October', 'November', 'December']
+
+class SyntheticSite:
+    """
+    Contenido determinista del sitio: `pages` páginas de `quotes_per_page` frases repartidas
+    entre `authors` autores, cada una con hasta `max_tags_per_quote` de los `tags` tags.
+    """
+
+    def __init__(self, pages=10, quotes_per_page=10, authors=50, tags=30, max_tags_per_quote=4, seed=0):
+        self.pages = pages
+        self.quotes_per_page = quotes_per_page
+        self.authors = authors
+        self.tags = tags
+        rng = random.Random(seed)
+        tag_names = [f"tag-{i}" for i in range(1, tags + 1)]
+
+        self.tag_names = tag_names
+        self.author_names = [f"Nombre{i} Apellido{i}" for i in range(authors)]
+        self._author_ids = {self.slug(name): i for i, name in enumerate(self.author_names)}
+        self.quotes = []
+        for i in range(pages * quotes_per_page):
+            self.quotes.append({
+                'text': f"“Synthetic quote number {i}.”",
+                'author': i % authors,
+                'tags': rng.sample(tag_names, rng.randint(0, min(max_tags_per_quote, tags)))
+            })
+        self.author_details = [{
+            'born_date': f"{MONTHS[i % 12]} {i % 28 + 1}, {1800 + i % 200}",
+            'born_location': f"in Ciudad {i}, País {i % 20}",
+            'description': 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. ' * (5 + i % 20)
+        } for i in range(authors)]
+
+    @staticmethod
+    def slug(author_name):
+        return author_name.replace(' ', '-')
+
+    def listing_page(self, number):
+        """
+        HTML de la página `number` del listado; fuera de rango, la página vacía del sitio original.
+        """
+        return self._quotes_page(self.quotes, number, '/page/{}/')
+
+    def tag_page(self, tag, number):
+        """
+        HTML de la página `number` de las frases con el tag `tag`, o None si el tag no existe.
+        """
+        if tag not in self.tag_names:
+            return None
+        quotes = [quote for quote in self.quotes if tag in quote['tags']]
+        return self._quotes_page(quotes, number, f'/tag/{tag}/page/{{}}/')
+
+    def _quotes_page(self, quotes, number, path):
+        pages = -(-len(quotes) // self.quotes_per_page)
+        if not 1 <= number <= pages:
+            return PAGE_HTML.format(body=NO_QUOTES_HTML)
+        start = (number - 1) * self.quotes_per_page
+        body = ''.join(
+            QUOTE_HTML.format(
+                text=html.escape(quote['text']),
+                author=html.escape(self.author_names[quote['author']]),
+                slug=self.slug(self.author_names[quote['author']]),
+                keywords=','.join(quote['tags']),
+                tags=''.join(TAG_HTML.format(tag=tag) for tag in quote['tags'])
+            )
+            for quote in quotes[start:start + self.quotes_per_page]
+        )
+        if number < pages:
+            body += NEXT_HTML.format(href=path.format(number + 1))
+        return PAGE_HTML.format(body=body)
+
+    def author_page(self, slug):
+        """
+        HTML de la página de un autor, o None si el autor no existe.
+        """
+        i = self._author_ids.get(slug)
+        if i is None:
+            return None
+        return PAGE_HTML.format(body=AUTHOR_HTML.format(author=html.escape(self.author_names[i]),
+                                                        **self.author_details[i]))
+
+class QuotesSite:
+    """
+    Servidor HTTP local (en un hilo) que sirve un SyntheticSite. Se usa como context manager;
+    `url` es la URL base con la barra final, igual que la del sitio original.
+
+    Cada respuesta lleva un ETag (hash del cuerpo) y un Last-Modified fijo, y las peticiones
+    condicionales con un validador vigente reciben un 304 sin cuerpo. `bytes_sent` suma los
+    bytes de cuerpo enviados.
+
+    Con `error_rate`, esa fracción de las peticiones (al azar, con semilla fija) recibe un 503,
+    con la cabecera `Retry-After: <retry_after>` si se indica; `errors` cuenta los 503 enviados.
+    """
+
+    LAST_MODIFIED = 'Mon, 05 Jan 2026 10:00:00 GMT'
+
+    LISTING_PATH = re.compile(r'^/+page/(\d+)/?$')
+    AUTHOR_PATH = re.compile(r'^/+author/([^/]+)/?$')
+    TAG_PATH = re.compile(r'^/+tag/([^/]+)/page/(\d+)/?$')
+
+    def __init__(self, site=None, latency=0.0, host='127.0.0.1', port=0, error_rate=0.0, retry_after=None,
+                 **site_options):
+        self.site = site if site is not None else SyntheticSite(**site_options)
+        # Segundos de espera antes de responder cada petición, para simular la red
+        self.latency = latency
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self.errors = 0
+        self._random = random.Random(0)
+        self.requests = {'listing': 0, 'author': 0, 'tag': 0, 'other': 0}
+        # Intervalos (inicio, fin) de cada petición atendida, en segundos de time.perf_counter()
+        self.intervals = []
+        self.not_modified = 0
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/"
+
+    def _count(self, kind):
+        with self._lock:
+            self.requests[kind] += 1
+
+    def _count_response(self, payload, not_modified):
+        with self._lock:
+            self.bytes_sent += len(payload)
+            self.not_modified += not_modified
+
+    def _record_interval(self, start):
+        with self._lock:
+            self.intervals.append((start, time.perf_counter()))
+
+    def _fail(self):
+        with self._lock:
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+            self.errors += failed
+            return failed
+
+    def _route(self, path):
+        match = self.LISTING_PATH.match(path)
+        if match:
+            self._count('listing')
+            return self.site.listing_page(int(match.group(1)))
+        match = self.AUTHOR_PATH.match(path)
+        if match:
+            self._count('author')
+            return self.site.author_page(match.group(1))
+        match = self.TAG_PATH.match(path)
+        if match:
+            self._count('tag')
+            return self.site.tag_page(match.group(1), int(match.group(2)))
+        self._count('other')
+        return None
+
+    def _make_handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+            # Cabeceras y cuerpo van en escrituras separadas; con Nagle cada respuesta esperaría ~40 ms
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                start = time.perf_counter()
+                try:
+                    self._respond()
+                finally:
+                    site._record_interval(start)
+
+            def _respond(self):
+                if site.latency:
+                    time.sleep(site.latency)
+                if site._fail():
+                    self.send_response(503)
+                    if site.retry_after is not None:
+                        self.send_header('Retry-After', str(site.retry_after))
+                    self.send_header('Content-Length', '0')
+                    self.end_headers()
+                    return
+                body = site._route(self.path.split('?', 1)[0])
+                status = 200 if body is not None else 404
+                payload = (body if body is not None else 'Not found').encode('utf-8')
+                etag = '"' + hashlib.sha1(payload).hexdigest() + '"'
+                not_modified = status == 200 and (
+                    self.headers.get('If-None-Match') == etag
+                    or (self.headers.get('If-None-Match') is None
+                        and self.headers.get('If-Modified-Since') == site.LAST_MODIFIED))
+                if not_modified:
+                    status, payload = 304, b''
+                site._count_response(payload, not_modified)
+
+                self.send_response(status)
+                if status != 404:
+                    self.send_header('ETag', etag)
+                    self.send_header('Last-Modified', site.LAST_MODIFIED)
+                if status != 304:
+                    self.send_header('Content-Type', 'text/html; charset=utf-8')
+                    self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                # Sin una línea en stderr por petición
+                pass
+
+        return Handler
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True, name='quotes-site')
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
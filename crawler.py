@@ -0,0 +1,128 @@
+import asyncio
+import logging
+
+from author_cache import AuthorCache
+from frontier import BloomFilter, CrawlFrontier
+from metrics import Metrics
+from resilience import AdaptiveLimiter, ResilientTransport
+from results import ScrapeResult
+from scraper import Scraper, TagRegistry
+from sites import get_site
+from transport import HttpTransport
+
+logger = logging.getLogger('scraper')
+
+class MultiSiteCrawler:
+    """
+    Recorre varios sitios de frases a la vez, con un Scraper por sitio.
+
+    Cada sitio tiene su propio transporte (pool de conexiones y límite de peticiones por segundo
+    del dominio) y su propia concurrencia, según su adaptador. Los IDs de tags y la caché de autores
+    se comparten, de modo que todas las filas encajan en el mismo esquema `autor`/`frase`/`tag`.
+    Las páginas se entregan en cuanto cualquier sitio las tiene listas, así que el tiempo total
+    lo marca el sitio más lento y no la suma de todos.
+    """
+
+    def __init__(self, sites, author_cache=None, fingerprints=None, metrics=None, transports=None, tags=None,
+                 parse_workers=0, follow_links=False, bloom_capacity=None, refresh_authors=False):
+        self.sites = [get_site(site) for site in sites]
+        if not self.sites:
+            raise ValueError("No se indicó ningún sitio")
+        self.author_cache = author_cache if author_cache is not None else AuthorCache()
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.tags = tags if tags is not None else TagRegistry()
+        # Transportes por nombre de sitio; se pueden pasar ya creados para reutilizar conexiones entre ejecuciones
+        self.transports = transports if transports is not None else {}
+        # Con `follow_links`, cada sitio se recorre con su propia frontera (ver frontier.py)
+        self.follow_links = follow_links
+        self.bloom_capacity = bloom_capacity
+        self.scrapers = [
+            Scraper(site.base_url, concurrency=site.concurrency, author_cache=self.author_cache,
+                    transport=self.transport_for(site), fingerprints=fingerprints,
+                    metrics=self.metrics, site=site, tags=self.tags, parse_workers=parse_workers,
+                    frontier=self.new_frontier(), refresh_authors=refresh_authors)
+            for site in self.sites
+        ]
+
+    @property
+    def author_updates(self):
+        """
+        Detalles nuevos de los autores que cambiaron fuera del listado, de todos los sitios (ver Scraper.revisit_authors).
+        """
+        updates = {}
+        for scraper in self.scrapers:
+            updates.update(scraper.author_updates)
+        return updates
+
+    def transport_for(self, site):
+        transport = self.transports.get(site.name)
+        if transport is None:
+            # Reintentos, interruptor y concurrencia adaptativa propios de cada sitio (ver resilience.py)
+            transport = self.transports[site.name] = ResilientTransport(
+                HttpTransport(pool_size=max(site.concurrency, 10), rate_limit=site.rate_limit),
+                limiter=AdaptiveLimiter(max(site.concurrency, 1)))
+        if isinstance(transport, ResilientTransport):
+            # Un transporte reutilizado entre ejecuciones anota en las métricas de la actual
+            transport.metrics = self.metrics
+        return transport
+
+    def new_frontier(self):
+        if not self.follow_links:
+            return None
+        return CrawlFrontier(BloomFilter(self.bloom_capacity) if self.bloom_capacity else None)
+
+    def seed_tags(self, tags_dict):
+        """
+        Parte de los IDs de tags ya existentes (ver Scraper.seed_tags).
+        """
+        self.tags.seed(tags_dict)
+
+    async def aiter_quotes(self):
+        """
+        Recorre todos los sitios en paralelo y devuelve (yield) las filas de cada página
+        a medida que llegan, de cualquier sitio. Un sitio que falla no detiene a los demás.
+        """
+        # Cola acotada: si el consumidor se retrasa, los sitios dejan de pedir páginas nuevas
+        pages = asyncio.Queue(maxsize=2 * len(self.scrapers))
+        done = object()
+
+        async def crawl_site(scraper):
+            try:
+                async for rows in scraper.aiter_quotes():
+                    await pages.put(rows)
+            except Exception as e:
+                logger.error("Error al recorrer %s: %s", scraper.site.name, e, extra={'site': scraper.site.name})
+            finally:
+                await pages.put(done)
+
+        tasks = [asyncio.ensure_future(crawl_site(scraper)) for scraper in self.scrapers]
+        try:
+            pending = len(tasks)
+            while pending:
+                rows = await pages.get()
+                if rows is done:
+                    pending -= 1
+                    continue
+                yield rows
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def scrape_quotes_async(self):
+        """
+        Devuelve los `(frases_df, tags_df)` de todos los sitios juntos.
+        """
+        data = []
+        async for rows in self.aiter_quotes():
+            data.extend(rows)
+        return self.scrapers[0]._build_dataframes(data)
+
+    async def scrape_result_async(self):
+        """
+        Devuelve un ScrapeResult (ver results.py) con las frases de todos los sitios.
+        """
+        result = ScrapeResult()
+        async for rows in self.aiter_quotes():
+            result.add_rows(rows)
+        result.add_tags(self.tags.ids)
+        return result
@@ -2,13 +2,142 @@ import asyncpg
 import asyncio
 import db  # Importamos la configuración de la base de datos
 
+# Definición de las tablas, compartida con los benchmarks
+TABLES_SQL = [
+    """
+    CREATE TABLE IF NOT EXISTS autor (
+        autor_id SERIAL PRIMARY KEY,
+        autor_nombre VARCHAR(255),
+        autor_apellido VARCHAR(255),
+        autor_url VARCHAR(255),
+        autor_fecha_nac VARCHAR(255),
+        autor_lugar_nac VARCHAR(255),
+        autor_descripcion TEXT,
+        UNIQUE (autor_nombre, autor_apellido)
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS tag (
+        tag_id SERIAL PRIMARY KEY,
+        tag_texto VARCHAR(255) UNIQUE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS frase (
+        frase_id SERIAL PRIMARY KEY,
+        frase_texto TEXT UNIQUE,
+        autor_id INTEGER REFERENCES autor(autor_id),
+        tag_id INTEGER REFERENCES tag(tag_id),
+        fuente VARCHAR(255)
+    )
+    """,
+    # Sitio del que procede cada frase, también en bases de datos creadas antes de tener varios sitios
+    "ALTER TABLE frase ADD COLUMN IF NOT EXISTS fuente VARCHAR(255)",
+    """
+    CREATE TABLE IF NOT EXISTS frase_tag (
+        frase_id INTEGER NOT NULL,
+        tag_id INTEGER NOT NULL,
+        PRIMARY KEY (frase_id, tag_id),
+        FOREIGN KEY (frase_id) REFERENCES frase(frase_id) ON DELETE CASCADE,
+        FOREIGN KEY (tag_id) REFERENCES tag(tag_id) ON DELETE CASCADE
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS pagina_huella (
+        url TEXT PRIMARY KEY,
+        contenido_hash CHAR(64) NOT NULL,
+        datos JSONB,
+        etag TEXT,
+        last_modified TEXT,
+        actualizado_en TIMESTAMP NOT NULL DEFAULT now()
+    )
+    """,
+    # Validadores HTTP de cada página para las peticiones condicionales (ETag / If-Modified-Since)
+    "ALTER TABLE pagina_huella ADD COLUMN IF NOT EXISTS etag TEXT",
+    "ALTER TABLE pagina_huella ADD COLUMN IF NOT EXISTS last_modified TEXT",
+    # Calendario de revisitas de cada página (ver recrawl.py)
+    """
+    CREATE TABLE IF NOT EXISTS pagina_revisita (
+        url TEXT PRIMARY KEY,
+        tipo VARCHAR(20) NOT NULL,
+        revisada_en TIMESTAMPTZ NOT NULL,
+        intervalo DOUBLE PRECISION NOT NULL,
+        revisiones INTEGER NOT NULL DEFAULT 0,
+        cambios INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    """
+    CREATE TABLE IF NOT EXISTS datos_version (
+        id INTEGER PRIMARY KEY DEFAULT 1 CHECK (id = 1),
+        version BIGINT NOT NULL DEFAULT 0,
+        actualizado_en TIMESTAMP NOT NULL DEFAULT now()
+    )
+    """,
+]
+
+# Índices de búsqueda: texto completo sobre las frases y trigramas sobre autores y tags
+SEARCH_INDEXES_SQL = [
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    """
+    ALTER TABLE frase ADD COLUMN IF NOT EXISTS frase_tsv tsvector
+        GENERATED ALWAYS AS (to_tsvector('english', coalesce(frase_texto, ''))) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_frase_tsv ON frase USING GIN (frase_tsv)",
+    """
+    CREATE INDEX IF NOT EXISTS idx_autor_nombre_completo_trgm
+        ON autor USING GIN ((autor_nombre || ' ' || autor_apellido) gin_trgm_ops)
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_tag_texto_trgm ON tag USING GIN (tag_texto gin_trgm_ops)",
+]
+
+# Estadísticas precalculadas para el frontend; los índices únicos permiten REFRESH ... CONCURRENTLY
+STATS_VIEWS_SQL = [
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS mv_frases_por_autor AS
+    SELECT autor.autor_id, autor.autor_nombre, autor.autor_apellido,
+           autor.autor_nombre || ' ' || autor.autor_apellido AS full_name,
+           count(frase.frase_id) AS counts
+    FROM autor
+    JOIN frase ON frase.autor_id = autor.autor_id
+    GROUP BY autor.autor_id, autor.autor_nombre, autor.autor_apellido
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_frases_por_autor ON mv_frases_por_autor (autor_id)",
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS mv_frases_por_tag AS
+    SELECT tag.tag_id, tag.tag_texto AS tags, count(frase_tag.frase_id) AS counts
+    FROM tag
+    JOIN frase_tag ON frase_tag.tag_id = tag.tag_id
+    GROUP BY tag.tag_id, tag.tag_texto
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_frases_por_tag ON mv_frases_por_tag (tag_id)",
+    """
+    CREATE MATERIALIZED VIEW IF NOT EXISTS mv_totales AS
+    SELECT 1 AS id,
+           (SELECT count(*) FROM frase) AS total_frases,
+           (SELECT count(*) FROM autor) AS total_autores,
+           (SELECT count(*) FROM tag) AS total_tags
+    """,
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_mv_totales ON mv_totales (id)",
+]
+
+STATS_VIEWS = ['mv_frases_por_autor', 'mv_frases_por_tag', 'mv_totales']
+
+async def refresh_statistics(conn):
+    """
+    Recalcula las vistas de estadísticas sin bloquear las lecturas del frontend.
+    """
+    for view in STATS_VIEWS:
+        await conn.execute(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}")
+
 class AsyncDatabaseManager:
-    def __init__(self, db_name, db_user, db_password, db_host, db_port):
+    def __init__(self, db_name, db_user, db_password, db_host, db_port, pool=None):
         self.db_name = db_name
         self.db_user = db_user
         self.db_password = db_password
         self.db_host = db_host
         self.db_port = db_port
+        # Pool de la base de datos de frases (ver db.create_pool); no sirve para crear la base de datos
+        self.pool = pool
 
     async def create_database(self):
         try:
@@ -30,54 +159,36 @@ class AsyncDatabaseManager:
             await conn.close()
 
     async def create_tables(self):
+        if self.pool is not None:
+            async with self.pool.acquire() as conn:
+                await self._create_tables(conn)
+            return
+
         try:
             # Conexión a la base de datos específica
             conn = await asyncpg.connect(database=self.db_name, user=self.db_user, password=self.db_password, 
                                          host=self.db_host, port=self.db_port)
+            await self._create_tables(conn)
+        finally:
+            await conn.close()
 
-            # Crear tablas si no existen
-            await conn.execute("""
-            CREATE TABLE IF NOT EXISTS frase (
-                frase_id SERIAL PRIMARY KEY,
-                frase_text TEXT UNIQUE,
-                autor_id INTEGER REFERENCES autor(autor_id),
-                tag_id INTEGER REFERENCES tag(tag_id)                                                          
-            )
-            """)
-            await conn.execute("""
-            CREATE TABLE IF NOT EXISTS autor (
-                autor_id SERIAL PRIMARY KEY,
-                autor_nombre VARCHAR(255),
-                autor_apellido VARCHAR(255),
-                autor_url VARCHAR(255),
-                autor_fecha_nac VARCHAR(255),
-                autor_lugar_nac VARCHAR(255),
-                autor_descripcion TEXT,
-                UNIQUE (autor_nombre, autor_apellido)
-            )
-            """)
-            await conn.execute("""
-            CREATE TABLE IF NOT EXISTS tag (
-                tag_id SERIAL PRIMARY KEY,
-                tag_text VARCHAR(255) UNIQUE
-            )
-            """)
-            await conn.execute("""
-            CREATE TABLE IF NOT EXISTS frase_tag (
-                frase_id INTEGER NOT NULL,
-                tag_id INTEGER NOT NULL,
-                PRIMARY KEY (frase_id, tag_id),  
-                FOREIGN KEY (frase_id) REFERENCES frase(frase_id) ON DELETE CASCADE,
-                FOREIGN KEY (tag_id) REFERENCES tag(tag_id) ON DELETE CASCADE  
-            )
-            """)
+    async def _create_tables(self, conn):
+        try:
+            # Crear tablas si no existen (en orden, para que existan las tablas referenciadas)
+            for statement in TABLES_SQL:
+                await conn.execute(statement)
             print("Tablas creadas.")
+
+            for statement in SEARCH_INDEXES_SQL:
+                await conn.execute(statement)
+            print("Índices de búsqueda creados.")
+
+            for statement in STATS_VIEWS_SQL:
+                await conn.execute(statement)
+            print("Vistas de estadísticas creadas.")
         
         except asyncpg.PostgresError as e:
             print(f"Error al crear las tablas: {e}")
-        
-        finally:
-            await conn.close()
 
 async def main():
     # Usamos la configuración importada desde db.py
@@ -91,7 +202,13 @@ async def main():
 
     db_manager = AsyncDatabaseManager(**db_config)
     await db_manager.create_database()
-    await db_manager.create_tables()
+
+    # Una vez que existe la base de datos, las tablas se crean con el pool compartido
+    db_manager.pool = await db.create_pool()
+    try:
+        await db_manager.create_tables()
+    finally:
+        await db_manager.pool.close()
 
 if __name__ == "__main__":
     asyncio.run(main())
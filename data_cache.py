@@ -0,0 +1,131 @@
+import select
+import threading
+import time
+
+import psycopg2
+import psycopg2.extensions
+
+# Canal de NOTIFY por el que el actualizador avisa de que hay datos nuevos
+DATA_CHANGED_CHANNEL = 'datos_actualizados'
+
+class CachedDataFetcher:
+    """
+    Caché de los resultados de un DataFetcher, compartida entre sesiones de Streamlit.
+
+    Envuelve los métodos `get_*` del fetcher: cada resultado se guarda por método y argumentos
+    y se reutiliza mientras no caduque (`ttl`, en segundos) y la versión de los datos no cambie.
+    La versión se lee con `version_loader` como mucho cada `version_check_interval` segundos,
+    o se actualiza al instante con `invalidate()` (p. ej. desde un DataChangeListener).
+    """
+
+    def __init__(self, data_fetcher, ttl=600, version_loader=None, version_check_interval=10):
+        self.data_fetcher = data_fetcher
+        self.ttl = ttl
+        self.version_loader = version_loader if version_loader is not None else getattr(data_fetcher, 'data_version', None)
+        self.version_check_interval = version_check_interval
+        self._entries = {}
+        self._lock = threading.Lock()
+        self._version = None
+        self._version_checked_at = None
+
+    def __getattr__(self, name):
+        attr = getattr(self.data_fetcher, name)
+        if not name.startswith('get_') or not callable(attr):
+            return attr
+
+        def cached(*args):
+            return self._get((name,) + args, lambda: attr(*args))
+        return cached
+
+    def _current_version(self):
+        now = time.monotonic()
+        if self.version_loader is not None and (
+                self._version_checked_at is None or now - self._version_checked_at >= self.version_check_interval):
+            try:
+                self._version = self.version_loader()
+            except Exception:
+                # Sin tabla de versión (o sin conexión) la caché depende solo del TTL
+                pass
+            self._version_checked_at = now
+        return self._version
+
+    def _get(self, key, loader):
+        with self._lock:
+            version = self._current_version()
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, loaded_at, loaded_version = entry
+                if loaded_version == version and time.monotonic() - loaded_at < self.ttl:
+                    return value
+
+        # La consulta se hace fuera del lock para no bloquear a las demás sesiones
+        value = loader()
+        with self._lock:
+            self._entries[key] = (value, time.monotonic(), version)
+        return value
+
+    def invalidate(self, version=None):
+        """
+        Descarta todos los resultados guardados. Si se conoce la nueva versión, se adopta
+        directamente sin esperar a la siguiente comprobación.
+        """
+        with self._lock:
+            self._entries.clear()
+            if version is not None:
+                self._version = version
+                self._version_checked_at = time.monotonic()
+            else:
+                self._version_checked_at = None
+
+class DataChangeListener(threading.Thread):
+    """
+    Hilo que escucha el canal de NOTIFY del actualizador y llama a `on_change(version)`
+    cada vez que llega un aviso. Se reconecta solo si se pierde la conexión.
+    """
+
+    def __init__(self, dsn, on_change, channel=DATA_CHANGED_CHANNEL, poll_timeout=5):
+        super().__init__(daemon=True, name='data-change-listener')
+        self.dsn = dsn
+        self.on_change = on_change
+        self.channel = channel
+        self.poll_timeout = poll_timeout
+        self._stopped = threading.Event()
+
+    def run(self):
+        while not self._stopped.is_set():
+            conn = None
+            try:
+                conn = psycopg2.connect(self.dsn)
+                conn.set_isolation_level(psycopg2.extensions.ISOLATION_LEVEL_AUTOCOMMIT)
+                with conn.cursor() as cur:
+                    cur.execute(f"LISTEN {self.channel}")
+
+                while not self._stopped.is_set():
+                    if select.select([conn], [], [], self.poll_timeout) == ([], [], []):
+                        continue
+                    conn.poll()
+                    while conn.notifies:
+                        notify = conn.notifies.pop(0)
+                        self.on_change(int(notify.payload) if notify.payload.isdigit() else None)
+            except psycopg2.Error:
+                self._stopped.wait(self.poll_timeout)
+            finally:
+                # La conexión rota se cierra antes de abrir la siguiente
+                if conn is not None:
+                    conn.close()
+
+    def stop(self):
+        self._stopped.set()
+
+async def bump_data_version(conn, channel=DATA_CHANGED_CHANNEL):
+    """
+    Incrementa la versión de los datos y la notifica por `channel`. La llama el actualizador
+    después de una carga correcta.
+    """
+    version = await conn.fetchval("""
+    INSERT INTO datos_version (id, version, actualizado_en) VALUES (1, 1, now())
+    ON CONFLICT (id) DO UPDATE SET version = datos_version.version + 1, actualizado_en = now()
+    RETURNING version
+    """)
+    await conn.execute("SELECT pg_notify($1, $2)", channel, str(version))
+    return version
@@ -1,5 +1,30 @@
+import asyncpg
+
 DB_NAME = "quotes_db"
 DB_USER = "postgres"  # Reemplaza con tu usuario de PostgreSQL #test
 DB_PASSWORD = "postgres"  # Reemplaza con tu contraseña de PostgreSQL
 DB_HOST = "localhost"  # Cambia si tu host es diferente
-DB_PORT = 5432
\ No newline at end of file
+DB_PORT = 5432
+
+# Pool de conexiones compartido por el guardado, el actualizador y la creación de tablas
+POOL_MIN_SIZE = 2
+POOL_MAX_SIZE = 10
+STATEMENT_CACHE_SIZE = 100  # Sentencias preparadas que asyncpg guarda por conexión
+MAX_INACTIVE_CONNECTION_LIFETIME = 300  # Segundos antes de cerrar una conexión inactiva
+
+async def create_pool(database=DB_NAME, user=DB_USER, password=DB_PASSWORD, host=DB_HOST, port=DB_PORT,
+                      min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE):
+    """
+    Crea el pool de conexiones asyncpg con la configuración de este módulo.
+    """
+    return await asyncpg.create_pool(
+        database=database,
+        user=user,
+        password=password,
+        host=host,
+        port=port,
+        min_size=min_size,
+        max_size=max_size,
+        statement_cache_size=STATEMENT_CACHE_SIZE,
+        max_inactive_connection_lifetime=MAX_INACTIVE_CONNECTION_LIFETIME
+    )
\ No newline at end of file
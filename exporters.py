@@ -0,0 +1,228 @@
+import csv
+import gzip
+import json
+import os
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet es opcional
+    pa = pq = None
+
+# Columnas de cada fila del scraper (ver Scraper._build_row), en el orden de exportación
+QUOTE_COLUMNS = ('frase_texto', 'autor_nombre', 'autor_apellido', 'autor_url', 'autor_fecha_nac',
+                 'autor_lugar_nac', 'autor_descripcion', 'Tags', 'Tags_IDs', 'fuente')
+LIST_COLUMNS = ('Tags', 'Tags_IDs')
+
+def tags_path(filename):
+    """
+    Archivo de los tags que acompaña a `filename`: 'frases.parquet' -> 'frases_tags.parquet'.
+    """
+    directory, name = os.path.split(filename)
+    stem, dot, extension = name.partition('.')
+    return os.path.join(directory, f"{stem}_tags{dot}{extension}")
+
+def _clean_row(row):
+    # La misma limpieza que Scraper._build_dataframes
+    description = row.get('autor_descripcion')
+    return dict(row, autor_descripcion=description.strip() if isinstance(description, str) else description)
+
+class Exporter(ABC):
+    """
+    Exportación por lotes de los resultados del scraper: `write_rows` recibe las filas de cada
+    página en cuanto llegan y `write_tags` el diccionario `tag_texto -> tag_id` al terminar.
+
+    Los archivos se escriben como `<nombre>.partial` y `close` los termina y les da su nombre
+    definitivo, así que un recorrido interrumpido nunca deja un archivo a medias con el nombre
+    final (ni sustituye al de una exportación anterior). Se usa como context manager: si el
+    bloque termina con una excepción se llama a `abort`, que borra los archivos parciales.
+    """
+
+    format = None
+    extension = None
+
+    def __init__(self, filename=None):
+        self.filename = filename if filename is not None else f"frases_autores_detalles{self.extension}"
+        self.rows = 0
+        # Archivo parcial -> nombre definitivo
+        self._partials = {}
+
+    def _output(self, path):
+        # Ruta en la que se escribe `path` hasta que la exportación termina bien
+        partial = f"{path}.partial"
+        self._partials[partial] = path
+        return partial
+
+    @abstractmethod
+    def write_rows(self, rows):
+        """
+        Escribe (o acumula) las filas de una página.
+        """
+
+    @abstractmethod
+    def write_tags(self, tags_dict):
+        """
+        Escribe los tags del recorrido.
+        """
+
+    def _close_files(self, completed):
+        # Cierra los archivos abiertos; con `completed` False no hace falta terminar de escribirlos
+        pass
+
+    def close(self):
+        """
+        Termina de escribir los archivos y los renombra a su nombre definitivo.
+        """
+        self._close_files(completed=True)
+        for partial, path in self._partials.items():
+            os.replace(partial, path)
+        self._partials = {}
+
+    def abort(self):
+        """
+        Descarta la exportación: cierra los archivos y borra los parciales.
+        """
+        self._close_files(completed=False)
+        for partial in self._partials:
+            if os.path.exists(partial):
+                os.remove(partial)
+        self._partials = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+class ParquetExporter(Exporter):
+    """
+    Parquet (Arrow) escrito por grupos de filas de `chunk_rows`: la memoria no depende del tamaño
+    total del recorrido. `Tags` y `Tags_IDs` son columnas de listas nativas (list<string>, list<int32>).
+    """
+
+    format = 'parquet'
+    extension = '.parquet'
+
+    def __init__(self, filename=None, chunk_rows=10000, compression='zstd'):
+        if pa is None:
+            raise ImportError("La exportación a Parquet necesita pyarrow (pip install pyarrow)")
+        super().__init__(filename)
+        self.chunk_rows = chunk_rows
+        self.compression = compression
+        self.schema = pa.schema(
+            [(column, pa.string()) for column in QUOTE_COLUMNS if column not in LIST_COLUMNS]
+            + [('Tags', pa.list_(pa.string())), ('Tags_IDs', pa.list_(pa.int32()))]
+        )
+        self._buffer = []
+        self._writer = pq.ParquetWriter(self._output(self.filename), self.schema, compression=compression)
+
+    def _flush(self):
+        if not self._buffer:
+            return
+        columns = {column: [row.get(column) for row in self._buffer] for column in self.schema.names}
+        self._writer.write_table(pa.Table.from_pydict(columns, schema=self.schema))
+        self._buffer = []
+
+    def write_rows(self, rows):
+        self._buffer.extend(_clean_row(row) for row in rows)
+        self.rows += len(rows)
+        if len(self._buffer) >= self.chunk_rows:
+            self._flush()
+
+    def write_tags(self, tags_dict):
+        table = pa.table({'tag_texto': pa.array(list(tags_dict), pa.string()),
+                          'tag_id': pa.array(list(tags_dict.values()), pa.int32())})
+        pq.write_table(table, self._output(tags_path(self.filename)), compression=self.compression)
+
+    def _close_files(self, completed):
+        if self._writer is not None:
+            if completed:
+                self._flush()
+            self._writer.close()
+            self._writer = None
+
+class CsvExporter(Exporter):
+    """
+    CSV comprimido con gzip, escrito fila a fila. Las listas (`Tags`, `Tags_IDs`) se guardan
+    como arrays JSON (`["love", "life"]`, `[1, 2]`), que se leen sin ambigüedad con cualquier herramienta.
+    """
+
+    format = 'csv'
+    extension = '.csv.gz'
+
+    def __init__(self, filename=None):
+        super().__init__(filename)
+        self._file = gzip.open(self._output(self.filename), 'wt', compresslevel=6, encoding='utf-8', newline='')
+        self._writer = csv.writer(self._file)
+        self._writer.writerow(QUOTE_COLUMNS)
+
+    def write_rows(self, rows):
+        for row in rows:
+            row = _clean_row(row)
+            self._writer.writerow([
+                json.dumps(row.get(column), ensure_ascii=False) if column in LIST_COLUMNS else row.get(column)
+                for column in QUOTE_COLUMNS
+            ])
+        self.rows += len(rows)
+
+    def write_tags(self, tags_dict):
+        with gzip.open(self._output(tags_path(self.filename)), 'wt', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(('tag_texto', 'tag_id'))
+            writer.writerows(tags_dict.items())
+
+    def _close_files(self, completed):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+class ExcelExporter(Exporter):
+    """
+    Formato de referencia (lento): acumula todas las filas y escribe al cerrar un libro con
+    las hojas de frases y de tags, como Scraper.save_to_excel. Necesita openpyxl.
+    """
+
+    format = 'excel'
+    extension = '.xlsx'
+
+    def __init__(self, filename=None):
+        super().__init__(filename)
+        self._rows = []
+        self._tags = {}
+
+    def write_rows(self, rows):
+        self._rows.extend(_clean_row(row) for row in rows)
+        self.rows += len(rows)
+
+    def write_tags(self, tags_dict):
+        self._tags = dict(tags_dict)
+
+    def _close_files(self, completed):
+        if self._rows is None:
+            return
+        if not completed:
+            self._rows = None
+            return
+        frases_df = pd.DataFrame(self._rows, columns=list(QUOTE_COLUMNS))
+        tags_df = pd.DataFrame(list(self._tags.items()), columns=['tag_texto', 'tag_id'])
+        # Se escribe en un archivo abierto porque la extensión '.partial' no permite deducir el motor
+        with open(self._output(self.filename), 'wb') as f, pd.ExcelWriter(f, engine='openpyxl') as writer:
+            frases_df.to_excel(writer, sheet_name='Frases_Autores_Detalles', index=False)
+            tags_df.to_excel(writer, sheet_name='Tags', index=False)
+        self._rows = None
+
+EXPORTERS = {exporter.format: exporter for exporter in (ParquetExporter, CsvExporter, ExcelExporter)}
+
+def get_exporter(format, filename=None, **options):
+    """
+    Crea el exportador del formato `format` (ver EXPORTERS).
+    """
+    if format not in EXPORTERS:
+        raise ValueError(f"Formato de exportación desconocido: {format}")
+    return EXPORTERS[format](filename, **options)
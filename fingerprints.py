@@ -0,0 +1,171 @@
+import hashlib
+import json
+import threading
+
+class PageFingerprints:
+    """
+    Huellas (hash del contenido) de las páginas descargadas, para detectar qué ha cambiado
+    desde la ejecución anterior.
+
+    `previous` es el diccionario `url -> (hash, datos, validadores)` de la ejecución anterior;
+    `datos` guarda lo extraído de la página cuando hace falta reutilizarlo (p. ej. los detalles
+    de un autor) y es None para las páginas del listado. `validadores` es el par
+    `(etag, last_modified)` de la respuesta (o None), con el que la siguiente petición se hace
+    condicional: un 304 equivale a una página sin cambios. Las huellas nuevas o modificadas se
+    acumulan en `changed`, con el mismo formato, para guardarlas al terminar.
+
+    Con un `schedule` (RecrawlSchedule, ver recrawl.py) cada revisión se anota en el calendario
+    y las páginas con huella que aún no toca revisar no se piden (`is_due`).
+    """
+
+    def __init__(self, previous=None, schedule=None):
+        self.previous = previous or {}
+        self.changed = {}
+        # Los hilos de descarga actualizan los contadores a la vez
+        self.stats = {'changed': 0, 'unchanged': 0}
+        self.schedule = schedule
+        self._lock = threading.Lock()
+
+    def _count(self, key):
+        with self._lock:
+            self.stats[key] += 1
+
+    @staticmethod
+    def hash_content(text):
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def is_unchanged(self, url, content_hash):
+        """
+        Indica si la página tiene el mismo contenido que en la ejecución anterior.
+        """
+        previous = self.previous.get(url)
+        unchanged = previous is not None and previous[0] == content_hash
+        self._count('unchanged' if unchanged else 'changed')
+        if self.schedule is not None:
+            self.schedule.observe(url, changed=not unchanged)
+        return unchanged
+
+    def is_due(self, url, page_type='listing', with_data=False):
+        """
+        Indica si toca pedir `url` según el calendario. Una página sin huella (o, con `with_data`,
+        sin datos que reutilizar) siempre se pide; una que no toca se resuelve como un 304.
+        """
+        if self.schedule is None or self.schedule.is_due(url, page_type):
+            return True
+        if url not in self.previous or (with_data and self.previous_data(url) is None):
+            return True
+        self.schedule.skip(url)
+        return False
+
+    def author_urls(self):
+        """
+        URLs de las páginas de autores de la ejecución anterior (las que guardan sus detalles).
+        """
+        return [url for url, previous in self.previous.items()
+                if isinstance(previous[1], dict) and 'author-description' in previous[1]]
+
+    def previous_data(self, url):
+        previous = self.previous.get(url)
+        return previous[1] if previous is not None else None
+
+    def previous_validators(self, url):
+        previous = self.previous.get(url)
+        return previous[2] if previous is not None and len(previous) > 2 else None
+
+    @staticmethod
+    def validators_of(response):
+        """
+        `(etag, last_modified)` de una respuesta, o None si no trae ninguno de los dos.
+        """
+        headers = getattr(response, 'headers', None) or {}
+        etag, last_modified = headers.get('ETag'), headers.get('Last-Modified')
+        etag = etag if isinstance(etag, str) else None
+        last_modified = last_modified if isinstance(last_modified, str) else None
+        return (etag, last_modified) if etag or last_modified else None
+
+    def request_headers(self, url, with_data=False):
+        """
+        Cabeceras de una petición condicional para `url` (If-None-Match / If-Modified-Since),
+        o None si no hay validadores. Con `with_data`, solo si además hay datos que reutilizar
+        cuando la respuesta sea un 304.
+        """
+        validators = self.previous_validators(url)
+        if validators is None or (with_data and self.previous_data(url) is None):
+            return None
+        etag, last_modified = validators
+        headers = {}
+        if etag:
+            headers['If-None-Match'] = etag
+        if last_modified:
+            headers['If-Modified-Since'] = last_modified
+        return headers or None
+
+    def not_modified(self, url):
+        """
+        Anota una respuesta 304: la página no cambió y su huella sigue siendo la anterior.
+        """
+        self._count('unchanged')
+        if self.schedule is not None:
+            self.schedule.observe(url, changed=False)
+
+    def failed(self, url):
+        """
+        La página no se pudo procesar entera: se vuelve a pedir en la siguiente ejecución.
+        """
+        if self.schedule is not None:
+            self.schedule.retry(url)
+
+    def refresh_validators(self, url, validators, data=None):
+        """
+        Para una página sin cambios, guarda los validadores nuevos si el servidor los cambió
+        (y `data`, si se pasa y no coincide con los datos anteriores).
+        """
+        previous = self.previous.get(url)
+        if previous is None:
+            return
+        validators = validators if validators is not None else self.previous_validators(url)
+        data = data if data is not None else previous[1]
+        if validators != self.previous_validators(url) or data != previous[1]:
+            self.changed[url] = (previous[0], data, validators)
+
+    def record(self, url, content_hash, data=None, validators=None):
+        """
+        Registra la huella de una página procesada correctamente.
+        """
+        self.changed[url] = (content_hash, data, validators)
+
+async def load_fingerprints(conn):
+    """
+    Carga las huellas guardadas en la tabla `pagina_huella`.
+    """
+    records = await conn.fetch("SELECT url, contenido_hash, datos, etag, last_modified FROM pagina_huella")
+    return PageFingerprints({
+        r['url']: (r['contenido_hash'], json.loads(r['datos']) if r['datos'] is not None else None,
+                   (r['etag'], r['last_modified']) if r['etag'] or r['last_modified'] else None)
+        for r in records
+    })
+
+async def save_fingerprints(conn, fingerprints):
+    """
+    Guarda en `pagina_huella` las huellas nuevas o modificadas durante la ejecución.
+    """
+    if not fingerprints.changed:
+        return
+    urls = list(fingerprints.changed)
+    validators = [fingerprints.changed[url][2] or (None, None) for url in urls]
+    await conn.execute("""
+    INSERT INTO pagina_huella (url, contenido_hash, datos, etag, last_modified, actualizado_en)
+    SELECT url, contenido_hash, datos::jsonb, etag, last_modified, now()
+    FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::text[])
+         AS h(url, contenido_hash, datos, etag, last_modified)
+    ON CONFLICT (url) DO UPDATE SET contenido_hash = EXCLUDED.contenido_hash,
+                                    datos = EXCLUDED.datos,
+                                    etag = EXCLUDED.etag,
+                                    last_modified = EXCLUDED.last_modified,
+                                    actualizado_en = EXCLUDED.actualizado_en
+    """, urls,
+       [fingerprints.changed[url][0] for url in urls],
+       [json.dumps(fingerprints.changed[url][1], ensure_ascii=False)
+        if fingerprints.changed[url][1] is not None else None for url in urls],
+       [etag for etag, _ in validators],
+       [last_modified for _, last_modified in validators])
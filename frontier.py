@@ -0,0 +1,145 @@
+import hashlib
+import heapq
+import itertools
+import math
+import time
+from urllib.parse import urldefrag, urlsplit, urlunsplit
+
+def normalize_url(url):
+    """
+    Forma canónica de una URL para deduplicar: sin fragmento, con el esquema y el host
+    en minúsculas y con '/' como ruta mínima.
+    """
+    url, _ = urldefrag(url)
+    parts = urlsplit(url)
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or '/', parts.query, ''))
+
+class BloomFilter:
+    """
+    Conjunto aproximado de tamaño fijo para recorridos grandes: ocupa unos pocos bits por URL
+    (unos 14 con `error_rate=0.001`) en lugar de la URL completa. No tiene falsos negativos;
+    con probabilidad `error_rate` una URL nueva se da por vista y no se visita.
+    """
+
+    def __init__(self, capacity, error_rate=0.001):
+        if capacity <= 0 or not 0 < error_rate < 1:
+            raise ValueError("capacity debe ser positiva y error_rate estar entre 0 y 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.size = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.size / capacity * math.log(2)))
+        self._bits = bytearray((self.size + 7) // 8)
+        self._count = 0
+
+    def _positions(self, item):
+        # Doble hash: las k posiciones se derivan de dos enteros de 64 bits de un único digest
+        digest = hashlib.blake2b(item.encode('utf-8'), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], 'little')
+        h2 = int.from_bytes(digest[8:], 'little') | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hashes))
+
+    def add(self, item):
+        for position in self._positions(item):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self._count += 1
+
+    def __contains__(self, item):
+        return all(self._bits[position >> 3] & (1 << (position & 7)) for position in self._positions(item))
+
+    def __len__(self):
+        # Número de altas (las repetidas también cuentan)
+        return self._count
+
+class CrawlFrontier:
+    """
+    Frontera de un recorrido: cola de prioridad de las URLs pendientes y conjunto de URLs
+    ya vistas, para no pedir nunca dos veces la misma.
+
+    `visited` es un `set` (exacto) o un BloomFilter (memoria acotada en recorridos grandes).
+    Las páginas del listado ('listing') van antes que las de tags ('tag'). Una URL que falla
+    se vuelve a encolar hasta `max_retries` reintentos, pero no se devuelve hasta pasados
+    `backoff * 2**(intento - 1)` segundos (como mucho `max_backoff`), para no insistir contra un
+    host que está fallando; después queda en `failed` con el último error y el recorrido sigue
+    con las demás.
+    """
+
+    PRIORITIES = {'listing': 0, 'tag': 1}
+
+    def __init__(self, visited=None, max_retries=3, backoff=1.0, max_backoff=60, clock=time.monotonic):
+        self.visited = visited if visited is not None else set()
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.clock = clock
+        self.attempts = {}
+        self.failed = {}
+        self.retries = 0
+        self._heap = []
+        # Reintentos que aún no tocan: (momento a partir del cual se pueden pedir, contador, url, tipo)
+        self._delayed = []
+        self._counter = itertools.count()
+
+    def _push(self, url, kind):
+        heapq.heappush(self._heap, (self.PRIORITIES.get(kind, len(self.PRIORITIES)), next(self._counter), url, kind))
+
+    def add(self, url, kind='listing'):
+        """
+        Encola `url` si no se había visto. Devuelve True si es nueva.
+        """
+        url = normalize_url(url)
+        if url in self.visited:
+            return False
+        self.visited.add(url)
+        self._push(url, kind)
+        return True
+
+    def _release_due(self):
+        now = self.clock()
+        while self._delayed and self._delayed[0][0] <= now:
+            _, _, url, kind = heapq.heappop(self._delayed)
+            self._push(url, kind)
+
+    def pop(self):
+        """
+        Devuelve la siguiente `(url, kind)` pendiente, o None si no hay ninguna que se pueda pedir
+        ya (la frontera está vacía o solo quedan reintentos que aún no tocan; ver `wait_time`).
+        """
+        self._release_due()
+        if not self._heap:
+            return None
+        _, _, url, kind = heapq.heappop(self._heap)
+        return url, kind
+
+    def retry(self, url, kind, error, permanent=False):
+        """
+        Anota un fallo de `url`. Devuelve True si se volvió a encolar y False si se descarta
+        (error permanente o reintentos agotados).
+        """
+        attempts = self.attempts.get(url, 0) + 1
+        self.attempts[url] = attempts
+        if permanent or attempts > self.max_retries:
+            self.failed[url] = str(error)
+            return False
+        self.retries += 1
+        delay = min(self.max_backoff, self.backoff * 2 ** (attempts - 1))
+        heapq.heappush(self._delayed, (self.clock() + delay, next(self._counter), url, kind))
+        return True
+
+    def wait_time(self):
+        """
+        Segundos hasta que haya una URL que se pueda pedir: 0 si ya la hay y None si la frontera
+        está vacía.
+        """
+        self._release_due()
+        if self._heap:
+            return 0.0
+        if not self._delayed:
+            return None
+        return max(0.0, self._delayed[0][0] - self.clock())
+
+    def __len__(self):
+        return len(self._heap) + len(self._delayed)
+
+    def stats(self):
+        return {'pending': len(self), 'seen': len(self.visited), 'retries': self.retries,
+                'failed': len(self.failed)}
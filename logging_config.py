@@ -0,0 +1,81 @@
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+
+LOG_DIR = 'logs'
+LOG_FILE = 'scraper.log'
+# Nivel por defecto; con SCRAPER_LOG_LEVEL=DEBUG se registra también el detalle de cada frase y autor
+LOG_LEVEL = os.environ.get('SCRAPER_LOG_LEVEL', 'INFO')
+
+# Atributos propios de LogRecord; el resto son campos estructurados pasados con `extra`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {'message', 'asctime'}
+
+class JsonFormatter(logging.Formatter):
+    """
+    Formatea cada registro como una línea JSON con la fecha, el nivel, el logger, el mensaje
+    y los campos adicionales pasados con `extra` (p. ej. `page_url`, `frases`).
+    """
+
+    def format(self, record):
+        entry = {
+            'ts': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        entry.update((key, value) for key, value in vars(record).items() if key not in _RECORD_ATTRS)
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+_lock = threading.Lock()
+_listener = None
+_queue_handler = None
+_logger_name = None
+
+def configure_logging(logger_name='scraper', log_dir=LOG_DIR, filename=LOG_FILE, level=LOG_LEVEL):
+    """
+    Configura una sola vez por proceso el logger `logger_name`: los registros se encolan con un
+    QueueHandler (sin E/S en el hilo que registra) y un QueueListener en segundo plano los escribe
+    en `log_dir/filename` como JSON. Las llamadas siguientes no añaden más manejadores.
+    """
+    global _listener, _queue_handler, _logger_name
+    with _lock:
+        if _listener is not None:
+            return logging.getLogger(_logger_name)
+
+        os.makedirs(log_dir, exist_ok=True)
+        file_handler = logging.FileHandler(os.path.join(log_dir, filename), encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter())
+
+        log_queue = queue.SimpleQueue()
+        _queue_handler = logging.handlers.QueueHandler(log_queue)
+        logger = logging.getLogger(logger_name)
+        logger.setLevel(level)
+        logger.addHandler(_queue_handler)
+
+        _listener = logging.handlers.QueueListener(log_queue, file_handler, respect_handler_level=True)
+        _listener.start()
+        _logger_name = logger_name
+        atexit.register(shutdown_logging)
+        return logger
+
+def shutdown_logging():
+    """
+    Escribe los registros pendientes y detiene el hilo de escritura. Se llama al salir del proceso.
+    """
+    global _listener, _queue_handler, _logger_name
+    with _lock:
+        if _listener is None:
+            return
+        logging.getLogger(_logger_name).removeHandler(_queue_handler)
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+        _queue_handler = None
+        _logger_name = None
@@ -0,0 +1,226 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Límites (en segundos) de los buckets de los histogramas de latencia
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Descripción de las métricas que registran el scraper, el guardado y el actualizador
+METRICS_HELP = {
+    'scraper_http_requests_total': "Peticiones HTTP del scraper por tipo de página y estado",
+    'scraper_http_request_seconds': "Duración de las peticiones HTTP del scraper",
+    'scraper_parse_seconds': "Tiempo de parseo del HTML por tipo de página",
+    'scraper_retries_total': "Peticiones reintentadas (por tipo de página en la frontera; por host y motivo en el transporte)",
+    'scraper_recrawl_skipped_total': "Páginas no pedidas porque aún no tocaba revisarlas (ver recrawl.py)",
+    'scraper_circuit_opened_total': "Veces que se pausaron las peticiones a un host por fallos seguidos",
+    'scraper_failed_urls_total': "Páginas descartadas tras agotar los reintentos o con un error permanente",
+    'saver_quotes_total': "Frases recibidas por AsyncDataSaver",
+    'saver_rows_total': "Filas por tabla y resultado (insertadas, actualizadas, sin cambios)",
+    'saver_transaction_seconds': "Duración de cada transacción de carga",
+    'saver_batch_errors_total': "Lotes cuya carga falló",
+    'updater_stage_seconds': "Duración de cada etapa de DatabaseUpdater.update_database",
+    'updater_runs_total': "Ejecuciones del actualizador por resultado",
+}
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+def _summary_key(key):
+    return ','.join(f"{name}={value}" for name, value in key) or 'total'
+
+def _format_value(value):
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+class Metrics:
+    """
+    Registro de contadores e histogramas con etiquetas, seguro entre hilos.
+
+    Cada componente (Scraper, AsyncDataSaver, DatabaseUpdater) recibe un registro y anota en él;
+    el resultado se exporta en el formato de texto de Prometheus (`render_prometheus`) o como
+    resumen JSON (`summary`). Los registros se pueden acumular con `merge`.
+    """
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self._counters = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name, value=1, **labels):
+        """
+        Suma `value` al contador `name` con las etiquetas dadas.
+        """
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name, value, **labels):
+        """
+        Añade una observación (p. ej. una duración en segundos) al histograma `name`.
+        """
+        key = (name, _label_key(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0}
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    histogram['buckets'][i] += 1
+                    break
+            histogram['sum'] += value
+            histogram['count'] += 1
+
+    @contextmanager
+    def timer(self, name, **labels):
+        """
+        Mide la duración del bloque y la anota en el histograma `name`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start, **labels)
+
+    def counter_value(self, name, **labels):
+        with self._lock:
+            return self._counters.get((name, _label_key(labels)), 0)
+
+    def merge(self, other):
+        """
+        Acumula en este registro los valores de `other` (con los mismos buckets).
+        """
+        with other._lock:
+            counters = dict(other._counters)
+            histograms = {key: {'buckets': list(h['buckets']), 'sum': h['sum'], 'count': h['count']}
+                          for key, h in other._histograms.items()}
+        with self._lock:
+            for key, value in counters.items():
+                self._counters[key] = self._counters.get(key, 0) + value
+            for key, source in histograms.items():
+                histogram = self._histograms.setdefault(
+                    key, {'buckets': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+                histogram['buckets'] = [a + b for a, b in zip(histogram['buckets'], source['buckets'])]
+                histogram['sum'] += source['sum']
+                histogram['count'] += source['count']
+
+    def _quantile(self, histogram, q):
+        # Estimación por el límite superior del bucket que contiene el cuantil
+        target = q * histogram['count']
+        seen = 0
+        for bound, count in zip(self.buckets, histogram['buckets']):
+            seen += count
+            if seen >= target:
+                return bound
+        return float('inf')
+
+    def summary(self):
+        """
+        Resumen serializable en JSON: valor de cada contador y, para cada histograma,
+        número de observaciones, suma, media y percentiles 50 y 95 aproximados.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: dict(h) for key, h in self._histograms.items()}
+
+        result = {'counters': {}, 'histograms': {}}
+        for (name, key), value in sorted(counters.items()):
+            result['counters'].setdefault(name, {})[_summary_key(key)] = value
+        for (name, key), histogram in sorted(histograms.items()):
+            count = histogram['count']
+            result['histograms'].setdefault(name, {})[_summary_key(key)] = {
+                'count': count,
+                'sum': histogram['sum'],
+                'mean': histogram['sum'] / count if count else None,
+                'p50': self._quantile(histogram, 0.5) if count else None,
+                'p95': self._quantile(histogram, 0.95) if count else None,
+            }
+        return result
+
+    def render_prometheus(self):
+        """
+        Devuelve todas las métricas en el formato de texto de Prometheus.
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            histograms = {key: dict(h) for key, h in self._histograms.items()}
+
+        lines = []
+        for name in sorted({name for name, _ in counters}):
+            lines.append(f"# HELP {name} {METRICS_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} counter")
+            for (metric, key), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(key)} {_format_value(value)}")
+
+        for name in sorted({name for name, _ in histograms}):
+            lines.append(f"# HELP {name} {METRICS_HELP.get(name, name)}")
+            lines.append(f"# TYPE {name} histogram")
+            for (metric, key), histogram in sorted(histograms.items()):
+                if metric != name:
+                    continue
+                cumulative = 0
+                for bound, count in zip(self.buckets, histogram['buckets']):
+                    cumulative += count
+                    lines.append(f"{name}_bucket{_format_labels(key, [('le', _format_value(bound))])} {cumulative}")
+                lines.append(f"{name}_bucket{_format_labels(key, [('le', '+Inf')])} {histogram['count']}")
+                lines.append(f"{name}_sum{_format_labels(key)} {_format_value(histogram['sum'])}")
+                lines.append(f"{name}_count{_format_labels(key)} {histogram['count']}")
+
+        return '\n'.join(lines) + '\n'
+
+    def write_prometheus(self, path):
+        """
+        Escribe las métricas en `path` (p. ej. para el textfile collector de node_exporter).
+        El archivo se reemplaza de forma atómica para no exponer nunca uno a medio escribir.
+        """
+        _write_atomic(path, self.render_prometheus())
+
+def _write_atomic(path, text):
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(text)
+    os.replace(tmp_path, path)
+
+def write_run_summary(path, metrics, **extra):
+    """
+    Guarda en `path` el resumen JSON de una ejecución: los campos de `extra` más `metrics.summary()`.
+    """
+    _write_atomic(path, json.dumps(dict(extra, metrics=metrics.summary()), indent=2, ensure_ascii=False))
+
+def serve_metrics(metrics, port, host='0.0.0.0'):
+    """
+    Expone `metrics` en http://host:port/metrics desde un hilo en segundo plano.
+    Devuelve el servidor; `server.shutdown()` lo detiene.
+    """
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split('?', 1)[0] != '/metrics':
+                self.send_error(404)
+                return
+            payload = metrics.render_prometheus().encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+            self.send_header('Content-Length', str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True, name='metrics-server').start()
+    return server
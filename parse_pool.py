@@ -0,0 +1,82 @@
+import asyncio
+from concurrent.futures import ProcessPoolExecutor
+
+# Adaptador del sitio en cada proceso del pool (se carga una vez, al arrancar el proceso)
+_site = None
+
+def _init_worker(site):
+    global _site
+    _site = site
+
+def _parse_listing(html):
+    """
+    Parsea una página del listado en un proceso del pool. Devuelve tuplas simples
+    `(frase_texto, autor_nombre_completo, autor_url, tags)` y los errores de las frases descartadas.
+    """
+    frases = []
+    errors = []
+    for element in _site.quote_elements(html):
+        try:
+            frase = _site.parse_quote(element)
+            frases.append((frase['frase_texto'], frase['autor_nombre_completo'], frase['autor_url'],
+                           tuple(frase['tags'])))
+        except Exception as e:
+            errors.append(str(e))
+    return frases, errors
+
+def _page_links(html, page_url):
+    return _site.page_links(html, page_url)
+
+def _has_next_page(html):
+    return _site.has_next_page(html)
+
+def _parse_author(html):
+    details = _site.parse_author_page(html)
+    return details['author-born-date'], details['author-born-location'], details['author-description']
+
+class ParsePool:
+    """
+    Pool de procesos que parsea el HTML descargado mientras el bucle de eventos sigue descargando,
+    para que el parseo (CPU) no quede limitado a un núcleo por el GIL.
+
+    Al pool solo viajan el HTML y tuplas simples; el adaptador del sitio se envía una vez por proceso.
+    """
+
+    def __init__(self, site, workers):
+        self.workers = workers
+        self._executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(site,))
+
+    async def parse_listing(self, html):
+        """
+        Parsea una página del listado en el pool. Devuelve las frases (los mismos diccionarios
+        que Scraper._parse_quotes_page) y los mensajes de error de las frases descartadas.
+        """
+        frases, errors = await asyncio.wrap_future(self._executor.submit(_parse_listing, html))
+        return [{'frase_texto': texto, 'autor_nombre_completo': autor, 'autor_url': autor_url, 'tags': list(tags)}
+                for texto, autor, autor_url, tags in frases], errors
+
+    async def page_links(self, html, page_url):
+        """
+        Enlaces que seguir desde una página (ver SiteAdapter.page_links), obtenidos en el pool.
+        """
+        return await asyncio.wrap_future(self._executor.submit(_page_links, html, page_url))
+
+    async def has_next_page(self, html):
+        """
+        Si la página del listado enlaza a la siguiente (ver SiteAdapter.has_next_page), obtenido en el pool.
+        """
+        return await asyncio.wrap_future(self._executor.submit(_has_next_page, html))
+
+    def parse_author(self, html):
+        """
+        Parsea la página de un autor y espera el resultado (se llama desde los hilos de descarga).
+        """
+        born_date, born_location, description = self._executor.submit(_parse_author, html).result()
+        return {
+            'author-born-date': born_date,
+            'author-born-location': born_location,
+            'author-description': description
+        }
+
+    def shutdown(self, wait=True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
@@ -0,0 +1,165 @@
+from bs4 import BeautifulSoup
+import lxml.etree
+import lxml.html
+
+class SoupParser:
+    """
+    Backend de referencia: construye el árbol completo de BeautifulSoup y lo recorre
+    con `find` / `find_all`.
+    """
+
+    name = 'soup'
+
+    def quote_elements(self, html):
+        """
+        Devuelve los bloques de frase (`div.quote`) de una página del listado.
+        """
+        return BeautifulSoup(html, 'lxml').find_all('div', attrs={'class': 'quote'})
+
+    def parse_quote(self, frase, base_url):
+        """
+        Extrae el texto, el autor, la URL del autor y los tags de un bloque de frase.
+        Lanza una excepción si al bloque le falta alguno de los elementos obligatorios.
+        """
+        return {
+            'frase_texto': frase.find('span', class_='text').get_text(),
+            'autor_nombre_completo': frase.find('small', class_='author').get_text(),
+            'autor_url': base_url + frase.find('a')['href'],
+            'tags': [tag.get_text() for tag in frase.find_all('a', class_='tag')]
+        }
+
+    def parse_author_page(self, html):
+        """
+        Convierte el HTML de la página de un autor en el diccionario de detalles.
+        """
+        autor_soup = BeautifulSoup(html, 'lxml')
+
+        born_date = autor_soup.find('span', class_='author-born-date')
+        born_location = autor_soup.find('span', class_='author-born-location')
+        description = autor_soup.find('div', class_='author-description')
+
+        return {
+            'author-born-date': born_date.get_text() if born_date else '',
+            'author-born-location': born_location.get_text() if born_location else '',
+            'author-description': description.get_text() if description else ''
+        }
+
+def xpath_has_class(name):
+    # Equivalente XPath de `class_=name` en BeautifulSoup (el atributo class es una lista de clases)
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+# Etiquetas cuyo texto BeautifulSoup no incluye en get_text() y etiquetas que conservan los espacios
+_SKIPPED_TEXT_TAGS = frozenset(['script', 'style', 'template'])
+_PRESERVE_WHITESPACE_TAGS = frozenset(['pre', 'textarea'])
+
+def _whitespace(text, preserve):
+    # BeautifulSoup reduce los textos formados solo por espacios a un '\n' o a un ' '
+    if preserve or text.strip(' \n\t\f\r'):
+        return text
+    return '\n' if '\n' in text else ' '
+
+def _collect_text(element, parts, preserve):
+    if element.tag in _SKIPPED_TEXT_TAGS:
+        return
+    preserve = preserve or element.tag in _PRESERVE_WHITESPACE_TAGS
+    if element.text:
+        parts.append(_whitespace(element.text, preserve))
+    for child in element:
+        # Los comentarios no aportan texto, pero sí el texto que los sigue
+        if isinstance(child.tag, str):
+            _collect_text(child, parts, preserve)
+        if child.tail:
+            parts.append(_whitespace(child.tail, preserve))
+
+def html_document(html):
+    """
+    Parsea una página con lxml.html; devuelve None si el documento está vacío
+    (igual que BeautifulSoup, que en ese caso no contiene ningún elemento).
+    """
+    try:
+        return lxml.html.document_fromstring(html)
+    except lxml.etree.ParserError:
+        return None
+
+def element_text(element):
+    """
+    Equivalente de `Tag.get_text()` de BeautifulSoup para un elemento de lxml.
+    """
+    parts = []
+    _collect_text(element, parts, False)
+    return ''.join(parts)
+
+class LxmlParser:
+    """
+    Backend rápido: parsea con `lxml.html` y usa expresiones XPath compiladas una sola vez,
+    sin crear los objetos intermedios de BeautifulSoup. Produce los mismos resultados que
+    SoupParser (ver tests/parsers_test.py).
+    """
+
+    name = 'lxml'
+
+    QUOTES = lxml.etree.XPath(f"//div[{xpath_has_class('quote')}]")
+    QUOTE_TEXT = lxml.etree.XPath(f"(.//span[{xpath_has_class('text')}])[1]")
+    QUOTE_AUTHOR = lxml.etree.XPath(f"(.//small[{xpath_has_class('author')}])[1]")
+    QUOTE_LINK = lxml.etree.XPath("(.//a)[1]")
+    QUOTE_TAGS = lxml.etree.XPath(f".//a[{xpath_has_class('tag')}]")
+    BORN_DATE = lxml.etree.XPath(f"(//span[{xpath_has_class('author-born-date')}])[1]")
+    BORN_LOCATION = lxml.etree.XPath(f"(//span[{xpath_has_class('author-born-location')}])[1]")
+    DESCRIPTION = lxml.etree.XPath(f"(//div[{xpath_has_class('author-description')}])[1]")
+
+    @staticmethod
+    def _first_text(xpath, element):
+        found = xpath(element)
+        return element_text(found[0]) if found else None
+
+    def quote_elements(self, html):
+        """
+        Devuelve los bloques de frase (`div.quote`) de una página del listado.
+        """
+        document = html_document(html)
+        return self.QUOTES(document) if document is not None else []
+
+    def parse_quote(self, frase, base_url):
+        """
+        Extrae el texto, el autor, la URL del autor y los tags de un bloque de frase.
+        Lanza una excepción si al bloque le falta alguno de los elementos obligatorios.
+        """
+        texto = self._first_text(self.QUOTE_TEXT, frase)
+        autor = self._first_text(self.QUOTE_AUTHOR, frase)
+        if texto is None or autor is None:
+            raise ValueError("Bloque de frase sin texto o sin autor")
+        href = self.QUOTE_LINK(frase)[0].attrib['href']
+
+        return {
+            'frase_texto': texto,
+            'autor_nombre_completo': autor,
+            'autor_url': base_url + href,
+            'tags': [element_text(tag) for tag in self.QUOTE_TAGS(frase)]
+        }
+
+    def parse_author_page(self, html):
+        """
+        Convierte el HTML de la página de un autor en el diccionario de detalles.
+        """
+        document = html_document(html)
+        if document is None:
+            return {'author-born-date': '', 'author-born-location': '', 'author-description': ''}
+
+        return {
+            'author-born-date': self._first_text(self.BORN_DATE, document) or '',
+            'author-born-location': self._first_text(self.BORN_LOCATION, document) or '',
+            'author-description': self._first_text(self.DESCRIPTION, document) or ''
+        }
+
+PARSERS = {parser.name: parser for parser in (LxmlParser, SoupParser)}
+
+def get_parser(parser):
+    """
+    Devuelve un backend de parseo a partir de su nombre (ver PARSERS) o lo deja
+    tal cual si ya es una instancia.
+    """
+    if not isinstance(parser, str):
+        return parser
+    if parser not in PARSERS:
+        raise ValueError(f"Parser desconocido: {parser}")
+    return PARSERS[parser]()
@@ -0,0 +1,124 @@
+import threading
+import time
+
+# Canal de NOTIFY con el que se pide una actualización inmediata (`NOTIFY actualizar_ahora`)
+REFRESH_CHANNEL = 'actualizar_ahora'
+
+# Intervalos de revisita por tipo de página, en segundos: (mínimo, máximo, inicial)
+RECRAWL_INTERVALS = {
+    'listing': (3600, 7 * 24 * 3600, 6 * 3600),
+    'tag': (3600, 7 * 24 * 3600, 12 * 3600),
+    'author': (24 * 3600, 90 * 24 * 3600, 7 * 24 * 3600),
+}
+
+class RecrawlSchedule:
+    """
+    Calendario de revisitas por URL: cada página se vuelve a pedir cuando le toca según lo que
+    ha cambiado hasta ahora, en lugar de pedirlas todas en cada ejecución.
+
+    `entries` es el diccionario `url -> (tipo, revisada_en, intervalo, revisiones, cambios)`, con
+    `revisada_en` en segundos desde epoch. Cada revisión con cambios divide el intervalo de la
+    página entre dos y cada revisión sin cambios lo duplica, dentro de los límites de su tipo
+    (RECRAWL_INTERVALS): una página que cambia a menudo converge al mínimo y una biografía que
+    no cambia nunca, al máximo. Una URL sin entrada siempre toca; con `force` tocan todas.
+    Las entradas nuevas o modificadas se acumulan en `updated` para guardarlas al terminar.
+    """
+
+    def __init__(self, entries=None, intervals=None, force=False, clock=time.time):
+        self.entries = dict(entries or {})
+        self.intervals = dict(RECRAWL_INTERVALS, **(intervals or {}))
+        self.force = force
+        self.clock = clock
+        self.updated = {}
+        self.stats = {'due': 0, 'skipped': 0}
+        self._types = {}
+        self._skipped = set()
+        self._lock = threading.Lock()
+
+    def next_check(self, url):
+        """
+        Momento (segundos desde epoch) en que vuelve a tocar `url`, o None si no tiene entrada.
+        """
+        entry = self.entries.get(url)
+        return entry[1] + entry[2] if entry is not None else None
+
+    def is_due(self, url, page_type='listing'):
+        """
+        Indica si toca volver a pedir `url`. El tipo de página se usa al anotar la revisión.
+        """
+        with self._lock:
+            self._types[url] = page_type
+            next_check = self.next_check(url)
+            due = self.force or next_check is None or self.clock() >= next_check
+            if due:
+                self.stats['due'] += 1
+            return due
+
+    def skip(self, url):
+        # La página no se pide en esta ejecución: su entrada no cambia
+        with self._lock:
+            self._skipped.add(url)
+            self.stats['skipped'] += 1
+
+    def observe(self, url, changed):
+        """
+        Anota una revisión de `url` y ajusta su intervalo según haya cambiado o no.
+        """
+        with self._lock:
+            if url in self._skipped:
+                return
+            entry = self.entries.get(url)
+            page_type = self._types.pop(url, None) or (entry[0] if entry is not None else 'listing')
+            minimum, maximum, initial = self.intervals.get(page_type, self.intervals['listing'])
+            if entry is None:
+                interval, checks, changes = initial, 0, 0
+            else:
+                _, _, interval, checks, changes = entry
+                interval = max(minimum, interval / 2) if changed else min(maximum, interval * 2)
+            entry = (page_type, self.clock(), interval, checks + 1, changes + bool(changed))
+            self.entries[url] = self.updated[url] = entry
+
+    def retry(self, url):
+        """
+        La página no se pudo procesar: vuelve a tocar en la siguiente ejecución.
+        """
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None:
+                return
+            page_type, _, interval, checks, changes = entry
+            entry = (page_type, self.clock() - interval, interval, checks, changes)
+            self.entries[url] = self.updated[url] = entry
+
+async def load_schedule(conn, intervals=None, force=False):
+    """
+    Carga el calendario guardado en la tabla `pagina_revisita`.
+    """
+    records = await conn.fetch("""
+    SELECT url, tipo, EXTRACT(EPOCH FROM revisada_en) AS revisada_en, intervalo, revisiones, cambios
+    FROM pagina_revisita
+    """)
+    return RecrawlSchedule({
+        r['url']: (r['tipo'], float(r['revisada_en']), r['intervalo'], r['revisiones'], r['cambios'])
+        for r in records
+    }, intervals=intervals, force=force)
+
+async def save_schedule(conn, schedule):
+    """
+    Guarda en `pagina_revisita` las entradas revisadas durante la ejecución.
+    """
+    if not schedule.updated:
+        return
+    urls = list(schedule.updated)
+    entries = [schedule.updated[url] for url in urls]
+    await conn.execute("""
+    INSERT INTO pagina_revisita (url, tipo, revisada_en, intervalo, revisiones, cambios)
+    SELECT url, tipo, to_timestamp(revisada_en), intervalo, revisiones, cambios
+    FROM unnest($1::text[], $2::text[], $3::float8[], $4::float8[], $5::int[], $6::int[])
+         AS r(url, tipo, revisada_en, intervalo, revisiones, cambios)
+    ON CONFLICT (url) DO UPDATE SET tipo = EXCLUDED.tipo,
+                                    revisada_en = EXCLUDED.revisada_en,
+                                    intervalo = EXCLUDED.intervalo,
+                                    revisiones = EXCLUDED.revisiones,
+                                    cambios = EXCLUDED.cambios
+    """, urls, *(list(column) for column in zip(*entries)))
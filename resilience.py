@@ -0,0 +1,271 @@
+import email.utils
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+
+from metrics import Metrics
+
+# Respuestas que indican un problema pasajero del servidor: se reintentan y cuentan como fallo del host
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+# Errores de red que se reintentan
+RETRY_ERRORS = (requests.exceptions.ConnectionError, requests.exceptions.Timeout)
+
+logger = logging.getLogger('scraper')
+
+def parse_retry_after(response, now=time.time):
+    """
+    Segundos indicados por la cabecera `Retry-After` (un número o una fecha HTTP), o None.
+    """
+    value = response.headers.get('Retry-After') if response is not None else None
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        date = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, date.timestamp() - now())
+
+class CircuitBreaker:
+    """
+    Interruptor de un host. Tras `failure_threshold` fallos seguidos (5xx, 429, timeouts) se abre
+    y durante `reset_timeout` segundos no se envía ninguna petición al host. Después deja pasar
+    una sola petición de prueba (semiabierto): si va bien se cierra y si falla se vuelve a abrir.
+    Un `Retry-After` del servidor abre el interruptor durante el tiempo indicado.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+        self.state = self.CLOSED
+        self.failures = 0
+        # Veces que se ha abierto
+        self.opened = 0
+        self._open_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def wait_time(self):
+        """
+        Segundos que hay que esperar antes de enviar una petición; 0 si se puede enviar ya.
+        """
+        with self._lock:
+            now = self.clock()
+            if self.state == self.OPEN:
+                if now < self._open_until:
+                    return self._open_until - now
+                self.state = self.HALF_OPEN
+                self._probing = False
+            if self.state == self.HALF_OPEN:
+                if self._probing:
+                    # Otra petición está probando el host: se vuelve a mirar en un momento
+                    return min(1.0, self.reset_timeout)
+                self._probing = True
+            return 0.0
+
+    def _open(self, seconds):
+        if self.state != self.OPEN:
+            self.opened += 1
+        self.state = self.OPEN
+        self._open_until = max(self._open_until, self.clock() + seconds)
+        self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.state = self.CLOSED
+            self._probing = False
+
+    def record_failure(self, retry_after=None):
+        """
+        Anota un fallo. Devuelve True si el interruptor pasó a estar abierto.
+        """
+        with self._lock:
+            was_open = self.state == self.OPEN
+            self.failures += 1
+            if retry_after:
+                self._open(retry_after)
+            elif self.state == self.HALF_OPEN or self.failures >= self.failure_threshold:
+                self._open(self.reset_timeout)
+            return self.state == self.OPEN and not was_open
+
+    def release(self):
+        # La petición terminó sin decir nada del host (p. ej. una URL inválida)
+        with self._lock:
+            self._probing = False
+
+class AdaptiveLimiter:
+    """
+    Número de peticiones simultáneas que se ajusta solo (AIMD, como el control de congestión de TCP).
+
+    Mientras las respuestas llegan bien y con una latencia sana el límite sube: una unidad por
+    respuesta hasta la primera señal de congestión (arranque lento) y después una unidad por cada
+    `limit` respuestas. Un error, un 429/5xx o una respuesta lenta (más de `latency_factor` veces
+    la menor latencia observada y al menos `latency_tolerance` segundos más) lo multiplican por
+    `decrease`, una sola vez por ventana: las peticiones que ya estaban en curso al reducir no
+    vuelven a reducirlo. El límite se mueve entre `minimum` y `maximum`.
+    """
+
+    def __init__(self, maximum, minimum=1, initial=None, decrease=0.5, latency_factor=3.0, latency_tolerance=0.1):
+        if not 1 <= minimum <= maximum:
+            raise ValueError("Se necesita 1 <= minimum <= maximum")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = float(initial if initial is not None else minimum)
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.latency_tolerance = latency_tolerance
+        self.min_latency = None
+        self.decreases = 0
+        self._slow_start = True
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    @property
+    def in_flight(self):
+        return self._in_flight
+
+    def acquire(self):
+        """
+        Espera un hueco para una petición. Devuelve la ventana en la que empezó, que se pasa a `release`.
+        """
+        with self._condition:
+            while self._in_flight >= int(self.limit):
+                self._condition.wait()
+            self._in_flight += 1
+            return self.decreases
+
+    def _is_slow(self, latency):
+        if self.min_latency is None or latency < self.min_latency:
+            self.min_latency = latency
+            return False
+        return latency > max(self.min_latency * self.latency_factor, self.min_latency + self.latency_tolerance)
+
+    def release(self, window, latency=None, congested=False):
+        """
+        Libera el hueco de una petición. `congested` indica un error o un 429/5xx; sin `latency`
+        (la petición no llegó a completarse) el límite no cambia.
+        """
+        with self._condition:
+            self._in_flight -= 1
+            if latency is not None or congested:
+                if congested or self._is_slow(latency):
+                    if window == self.decreases:
+                        self._slow_start = False
+                        self.limit = max(self.minimum, self.limit * self.decrease)
+                        self.decreases += 1
+                else:
+                    step = 1 if self._slow_start else 1 / self.limit
+                    self.limit = min(self.maximum, self.limit + step)
+            self._condition.notify_all()
+
+class ResilientTransport:
+    """
+    Envuelve un transporte (p. ej. HttpTransport) con reintentos, un CircuitBreaker por host y,
+    opcionalmente, un AdaptiveLimiter que decide cuántas peticiones van a la vez.
+
+    Los 429, 5xx, timeouts y errores de conexión se reintentan hasta `max_retries` veces, esperando
+    el tiempo de `Retry-After` o, sin él, un tiempo al azar entre 0 y `backoff * 2**intento`
+    (hasta `max_backoff`). Un `Retry-After` mayor que `max_retry_after` no se espera. Agotados los
+    reintentos se devuelve la última respuesta (o se relanza el último error), así que quien llama
+    (Scraper._get) la trata igual que sin reintentos. Con el interruptor abierto, las peticiones
+    al host esperan a que vuelva a admitir una prueba en lugar de enviarse.
+    """
+
+    def __init__(self, transport, max_retries=3, backoff=0.5, max_backoff=30, max_retry_after=120, limiter=None,
+                 failure_threshold=5, reset_timeout=30, metrics=None, sleep=time.sleep, clock=time.monotonic,
+                 random=random.random):
+        self.transport = transport
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_retry_after = max_retry_after
+        self.limiter = limiter
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        # Reintentos por host y motivo, y aperturas del interruptor (ver metrics.py)
+        self.metrics = metrics if metrics is not None else Metrics()
+        self.sleep = sleep
+        self.clock = clock
+        self.random = random
+        self._breakers = {}
+        self._breakers_lock = threading.Lock()
+
+    def breaker_for(self, host):
+        with self._breakers_lock:
+            breaker = self._breakers.get(host)
+            if breaker is None:
+                breaker = self._breakers[host] = CircuitBreaker(self.failure_threshold, self.reset_timeout,
+                                                                self.clock)
+        return breaker
+
+    def backoff_delay(self, attempt):
+        # "Full jitter": reparte los reintentos de muchos hilos en lugar de sincronizarlos
+        return self.random() * min(self.max_backoff, self.backoff * 2 ** attempt)
+
+    def _send(self, url, breaker, kwargs):
+        window = self.limiter.acquire() if self.limiter is not None else None
+        start = self.clock()
+        try:
+            response = self.transport.get(url, **kwargs)
+        except RETRY_ERRORS as e:
+            if self.limiter is not None:
+                self.limiter.release(window, congested=True)
+            return None, e, breaker.record_failure()
+        except Exception:
+            if self.limiter is not None:
+                self.limiter.release(window)
+            breaker.release()
+            raise
+
+        failed = response.status_code in RETRY_STATUSES
+        if self.limiter is not None:
+            self.limiter.release(window, self.clock() - start, congested=failed)
+        if not failed:
+            breaker.record_success()
+            return response, None, False
+        retry_after = parse_retry_after(response)
+        return response, None, breaker.record_failure(
+            min(retry_after, self.max_retry_after) if retry_after is not None else None)
+
+    def get(self, url, **kwargs):
+        host = urlsplit(url).netloc
+        breaker = self.breaker_for(host)
+        attempt = 0
+        while True:
+            wait = breaker.wait_time()
+            while wait > 0:
+                self.sleep(wait)
+                wait = breaker.wait_time()
+
+            response, error, opened = self._send(url, breaker, kwargs)
+            if opened:
+                self.metrics.inc('scraper_circuit_opened_total', host=host)
+                logger.warning("Demasiados fallos seguidos en %s: se pausan sus peticiones", host,
+                               extra={'host': host})
+            if error is None and response.status_code not in RETRY_STATUSES:
+                return response
+
+            retry_after = parse_retry_after(response)
+            if attempt >= self.max_retries or (retry_after is not None and retry_after > self.max_retry_after):
+                if error is not None:
+                    raise error
+                return response
+
+            reason = type(error).__name__ if error is not None else str(response.status_code)
+            self.metrics.inc('scraper_retries_total', host=host, reason=reason)
+            logger.debug("Reintento %d de %s (%s)", attempt + 1, url, reason)
+            self.sleep(retry_after if retry_after is not None else self.backoff_delay(attempt))
+            attempt += 1
+
+    def close(self):
+        self.transport.close()
@@ -0,0 +1,187 @@
+import hashlib
+import json
+import mmap
+import os
+import threading
+import time
+import zlib
+
+import requests
+
+# Cabeceras de la respuesta que se guardan con el cuerpo
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+class StoredResponse:
+    """
+    Respuesta leída del almacén, con la parte de la interfaz de `requests.Response` que usa el Scraper.
+    """
+
+    def __init__(self, url, status_code, content, encoding=None, headers=None):
+        self.url = url
+        self.status_code = status_code
+        self.content = content
+        self.encoding = encoding
+        self.headers = requests.structures.CaseInsensitiveDict(headers or {})
+
+    @property
+    def text(self):
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def raise_for_status(self):
+        if 400 <= self.status_code < 600:
+            raise requests.exceptions.HTTPError(f"{self.status_code} para la URL: {self.url}", response=self)
+
+class ResponseStore:
+    """
+    Almacén en disco de las respuestas HTTP en bruto, para volver a parsear un recorrido sin red.
+
+    Los cuerpos se guardan comprimidos con zlib en `bodies.bin`, una sola vez por contenido
+    (direccionados por su SHA-256), y `index.jsonl` asocia cada URL con el hash de su última
+    respuesta, su posición en `bodies.bin`, el código de estado y las cabeceras. Los dos archivos
+    solo crecen por el final; las lecturas usan un mapa en memoria (mmap) de `bodies.bin`.
+    """
+
+    BODIES_FILE = 'bodies.bin'
+    INDEX_FILE = 'index.jsonl'
+
+    def __init__(self, path):
+        self.path = path
+        os.makedirs(path, exist_ok=True)
+        self._entries = {}
+        self._blobs = {}
+        self._lock = threading.Lock()
+        self._map = None
+        self._load_index()
+        self._bodies = open(os.path.join(path, self.BODIES_FILE), 'ab')
+        self._index = open(os.path.join(path, self.INDEX_FILE), 'a', encoding='utf-8')
+        self._bodies_size = self._bodies.tell()
+
+    def _load_index(self):
+        index_path = os.path.join(self.path, self.INDEX_FILE)
+        if not os.path.exists(index_path):
+            return
+        with open(index_path, 'r+b') as f:
+            data = f.read()
+            complete = data.rfind(b'\n') + 1
+            if complete < len(data):
+                # Última línea a medio escribir si el proceso terminó durante una escritura: se corta
+                # para que el siguiente registro no se pegue a ella
+                f.truncate(complete)
+        for line in data[:complete].decode('utf-8', errors='replace').splitlines():
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue
+            self._entries[entry['url']] = entry
+            self._blobs[entry['hash']] = (entry['offset'], entry['length'])
+
+    def __contains__(self, url):
+        return url in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def urls(self):
+        return list(self._entries)
+
+    def put(self, url, status_code, content, encoding=None, headers=None):
+        """
+        Guarda una respuesta. Un cuerpo ya almacenado (mismo hash) no se vuelve a escribir.
+        """
+        content_hash = hashlib.sha256(content).hexdigest()
+        compressed = None if content_hash in self._blobs else zlib.compress(content)
+        with self._lock:
+            blob = self._blobs.get(content_hash)
+            if blob is None:
+                blob = (self._bodies_size, len(compressed))
+                self._bodies.write(compressed)
+                self._bodies.flush()
+                self._bodies_size += len(compressed)
+                self._blobs[content_hash] = blob
+            entry = {
+                'url': url,
+                'hash': content_hash,
+                'offset': blob[0],
+                'length': blob[1],
+                'status': status_code,
+                'encoding': encoding,
+                'headers': {name: headers[name] for name in STORED_HEADERS if headers and name in headers},
+                'fetched_at': time.time(),
+            }
+            self._index.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            self._index.flush()
+            self._entries[url] = entry
+
+    def put_response(self, url, response):
+        """
+        Guarda una `requests.Response` bajo la URL pedida (no la final, si hubo redirecciones).
+        """
+        encoding = response.encoding if response.encoding is not None else response.apparent_encoding
+        self.put(url, response.status_code, response.content, encoding, response.headers)
+
+    def _read(self, offset, length):
+        with self._lock:
+            if self._map is None or offset + length > len(self._map):
+                # El archivo creció desde el último mapa (o aún no había ninguno)
+                if self._map is not None:
+                    self._map.close()
+                with open(os.path.join(self.path, self.BODIES_FILE), 'rb') as f:
+                    self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            return zlib.decompress(self._map[offset:offset + length])
+
+    def get(self, url):
+        """
+        Devuelve la última respuesta guardada para `url` como StoredResponse, o None.
+        """
+        entry = self._entries.get(url)
+        if entry is None:
+            return None
+        content = self._read(entry['offset'], entry['length'])
+        return StoredResponse(url, entry['status'], content, entry['encoding'], entry['headers'])
+
+    def close(self):
+        with self._lock:
+            if self._map is not None:
+                self._map.close()
+                self._map = None
+            self._bodies.close()
+            self._index.close()
+
+class RecordingTransport:
+    """
+    Envuelve un transporte (p. ej. HttpTransport) y guarda en `store` cada respuesta recibida.
+    """
+
+    def __init__(self, transport, store):
+        self.transport = transport
+        self.store = store
+
+    def get(self, url, **kwargs):
+        response = self.transport.get(url, **kwargs)
+        # Un 304 no trae cuerpo: se conserva la última respuesta completa
+        if response.status_code != 304:
+            self.store.put_response(url, response)
+        return response
+
+    def close(self):
+        self.transport.close()
+
+class ReplayTransport:
+    """
+    Transporte sin red: sirve las respuestas desde un ResponseStore. Una URL que no está en
+    el almacén se responde con un 404 y se anota en `misses`.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self.misses = []
+
+    def get(self, url, **kwargs):
+        response = self.store.get(url)
+        if response is None:
+            self.misses.append(url)
+            return StoredResponse(url, 404, b'')
+        return response
+
+    def close(self):
+        pass
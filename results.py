@@ -0,0 +1,135 @@
+import sys
+from array import array
+
+import numpy as np
+import pandas as pd
+
+AUTHOR_COLUMNS = ('autor_nombre', 'autor_apellido', 'autor_url', 'autor_fecha_nac', 'autor_lugar_nac',
+                  'autor_descripcion')
+
+def _int32(values):
+    return np.frombuffer(values, dtype=np.int32).copy() if len(values) else np.empty(0, dtype=np.int32)
+
+class ScrapeResult:
+    """
+    Resultado normalizado de un recorrido, en cuatro tablas:
+
+    - `authors`: un autor por fila (`autor_id` local, nombre, apellido, URL, nacimiento y descripción).
+    - `quotes`: `frase_texto`, `autor_id` y `fuente` (categórica).
+    - `tags`: `tag_id` y `tag_texto`.
+    - `quote_tags`: pares `(quote_idx, tag_id)`, donde `quote_idx` es la fila de la frase en `quotes`.
+
+    Se construye por lotes con `add_rows` a medida que llegan las páginas del scraper. Cada autor
+    se guarda una sola vez y las columnas de IDs son arrays de int32, así que la memoria crece con
+    los autores distintos y no con frases × longitud de la biografía, como en el DataFrame plano.
+    """
+
+    def __init__(self):
+        self._author_ids = {}
+        self._authors = {column: [] for column in AUTHOR_COLUMNS}
+        self._quote_texts = []
+        self._quote_authors = array('i')
+        self._source_codes = {}
+        self._quote_sources = array('i')
+        self._quote_tag_quotes = array('i')
+        self._quote_tag_ids = array('i')
+        self._tags = {}
+
+    def __len__(self):
+        return len(self._quote_texts)
+
+    def _author_id(self, row):
+        key = (row['autor_nombre'], row['autor_apellido'])
+        autor_id = self._author_ids.get(key)
+        description = row['autor_descripcion']
+        values = (sys.intern(row['autor_nombre']), sys.intern(row['autor_apellido']), row['autor_url'],
+                  row['autor_fecha_nac'], row['autor_lugar_nac'],
+                  description.strip() if isinstance(description, str) else description)
+        if autor_id is None:
+            autor_id = self._author_ids[key] = len(self._author_ids)
+            for column, value in zip(AUTHOR_COLUMNS, values):
+                self._authors[column].append(value)
+        else:
+            # Los datos más recientes del autor sustituyen a los anteriores, salvo los que faltan
+            # (una fila cuyo autor no se pudo descargar)
+            for column, value in zip(AUTHOR_COLUMNS, values):
+                if value is not None:
+                    self._authors[column][autor_id] = value
+        return autor_id
+
+    def add_rows(self, rows):
+        """
+        Añade las filas de una página del scraper (ver Scraper._build_row).
+        """
+        for row in rows:
+            quote_idx = len(self._quote_texts)
+            self._quote_texts.append(row['frase_texto'])
+            self._quote_authors.append(self._author_id(row))
+            fuente = row.get('fuente')
+            self._quote_sources.append(self._source_codes.setdefault(fuente, len(self._source_codes))
+                                       if isinstance(fuente, str) else -1)
+            for tag, tag_id in zip(row['Tags'], row['Tags_IDs']):
+                self._tags[tag] = int(tag_id)
+                self._quote_tag_quotes.append(quote_idx)
+                self._quote_tag_ids.append(int(tag_id))
+
+    def add_tags(self, tags_dict):
+        """
+        Añade tags que no aparecen en las frases (p. ej. todos los del TagRegistry del scraper).
+        """
+        self._tags.update(tags_dict)
+
+    @property
+    def authors(self):
+        authors = pd.DataFrame(self._authors, columns=list(AUTHOR_COLUMNS))
+        authors.insert(0, 'autor_id', np.arange(len(authors), dtype=np.int32))
+        return authors
+
+    @property
+    def quotes(self):
+        sources = pd.Categorical.from_codes(_int32(self._quote_sources), categories=list(self._source_codes))
+        return pd.DataFrame({
+            'frase_texto': self._quote_texts,
+            'autor_id': _int32(self._quote_authors),
+            'fuente': sources,
+        })
+
+    @property
+    def tags(self):
+        tags = pd.DataFrame({'tag_texto': list(self._tags),
+                             'tag_id': np.array(list(self._tags.values()), dtype=np.int32)})
+        return tags.sort_values('tag_id', ignore_index=True)
+
+    @property
+    def quote_tags(self):
+        return pd.DataFrame({'quote_idx': _int32(self._quote_tag_quotes), 'tag_id': _int32(self._quote_tag_ids)})
+
+    def tag_ids(self):
+        """
+        IDs de los tags de cada frase, como lista de arrays int32 (en el orden de `quotes`).
+        """
+        ids = _int32(self._quote_tag_ids)
+        bounds = np.searchsorted(_int32(self._quote_tag_quotes), np.arange(len(self) + 1))
+        return [ids[start:end] for start, end in zip(bounds[:-1], bounds[1:])]
+
+    def memory_usage(self):
+        """
+        Bytes que ocupan las cuatro tablas (contando el contenido de las cadenas).
+        """
+        return int(sum(frame.memory_usage(deep=True).sum()
+                       for frame in (self.authors, self.quotes, self.tags, self.quote_tags)))
+
+    def to_frames(self):
+        """
+        Devuelve los `(frases_df, tags_df)` planos de Scraper.scrape_quotes, con el autor repetido
+        en cada frase.
+        """
+        quotes = self.quotes
+        frases_df = self.authors.iloc[quotes['autor_id']].drop(columns='autor_id').reset_index(drop=True)
+        frases_df.insert(0, 'frase_texto', quotes['frase_texto'])
+        names = {tag_id: tag for tag, tag_id in self._tags.items()}
+        tag_ids = self.tag_ids()
+        frases_df['Tags'] = [[names[tag_id] for tag_id in ids.tolist()] for ids in tag_ids]
+        frases_df['Tags_IDs'] = [ids.tolist() for ids in tag_ids]
+        frases_df['fuente'] = quotes['fuente'].astype(object).where(quotes['fuente'].notna(), None)
+        return frases_df, self.tags[['tag_texto', 'tag_id']]
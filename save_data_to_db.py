@@ -2,17 +2,50 @@ import asyncio
 import asyncpg
 import pandas as pd
 from scraper import Scraper
+from metrics import Metrics
+from results import AUTHOR_COLUMNS
 import db  # Importamos la configuración de la base de datos
 
+# Columnas que se copian a la tabla temporal de frases en el modo 'copy'
+STAGING_FRASE_COLUMNS = ['frase_texto', 'autor_nombre', 'autor_apellido', 'autor_url',
+                         'autor_fecha_nac', 'autor_lugar_nac', 'autor_descripcion', 'fuente', 'tags_ids']
+
 class AsyncDataSaver:
-    def __init__(self, db_name, db_user, db_password, db_host, db_port):
+    """
+    Guarda en PostgreSQL las frases, autores y tags obtenidos por el scraper.
+
+    Modos de carga (`mode`):
+    - 'rows': una sentencia por tag, autor, frase y relación frase-tag.
+    - 'batch': una sentencia por tabla con arrays (`unnest`); los IDs de autores y frases
+      se resuelven en memoria a partir de `RETURNING`, sin una consulta por frase.
+    - 'copy': copia los lotes a tablas temporales con COPY y los fusiona con unas pocas
+      sentencias `INSERT ... SELECT ... ON CONFLICT`.
+    """
+
+    MODES = ('batch', 'copy', 'rows')
+
+    def __init__(self, db_name, db_user, db_password, db_host, db_port, mode='batch', pool=None, metrics=None):
+        if mode not in self.MODES:
+            raise ValueError(f"Modo de carga desconocido: {mode}")
         self.db_name = db_name
         self.db_user = db_user
         self.db_password = db_password
         self.db_host = db_host
         self.db_port = db_port
+        self.mode = mode
+        # Con un pool (ver db.create_pool) se usa una conexión prestada en lugar de abrir una nueva
+        self.pool = pool
+        # Filas insertadas / actualizadas / sin cambios por tabla (modo 'batch')
+        self.stats = {}
+        # Lotes que fallaron; el actualizador no guarda huellas si hubo errores
+        self.errors = 0
+        # Filas por tabla, duración de las transacciones y lotes fallidos (ver metrics.py)
+        self.metrics = metrics if metrics is not None else Metrics()
 
     async def connect(self):
+        if self.pool is not None:
+            self.conn = await self.pool.acquire()
+            return
         self.conn = await asyncpg.connect(
             database=self.db_name,
             user=self.db_user,
@@ -22,85 +55,452 @@ class AsyncDataSaver:
         )
 
     async def close(self):
+        if self.pool is not None:
+            await self.pool.release(self.conn)
+            return
         await self.conn.close()
 
     async def save_to_database(self, frases_df, tags_df):
         await self.connect()
 
-        async with self.conn.transaction():
-            try:
-                # Insertar datos en la tabla de etiquetas (tags)
-                for _, row in tags_df.iterrows():
-                    try:
-                        await self.conn.execute("""
-                        INSERT INTO tag (tag_id, tag_texto)
-                        VALUES ($1, $2)
-                        ON CONFLICT (tag_id) DO UPDATE SET tag_texto = EXCLUDED.tag_texto
-                        """, row.get('tag_id'), row.get('tag_texto'))
-                    except Exception as e:
-                        print(f"Error al insertar en tag: {e}")
+        try:
+            await self._save_transaction(frases_df, tags_df)
+        finally:
+            await self.close()
+
+    async def save_result(self, result):
+        """
+        Guarda un ScrapeResult (ver results.py) en una transacción. En el modo 'batch' cada tabla
+        se carga una sola vez a partir de su tabla normalizada, sin repetir los datos del autor en
+        cada frase; los demás modos usan la forma plana (`result.to_frames()`).
+        """
+        await self.connect()
+
+        try:
+            if self.mode == 'batch':
+                await self._transaction(len(result), self._batch_result, result)
+            else:
+                await self._save_transaction(*result.to_frames())
+        finally:
+            await self.close()
+
+    async def save_stream(self, batches):
+        """
+        Guarda las filas a medida que llegan del scraper (`iter_quotes` o `aiter_quotes`),
+        en una transacción por lote, de modo que la descarga y la carga se solapan.
+        Devuelve el número de frases procesadas.
+        """
+        await self.connect()
+        total = 0
+
+        try:
+            if hasattr(batches, '__aiter__'):
+                async for rows in batches:
+                    total += await self._save_batch(rows)
+            else:
+                for rows in batches:
+                    total += await self._save_batch(rows)
+        finally:
+            await self.close()
+
+        return total
+
+    async def save_author_details(self, details_by_url):
+        """
+        Actualiza los autores ya guardados a partir de `autor_url -> detalles` (ver
+        Scraper.author_updates), en una sola sentencia. Devuelve el número de autores actualizados.
+        """
+        if not details_by_url:
+            return 0
+        urls = list(details_by_url)
+        columns = [[details_by_url[url].get(key) for url in urls]
+                   for key in ('author-born-date', 'author-born-location', 'author-description')]
+        await self.connect()
+
+        try:
+            records = await self.conn.fetch("""
+            UPDATE autor
+            SET autor_fecha_nac = COALESCE(a.fecha_nac, autor.autor_fecha_nac),
+                autor_lugar_nac = COALESCE(a.lugar_nac, autor.autor_lugar_nac),
+                autor_descripcion = COALESCE(TRIM(a.descripcion), autor.autor_descripcion)
+            FROM unnest($1::text[], $2::text[], $3::text[], $4::text[]) AS a(url, fecha_nac, lugar_nac, descripcion)
+            WHERE autor.autor_url = a.url
+              AND (autor.autor_fecha_nac, autor.autor_lugar_nac, autor.autor_descripcion)
+                  IS DISTINCT FROM
+                  (COALESCE(a.fecha_nac, autor.autor_fecha_nac), COALESCE(a.lugar_nac, autor.autor_lugar_nac),
+                   COALESCE(TRIM(a.descripcion), autor.autor_descripcion))
+            RETURNING autor.autor_id
+            """, urls, *columns)
+        except asyncpg.PostgresError as e:
+            self.errors += 1
+            print(f"Error de PostgreSQL: {e}")
+            return 0
+        finally:
+            await self.close()
+
+        if records:
+            self.metrics.inc('saver_rows_total', len(records), table='autor', result='updated')
+        return len(records)
+
+    async def _save_batch(self, rows):
+        if not rows:
+            return 0
+        frases_df, tags_df = self.batch_to_frames(rows)
+        await self._save_transaction(frases_df, tags_df)
+        return len(frases_df)
+
+    async def _save_transaction(self, frases_df, tags_df):
+        await self._transaction(len(frases_df), self._save_frames, frases_df, tags_df)
+
+    async def _transaction(self, quotes, save, *args):
+        errors = self.errors
+        self.metrics.inc('saver_quotes_total', quotes, mode=self.mode)
+        with self.metrics.timer('saver_transaction_seconds', mode=self.mode):
+            async with self.conn.transaction():
+                await save(*args)
+        if self.errors > errors:
+            self.metrics.inc('saver_batch_errors_total', mode=self.mode)
+
+    @staticmethod
+    def batch_to_frames(rows):
+        """
+        Convierte un lote de filas del scraper en los DataFrames de frases y tags del lote.
+        """
+        frases_df = pd.DataFrame(rows)
+        tags = {}
+        for tag_texts, tag_ids in zip(frases_df['Tags'], frases_df['Tags_IDs']):
+            tags.update(zip(tag_texts, tag_ids))
+        tags_df = pd.DataFrame(list(tags.items()), columns=['tag_texto', 'tag_id'])
+        return frases_df, tags_df
+
+    async def _save_frames(self, frases_df, tags_df):
+        if self.mode == 'batch':
+            await self._batch_frames(frases_df, tags_df)
+        elif self.mode == 'copy':
+            await self._copy_frames(frases_df, tags_df)
+        else:
+            await self._insert_rows(frases_df, tags_df)
 
-                # Insertar datos en la tabla de autores
-                for _, row in frases_df.iterrows():
+    @staticmethod
+    def sources(frases_df):
+        """
+        Fuente (dominio del sitio) de cada frase; None si las filas no la indican.
+        """
+        if 'fuente' not in frases_df:
+            return [None] * len(frases_df)
+        return [fuente if isinstance(fuente, str) else None for fuente in frases_df['fuente']]
+
+    def _count(self, table, inserted=0, updated=0, unchanged=0):
+        counts = self.stats.setdefault(table, {'inserted': 0, 'updated': 0, 'unchanged': 0})
+        counts['inserted'] += inserted
+        counts['updated'] += updated
+        counts['unchanged'] += unchanged
+        for result, value in (('inserted', inserted), ('updated', updated), ('unchanged', unchanged)):
+            if value:
+                self.metrics.inc('saver_rows_total', value, table=table, result=result)
+
+    def _count_records(self, table, records):
+        # `written` es False para las filas existentes que no cambiaron
+        inserted = sum(1 for r in records if r['written'] and r['inserted'])
+        updated = sum(1 for r in records if r['written'] and not r['inserted'])
+        self._count(table, inserted, updated, len(records) - inserted - updated)
+
+    async def upsert_authors(self, frases_df):
+        """
+        Inserta o actualiza los autores del lote con una sola sentencia y devuelve
+        el diccionario `(autor_nombre, autor_apellido) -> autor_id`. Los autores sin
+        cambios no se reescriben, pero también aparecen en el diccionario.
+        """
+        autores_df = frases_df.drop_duplicates(['autor_nombre', 'autor_apellido'], keep='last')
+        return await self._upsert_author_columns([list(autores_df[column]) for column in AUTHOR_COLUMNS])
+
+    async def _upsert_author_columns(self, columns):
+        # `columns`: listas paralelas de AUTHOR_COLUMNS, un autor distinto por posición
+        records = await self.conn.fetch("""
+        WITH entrada AS (
+            SELECT nombre, apellido, url, fecha_nac, lugar_nac, TRIM(descripcion) AS descripcion
+            FROM unnest($1::text[], $2::text[], $3::text[], $4::text[], $5::text[], $6::text[])
+                 AS a(nombre, apellido, url, fecha_nac, lugar_nac, descripcion)
+        ), escritos AS (
+            INSERT INTO autor (autor_nombre, autor_apellido, autor_url, autor_fecha_nac, autor_lugar_nac, autor_descripcion)
+            SELECT * FROM entrada
+            ON CONFLICT (autor_nombre, autor_apellido)
+            DO UPDATE SET autor_url = EXCLUDED.autor_url,
+                          autor_fecha_nac = COALESCE(EXCLUDED.autor_fecha_nac, autor.autor_fecha_nac),
+                          autor_lugar_nac = COALESCE(EXCLUDED.autor_lugar_nac, autor.autor_lugar_nac),
+                          autor_descripcion = COALESCE(EXCLUDED.autor_descripcion, autor.autor_descripcion)
+            WHERE (autor.autor_url, autor.autor_fecha_nac, autor.autor_lugar_nac, autor.autor_descripcion)
+                  IS DISTINCT FROM
+                  (EXCLUDED.autor_url, COALESCE(EXCLUDED.autor_fecha_nac, autor.autor_fecha_nac),
+                   COALESCE(EXCLUDED.autor_lugar_nac, autor.autor_lugar_nac),
+                   COALESCE(EXCLUDED.autor_descripcion, autor.autor_descripcion))
+            RETURNING autor_id, autor_nombre, autor_apellido, (xmax = 0) AS inserted
+        )
+        SELECT autor_id, autor_nombre, autor_apellido, inserted, TRUE AS written FROM escritos
+        UNION ALL
+        SELECT a.autor_id, a.autor_nombre, a.autor_apellido, FALSE, FALSE
+        FROM autor a
+        JOIN entrada e ON a.autor_nombre = e.nombre AND a.autor_apellido = e.apellido
+        WHERE NOT EXISTS (SELECT 1 FROM escritos w WHERE w.autor_id = a.autor_id)
+        """, *columns)
+        self._count_records('autor', records)
+        return {(r['autor_nombre'], r['autor_apellido']): r['autor_id'] for r in records}
+
+    async def _batch_frames(self, frases_df, tags_df):
+        """
+        Carga por lotes: cuatro sentencias en total, sea cual sea el número de filas.
+        Solo se reescriben las filas nuevas o modificadas; los contadores quedan en `self.stats`.
+        """
+        autores_df = frases_df.drop_duplicates(['autor_nombre', 'autor_apellido'], keep='last')
+        # Una frase repetida en el lote solo puede actualizarse una vez por sentencia
+        unique_frases_df = frases_df.drop_duplicates('frase_texto', keep='last')
+        await self._batch_load(
+            tags=([int(tag_id) for tag_id in tags_df['tag_id']], list(tags_df['tag_texto'])),
+            authors=[list(autores_df[column]) for column in AUTHOR_COLUMNS],
+            quotes=(list(unique_frases_df['frase_texto']),
+                    list(zip(unique_frases_df['autor_nombre'], unique_frases_df['autor_apellido'])),
+                    self.sources(unique_frases_df)),
+            quote_tags=[(frase_texto, int(tag_id))
+                        for frase_texto, tags_ids in zip(frases_df['frase_texto'], frases_df['Tags_IDs'])
+                        for tag_id in tags_ids]
+        )
+
+    async def _batch_result(self, result):
+        """
+        Modo 'batch' para un ScrapeResult: las tablas ya están normalizadas, así que cada autor
+        viaja una sola vez y no hace falta deduplicar frase a frase.
+        """
+        authors = result.authors
+        names = list(zip(authors['autor_nombre'], authors['autor_apellido']))
+        quotes = result.quotes
+        unique_quotes = quotes.drop_duplicates('frase_texto', keep='last')
+        textos = quotes['frase_texto'].tolist()
+        quote_tags = result.quote_tags
+        tags = result.tags
+        await self._batch_load(
+            tags=(tags['tag_id'].tolist(), tags['tag_texto'].tolist()),
+            authors=[authors[column].tolist() for column in AUTHOR_COLUMNS],
+            quotes=(unique_quotes['frase_texto'].tolist(),
+                    [names[autor_id] for autor_id in unique_quotes['autor_id'].tolist()],
+                    self.sources(unique_quotes.assign(fuente=unique_quotes['fuente'].astype(object)))),
+            quote_tags=[(textos[quote_idx], tag_id) for quote_idx, tag_id
+                        in zip(quote_tags['quote_idx'].tolist(), quote_tags['tag_id'].tolist())]
+        )
+
+    async def _batch_load(self, tags, authors, quotes, quote_tags):
+        """
+        Las cuatro sentencias del modo 'batch'. `tags`: `(ids, textos)`; `authors`: columnas de
+        AUTHOR_COLUMNS sin autores repetidos; `quotes`: `(textos, (nombre, apellido) del autor, fuentes)`
+        sin frases repetidas; `quote_tags`: pares `(frase_texto, tag_id)`.
+        """
+        tag_ids, tag_texts = tags
+        frase_texts, frase_authors, frase_sources = quotes
+        try:
+            tag_status = await self.conn.fetch("""
+            INSERT INTO tag (tag_id, tag_texto)
+            SELECT * FROM unnest($1::int[], $2::text[])
+            ON CONFLICT (tag_id) DO UPDATE SET tag_texto = EXCLUDED.tag_texto
+            WHERE tag.tag_texto IS DISTINCT FROM EXCLUDED.tag_texto
+            RETURNING (xmax = 0) AS inserted
+            """, tag_ids, tag_texts)
+            tags_inserted = sum(1 for r in tag_status if r['inserted'])
+            self._count('tag', tags_inserted, len(tag_status) - tags_inserted, len(tag_ids) - len(tag_status))
+
+            autor_ids = await self._upsert_author_columns(authors)
+
+            records = await self.conn.fetch("""
+            WITH entrada AS (
+                SELECT * FROM unnest($1::text[], $2::int[], $3::text[]) AS f(frase_texto, autor_id, fuente)
+            ), escritos AS (
+                INSERT INTO frase (frase_texto, autor_id, fuente)
+                SELECT * FROM entrada
+                ON CONFLICT (frase_texto) DO UPDATE SET autor_id = EXCLUDED.autor_id,
+                                                        fuente = COALESCE(frase.fuente, EXCLUDED.fuente)
+                WHERE frase.autor_id IS DISTINCT FROM EXCLUDED.autor_id
+                   OR (frase.fuente IS NULL AND EXCLUDED.fuente IS NOT NULL)
+                RETURNING frase_id, frase_texto, (xmax = 0) AS inserted
+            )
+            SELECT frase_id, frase_texto, inserted, TRUE AS written FROM escritos
+            UNION ALL
+            SELECT f.frase_id, f.frase_texto, FALSE, FALSE
+            FROM frase f
+            JOIN entrada e ON f.frase_texto = e.frase_texto
+            WHERE NOT EXISTS (SELECT 1 FROM escritos w WHERE w.frase_id = f.frase_id)
+            """, frase_texts, [autor_ids.get(autor) for autor in frase_authors], frase_sources)
+            self._count_records('frase', records)
+            frase_ids = {r['frase_texto']: r['frase_id'] for r in records}
+
+            # Todas las relaciones frase-tag del lote en una sola sentencia
+            pairs = {(frase_ids[frase_texto], tag_id) for frase_texto, tag_id in quote_tags}
+            links = await self.conn.fetch("""
+            INSERT INTO frase_tag (frase_id, tag_id)
+            SELECT * FROM unnest($1::int[], $2::int[])
+            ON CONFLICT (frase_id, tag_id) DO NOTHING
+            RETURNING frase_id
+            """, [frase_id for frase_id, _ in pairs], [tag_id for _, tag_id in pairs])
+            self._count('frase_tag', inserted=len(links), unchanged=len(pairs) - len(links))
+        except asyncpg.PostgresError as e:
+            self.errors += 1
+            print(f"Error de PostgreSQL: {e}")
+        except Exception as e:
+            self.errors += 1
+            print(f"Error inesperado: {e}")
+
+    async def _copy_frames(self, frases_df, tags_df):
+        """
+        Carga masiva: COPY a tablas temporales y fusión con sentencias basadas en conjuntos.
+        Debe ejecutarse dentro de una transacción (las tablas temporales se eliminan al confirmar).
+        """
+        try:
+            await self.conn.execute("""
+            CREATE TEMP TABLE stg_tag (tag_id INTEGER, tag_texto TEXT) ON COMMIT DROP;
+            CREATE TEMP TABLE stg_frase (
+                frase_texto TEXT,
+                autor_nombre TEXT,
+                autor_apellido TEXT,
+                autor_url TEXT,
+                autor_fecha_nac TEXT,
+                autor_lugar_nac TEXT,
+                autor_descripcion TEXT,
+                fuente TEXT,
+                tags_ids INTEGER[]
+            ) ON COMMIT DROP;
+            """)
+
+            await self.conn.copy_records_to_table(
+                'stg_tag',
+                records=[(int(tag_id), tag_texto) for tag_texto, tag_id in zip(tags_df['tag_texto'], tags_df['tag_id'])],
+                columns=['tag_id', 'tag_texto']
+            )
+            await self.conn.copy_records_to_table(
+                'stg_frase',
+                records=[
+                    (row.frase_texto, row.autor_nombre, row.autor_apellido, row.autor_url,
+                     row.autor_fecha_nac, row.autor_lugar_nac, row.autor_descripcion, fuente,
+                     [int(tag_id) for tag_id in row.Tags_IDs])
+                    for row, fuente in zip(frases_df.itertuples(index=False), self.sources(frases_df))
+                ],
+                columns=STAGING_FRASE_COLUMNS
+            )
+
+            # DISTINCT ON: un mismo lote no puede actualizar dos veces la misma fila con ON CONFLICT
+            await self.conn.execute("""
+            INSERT INTO tag (tag_id, tag_texto)
+            SELECT DISTINCT ON (tag_id) tag_id, tag_texto FROM stg_tag ORDER BY tag_id
+            ON CONFLICT (tag_id) DO UPDATE SET tag_texto = EXCLUDED.tag_texto
+            """)
+            await self.conn.execute("""
+            INSERT INTO autor (autor_nombre, autor_apellido, autor_url, autor_fecha_nac, autor_lugar_nac, autor_descripcion)
+            SELECT DISTINCT ON (autor_nombre, autor_apellido)
+                   autor_nombre, autor_apellido, autor_url, autor_fecha_nac, autor_lugar_nac, TRIM(autor_descripcion)
+            FROM stg_frase
+            ORDER BY autor_nombre, autor_apellido
+            ON CONFLICT (autor_nombre, autor_apellido)
+            DO UPDATE SET autor_url = EXCLUDED.autor_url,
+                          autor_fecha_nac = COALESCE(EXCLUDED.autor_fecha_nac, autor.autor_fecha_nac),
+                          autor_lugar_nac = COALESCE(EXCLUDED.autor_lugar_nac, autor.autor_lugar_nac),
+                          autor_descripcion = COALESCE(EXCLUDED.autor_descripcion, autor.autor_descripcion)
+            """)
+            await self.conn.execute("""
+            INSERT INTO frase (frase_texto, autor_id, fuente)
+            SELECT DISTINCT ON (s.frase_texto) s.frase_texto, a.autor_id, s.fuente
+            FROM stg_frase s
+            JOIN autor a ON a.autor_nombre = s.autor_nombre AND a.autor_apellido = s.autor_apellido
+            ORDER BY s.frase_texto
+            ON CONFLICT (frase_texto) DO UPDATE SET autor_id = EXCLUDED.autor_id,
+                                                    fuente = COALESCE(frase.fuente, EXCLUDED.fuente)
+            """)
+            await self.conn.execute("""
+            INSERT INTO frase_tag (frase_id, tag_id)
+            SELECT DISTINCT f.frase_id, t.tag_id
+            FROM stg_frase s
+            JOIN frase f ON f.frase_texto = s.frase_texto
+            CROSS JOIN LATERAL unnest(s.tags_ids) AS t(tag_id)
+            ON CONFLICT (frase_id, tag_id) DO NOTHING
+            """)
+        except asyncpg.PostgresError as e:
+            self.errors += 1
+            print(f"Error de PostgreSQL: {e}")
+        except Exception as e:
+            self.errors += 1
+            print(f"Error inesperado: {e}")
+
+    async def _insert_rows(self, frases_df, tags_df):
+        try:
+            # Insertar datos en la tabla de etiquetas (tags)
+            for _, row in tags_df.iterrows():
+                try:
+                    await self.conn.execute("""
+                    INSERT INTO tag (tag_id, tag_texto)
+                    VALUES ($1, $2)
+                    ON CONFLICT (tag_id) DO UPDATE SET tag_texto = EXCLUDED.tag_texto
+                    """, row.get('tag_id'), row.get('tag_texto'))
+                except Exception as e:
+                    print(f"Error al insertar en tag: {e}")
+
+            # Insertar datos en la tabla de autores
+            for _, row in frases_df.iterrows():
+                try:
+                    await self.conn.execute("""
+                    INSERT INTO autor (autor_nombre, autor_apellido, autor_url, autor_fecha_nac, autor_lugar_nac, autor_descripcion)
+                    VALUES ($1, $2, $3, $4, $5, TRIM($6))
+                    ON CONFLICT (autor_nombre, autor_apellido)
+                    DO UPDATE SET autor_url = EXCLUDED.autor_url,
+                                  autor_fecha_nac = COALESCE(EXCLUDED.autor_fecha_nac, autor.autor_fecha_nac),
+                                  autor_lugar_nac = COALESCE(EXCLUDED.autor_lugar_nac, autor.autor_lugar_nac),
+                                  autor_descripcion = COALESCE(EXCLUDED.autor_descripcion, autor.autor_descripcion)
+                    """, row.get('autor_nombre'), row.get('autor_apellido'),
+                       row.get('autor_url'), row.get('autor_fecha_nac'),
+                       row.get('autor_lugar_nac'), row.get('autor_descripcion'))
+                except Exception as e:
+                    print(f"Error al insertar en autor: {e}")
+
+            # Insertar datos en la tabla de frases (quotes)
+            for _, row in frases_df.iterrows():
+                try:
+                    # Obtener el id del autor
+                    autor_id = await self.conn.fetchval("""
+                    SELECT autor_id FROM autor WHERE autor_nombre = $1 AND autor_apellido = $2
+                    """, row.get('autor_nombre'), row.get('autor_apellido'))
+
+                    if autor_id:
+                        frase_id = await self.conn.fetchval("""
+                        INSERT INTO frase (frase_texto, autor_id, fuente)
+                        VALUES ($1, $2, $3)
+                        ON CONFLICT (frase_texto)
+                        DO UPDATE SET autor_id = EXCLUDED.autor_id,
+                                      fuente = COALESCE(frase.fuente, EXCLUDED.fuente)
+                        RETURNING frase_id
+                        """, row.get('frase_texto'), autor_id,
+                           row.get('fuente') if isinstance(row.get('fuente'), str) else None)
+                except Exception as e:
+                    print(f"Error al insertar o actualizar en frase: {e}")
+                    continue
+
+                # Insertar relaciones en la tabla de unión frase_tag
+                tags_ids = row.get('Tags_IDs', [])  # 'Tags_IDs' es ahora una lista de IDs
+                for tag_id in tags_ids:
                     try:
+                        tag_id = int(tag_id)  # Convertir a entero si es necesario
                         await self.conn.execute("""
-                        INSERT INTO autor (autor_nombre, autor_apellido, autor_url, autor_fecha_nac, autor_lugar_nac, autor_descripcion)
-                        VALUES ($1, $2, $3, $4, $5, TRIM($6))
-                        ON CONFLICT (autor_nombre, autor_apellido)
-                        DO UPDATE SET autor_url = EXCLUDED.autor_url,
-                                      autor_fecha_nac = EXCLUDED.autor_fecha_nac,
-                                      autor_lugar_nac = EXCLUDED.autor_lugar_nac,
-                                      autor_descripcion = EXCLUDED.autor_descripcion
-                        """, row.get('autor_nombre'), row.get('autor_apellido'),
-                           row.get('autor_url'), row.get('autor_fecha_nac'),
-                           row.get('autor_lugar_nac'), row.get('autor_descripcion'))
+                        INSERT INTO frase_tag (frase_id, tag_id)
+                        VALUES ($1, $2)
+                        ON CONFLICT (frase_id, tag_id) DO NOTHING
+                        """, frase_id, tag_id)
                     except Exception as e:
-                        print(f"Error al insertar en autor: {e}")
+                        print(f"Error al insertar en frase_tag: {e}")
 
-                # Insertar datos en la tabla de frases (quotes)
-                for _, row in frases_df.iterrows():
-                    try:
-                        # Obtener el id del autor
-                        autor_id = await self.conn.fetchval("""
-                        SELECT autor_id FROM autor WHERE autor_nombre = $1 AND autor_apellido = $2
-                        """, row.get('autor_nombre'), row.get('autor_apellido'))
-
-                        if autor_id:
-                            frase_id = await self.conn.fetchval("""
-                            INSERT INTO frase (frase_texto, autor_id)
-                            VALUES ($1, $2)
-                            ON CONFLICT (frase_texto)
-                            DO UPDATE SET autor_id = EXCLUDED.autor_id
-                            RETURNING frase_id
-                            """, row.get('frase_texto'), autor_id)
-                    except Exception as e:
-                        print(f"Error al insertar o actualizar en frase: {e}")
-                        continue
-
-                    # Insertar relaciones en la tabla de unión frase_tag
-                    tags_ids = row.get('Tags_IDs', [])  # 'Tags_IDs' es ahora una lista de IDs
-                    for tag_id in tags_ids:
-                        try:
-                            tag_id = int(tag_id)  # Convertir a entero si es necesario
-                            await self.conn.execute("""
-                            INSERT INTO frase_tag (frase_id, tag_id)
-                            VALUES ($1, $2)
-                            ON CONFLICT (frase_id, tag_id) DO NOTHING
-                            """, frase_id, tag_id)
-                        except Exception as e:
-                            print(f"Error al insertar en frase_tag: {e}")
-
-            except asyncpg.PostgresError as e:
-                print(f"Error de PostgreSQL: {e}")
-            except Exception as e:
-                print(f"Error inesperado: {e}")
-
-        await self.close()
+        except asyncpg.PostgresError as e:
+            self.errors += 1
+            print(f"Error de PostgreSQL: {e}")
+        except Exception as e:
+            self.errors += 1
+            print(f"Error inesperado: {e}")
 
 if __name__ == "__main__":
     base_url = "https://quotes.toscrape.com/"
     scraper = Scraper(base_url)
-    frases_df, tags_df = scraper.scrape_quotes()
+    result = scraper.scrape_result()
     
     data_saver = AsyncDataSaver(
         db_name=db.DB_NAME,
@@ -110,4 +510,4 @@ if __name__ == "__main__":
         db_port=db.DB_PORT
     )
     
-    asyncio.run(data_saver.save_to_database(frases_df, tags_df))
+    asyncio.run(data_saver.save_result(result))
@@ -1,162 +1,837 @@
 import requests
 import pandas as pd
-from bs4 import BeautifulSoup
+import argparse
+import asyncio
 import logging
-import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from urllib.parse import urlsplit
+from author_cache import AuthorCache
+from transport import HttpTransport
+from resilience import AdaptiveLimiter, ResilientTransport
+from response_store import RecordingTransport, ReplayTransport, ResponseStore, StoredResponse
+from fingerprints import PageFingerprints
+from frontier import BloomFilter, CrawlFrontier
+from parsers import PARSERS
+from exporters import EXPORTERS, get_exporter
+from results import ScrapeResult
+from sites import QuotesToScrapeAdapter
+from parse_pool import ParsePool
+from metrics import Metrics
+from logging_config import LOG_LEVEL, configure_logging
+
+class TagRegistry:
+    """
+    IDs de los tags (`tag_texto -> tag_id`). Varios scrapers (uno por sitio) pueden compartir
+    el mismo registro para que un tag tenga el mismo ID en todos ellos.
+    """
+
+    def __init__(self):
+        self.ids = {}
+        self.next_id = 1
+        self._lock = threading.Lock()
+
+    def seed(self, tags_dict):
+        with self._lock:
+            self.ids.update(tags_dict)
+            if self.ids:
+                self.next_id = max(self.next_id, max(self.ids.values()) + 1)
+
+    def id_for(self, tag):
+        with self._lock:
+            if tag not in self.ids:
+                self.ids[tag] = self.next_id
+                self.next_id += 1
+            return self.ids[tag]
 
 class Scraper:
-    def __init__(self, base_url):
-        self.base_url = base_url
-        self.tags_dict = {}
-        self.next_tag_id = 1
+    # Páginas del listado seguidas que pueden fallar (tras los reintentos) antes de dar el recorrido por terminado
+    MAX_FAILED_PAGES = 3
+
+    def __init__(self, base_url, concurrency=8, author_cache=None, transport=None, fingerprints=None,
+                 parser='lxml', metrics=None, site=None, tags=None, parse_workers=0, frontier=None,
+                 refresh_authors=False):
+        # Adaptador del sitio (paginación y extracción); por defecto quotes.toscrape.com con el
+        # backend de parseo `parser`: 'lxml' (XPath compilado) o 'soup' (BeautifulSoup, referencia)
+        self.site = site if site is not None else QuotesToScrapeAdapter(base_url, parser=parser)
+        self.base_url = self.site.base_url
+        self.concurrency = concurrency
+        # Contadores e histogramas de peticiones y parseo (ver metrics.py)
+        self.metrics = metrics if metrics is not None else Metrics()
+        # El transporte es inyectable: por defecto una sesión con pool del tamaño de la concurrencia,
+        # con reintentos, un interruptor por host y concurrencia adaptativa (ver resilience.py)
+        self.transport = transport if transport is not None else ResilientTransport(
+            HttpTransport(pool_size=max(concurrency, 10)), limiter=AdaptiveLimiter(max(concurrency, 1)),
+            metrics=self.metrics)
+        # Sin caché explícita, al menos se evita repetir autores dentro de la misma ejecución
+        self.author_cache = author_cache if author_cache is not None else AuthorCache()
+        # Con `refresh_authors` (actualización forzada) no valen los detalles de autores que la caché
+        # guardaba de antes de esta ejecución: cada autor se vuelve a pedir, una sola vez
+        self._authors_fetched_after = time.time() if refresh_authors else None
+        # Modo incremental: con huellas de la ejecución anterior se omiten las páginas sin cambios
+        self.fingerprints = fingerprints
+        # Autores pedidos en esta ejecución, y detalles nuevos de los autores con huella que cambiaron
+        # sin que ninguna página procesada del listado los nombrara (ver `revisit_authors`)
+        self._authors_checked = set()
+        self.author_updates = {}
+        self.tags = tags if tags is not None else TagRegistry()
+        # Procesos que parsean el HTML en `aiter_quotes` (0 = en el propio proceso)
+        self.parse_workers = parse_workers
+        self._parse_pool = None
+        # Con una frontera (ver frontier.py) se siguen los enlaces de cada página en lugar de
+        # numerar las páginas del listado, y una página que falla se reintenta sin detener el recorrido
+        self.frontier = frontier
         self.setup_logger()
 
-    def setup_logger(self):
-        # Asegurarse de que la carpeta 'logs' exista
-        log_dir = 'logs'
-        os.makedirs(log_dir, exist_ok=True)
+    @property
+    def tags_dict(self):
+        return self.tags.ids
 
-        # Crear el logger
-        self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
+    @property
+    def next_tag_id(self):
+        return self.tags.next_id
 
-        # Crear manejador de archivo con la ruta dentro de la carpeta 'logs'
-        log_file = os.path.join(log_dir, 'scraper.log')
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
+    def seed_tags(self, tags_dict):
+        """
+        Parte de los IDs de tags ya existentes (`tag_texto -> tag_id`), para que un tag conserve
+        su ID entre ejecuciones aunque no se recorran todas las páginas.
+        """
+        self.tags.seed(tags_dict)
 
-        # Crear el formato de los logs
-        formatter = logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(formatter)
+    def setup_logger(self):
+        # La configuración (cola + hilo de escritura en logs/scraper.log) se hace una sola vez por proceso
+        configure_logging('scraper')
+        # Nombre fijo: el mismo logger aunque el módulo se ejecute como script (__main__)
+        self.logger = logging.getLogger('scraper')
 
-        # Agregar manejador de archivo al logger
-        self.logger.addHandler(file_handler)
+    def _log_page(self, page_url, frases, rows):
+        # Un resumen por página a nivel INFO; el detalle de cada frase va a DEBUG
+        self.logger.info("Página procesada: %s (%d frases, %d filas)", page_url, len(frases), len(rows),
+                         extra={'site': self.site.name, 'page_url': page_url, 'frases': len(frases), 'filas': len(rows),
+                                'autores': len({frase['autor_url'] for frase in frases})})
+
+    def _get(self, url, page_type='listing', headers=None):
+        """
+        Descarga una URL y lanza una excepción si la respuesta no es satisfactoria.
+        La petición se anota en las métricas por tipo de página y código de estado.
+        Con `headers` condicionales (ver `_conditional_headers`) la respuesta puede ser un 304.
+        Una página que según el calendario de revisitas aún no toca (ver recrawl.py) no se pide:
+        se responde con un 304 sin cuerpo, que se resuelve con la huella anterior.
+        """
+        with_data = page_type == 'author' or self.frontier is not None
+        if self.fingerprints is not None and not self.fingerprints.is_due(url, page_type, with_data):
+            self.metrics.inc('scraper_recrawl_skipped_total', page_type=page_type)
+            self.logger.debug("Aún no toca revisar la página: %s", url)
+            return StoredResponse(url, 304, b'')
+        start = time.perf_counter()
+        status = 'error'
+        try:
+            response = self.transport.get(url, headers=headers) if headers else self.transport.get(url)
+            status = str(response.status_code)
+            response.raise_for_status()
+            return response
+        finally:
+            self.metrics.inc('scraper_http_requests_total', page_type=page_type, status=status)
+            self.metrics.observe('scraper_http_request_seconds', time.perf_counter() - start,
+                                 page_type=page_type, status=status)
+
+    def _conditional_headers(self, url, with_data=False):
+        # Validadores de la ejecución anterior (ver PageFingerprints.request_headers)
+        if self.fingerprints is None:
+            return None
+        return self.fingerprints.request_headers(url, with_data)
 
     def get_author_details(self, autor_url):
         """
         Extrae la fecha de nacimiento, ubicación de nacimiento y descripción del autor desde su página.
+        Cada autor se descarga una sola vez gracias a la caché de autores.
         """
-        self.logger.info(f"Extrayendo detalles del autor desde: {autor_url}")
+        return self.author_cache.get_or_fetch(autor_url, self._fetch_author_details,
+                                              fetched_after=self._authors_fetched_after)
+
+    def _fetch_author_details(self, autor_url):
+        self.logger.debug("Extrayendo detalles del autor desde: %s", autor_url)
+        self._authors_checked.add(autor_url)
         try:
-            autor_response = requests.get(autor_url)
-            autor_response.raise_for_status()
+            autor_response = self._get(autor_url, 'author', self._conditional_headers(autor_url, with_data=True))
         except requests.exceptions.RequestException as e:
+            self.metrics.inc('scraper_failed_urls_total', page_type='author')
             self.logger.error(f"Error al obtener la página del autor: {e}")
             return None
-        
+
+        if self.fingerprints is not None:
+            # Un 304 se resuelve con los detalles de la ejecución anterior, sin parsear nada
+            if autor_response.status_code == 304:
+                self.fingerprints.not_modified(autor_url)
+                self.logger.debug("Página del autor sin cambios (304): %s", autor_url)
+                return self.fingerprints.previous_data(autor_url)
+            validators = PageFingerprints.validators_of(autor_response)
+            content_hash = PageFingerprints.hash_content(autor_response.text)
+            if self.fingerprints.is_unchanged(autor_url, content_hash):
+                details = self.fingerprints.previous_data(autor_url)
+                if details is not None:
+                    self.logger.debug("Página del autor sin cambios: %s", autor_url)
+                    self.fingerprints.refresh_validators(autor_url, validators)
+                    return details
+
         try:
-            autor_soup = BeautifulSoup(autor_response.text, 'lxml')
-            
-            born_date = autor_soup.find('span', class_='author-born-date')
-            born_location = autor_soup.find('span', class_='author-born-location')
-            description = autor_soup.find('div', class_='author-description')
-            
-            details = {
-                'author-born-date': born_date.get_text() if born_date else '',
-                'author-born-location': born_location.get_text() if born_location else '',
-                'author-description': description.get_text() if description else ''
-            }
-            self.logger.info(f"Detalles del autor obtenidos: {details}")
+            details = self._parse_author_page(autor_response.text)
+            self.logger.debug("Detalles del autor obtenidos: %s", details)
         except Exception as e:
             self.logger.error(f"Error al procesar la página del autor: {e}")
             details = None
-        
+
+        if details is None and self.fingerprints is not None:
+            self.fingerprints.failed(autor_url)
+
+        if details is not None and self.fingerprints is not None:
+            self.fingerprints.record(autor_url, content_hash, details, validators)
+
         return details
 
-    def scrape_quotes(self):
+    def _authors_to_revisit(self):
+        # Autores de este sitio con huella que el recorrido del listado no llegó a pedir
+        if self.fingerprints is None:
+            return []
+        return [url for url in self.fingerprints.author_urls()
+                if url not in self._authors_checked and urlsplit(url).netloc == self.site.source]
+
+    def _revisit_author(self, autor_url):
         """
-        Realiza el scraping de frases, autores y etiquetas desde la página especificada.
+        Pide de nuevo, sin pasar por la caché de autores, la página de un autor de la ejecución
+        anterior si toca según el calendario (o siempre, sin calendario). Si sus detalles cambiaron
+        se guardan en la caché y en `author_updates`.
+        """
+        previous = self.fingerprints.previous_data(autor_url)
+        details = self._fetch_author_details(autor_url)
+        if details is not None and details != previous:
+            self.logger.info("Página del autor modificada: %s", autor_url, extra={'page_url': autor_url})
+            self.author_cache.set(autor_url, details)
+            self.author_updates[autor_url] = details
+
+    def revisit_authors(self):
+        """
+        Revisa las páginas de autores con huella que no nombra ninguna página procesada del listado,
+        para que un autor que cambia sin que cambie el listado también se actualice (`author_updates`).
+        """
+        for autor_url in self._authors_to_revisit():
+            self._revisit_author(autor_url)
+
+    def _listing_unchanged(self, page_url, response, links=None):
+        """
+        En modo incremental, decide si una página del listado cambió desde la ejecución anterior
+        (respuesta 304 o mismo hash) y devuelve `(sin_cambios, huella)`; la huella se guarda con
+        `_record_listing`. Una página sin cambios ya tenía frases, así que el recorrido sigue.
+        Con `links` (recorrido por frontera) los enlaces se guardan en la huella para reutilizarlos
+        tras un 304.
+        """
+        if self.fingerprints is None:
+            return False, None
+        if response.status_code == 304:
+            self.fingerprints.not_modified(page_url)
+            self.logger.info("Página sin cambios (304), se omite: %s", page_url, extra={'page_url': page_url})
+            return True, None
+        content_hash = PageFingerprints.hash_content(response.text)
+        validators = PageFingerprints.validators_of(response)
+        data = {'links': [list(link) for link in links]} if links is not None else None
+        unchanged = self.fingerprints.is_unchanged(page_url, content_hash)
+        if unchanged:
+            self.fingerprints.refresh_validators(page_url, validators, data)
+            self.logger.info("Página sin cambios, se omite: %s", page_url, extra={'page_url': page_url})
+        return unchanged, (content_hash, data, validators)
+
+    def _record_listing(self, page_url, fingerprint, frases, rows, details_list=()):
+        # Solo se guarda la huella si todas las frases de la página y sus autores se procesaron
+        # bien; si no, la página se vuelve a procesar en la siguiente ejecución
+        if self.fingerprints is not None and len(rows) == len(frases) and None not in details_list:
+            self.fingerprints.record(page_url, *fingerprint)
+        elif self.fingerprints is not None:
+            self.fingerprints.failed(page_url)
+
+    def _page_links(self, page_url, response):
+        # Tras un 304 se reutilizan los enlaces guardados en la huella de la página
+        if response.status_code == 304:
+            return self.fingerprints.previous_data(page_url)['links']
+        return self.site.page_links(response.text, page_url)
+
+    @staticmethod
+    def _is_permanent(error):
+        # Los errores 4xx (salvo 429) no se arreglan reintentando
+        status = getattr(getattr(error, 'response', None), 'status_code', None)
+        return status is not None and 400 <= status < 500 and status != 429
+
+    def _skip_failed_listing(self, page_url, error, failed_pages):
+        """
+        Una página del listado falló tras los reintentos del transporte. Se salta (no guarda huella,
+        así que la siguiente ejecución la vuelve a pedir) y el recorrido sigue, salvo con un error
+        permanente (4xx) o tras `MAX_FAILED_PAGES` páginas seguidas fallidas. Devuelve True si se salta.
+        """
+        self.metrics.inc('scraper_failed_urls_total', page_type='listing')
+        if self._is_permanent(error) or failed_pages >= self.MAX_FAILED_PAGES:
+            self.logger.error(f"Error al realizar la petición: {error}")
+            return False
+        self.logger.warning("Se omite la página tras agotar los reintentos: %s (%s)", page_url, error,
+                            extra={'site': self.site.name, 'page_url': page_url})
+        return True
+
+    def _retry_page(self, page_url, kind, error):
+        if self.frontier.retry(page_url, kind, error, permanent=self._is_permanent(error)):
+            self.metrics.inc('scraper_retries_total', page_type=kind)
+            self.logger.warning("Error al realizar la petición, se reintentará: %s (%s)", page_url, error,
+                                extra={'site': self.site.name, 'page_url': page_url})
+        else:
+            self.metrics.inc('scraper_failed_urls_total', page_type=kind)
+            self.logger.error("Se descarta la página tras %d intentos: %s (%s)", self.frontier.attempts[page_url],
+                              page_url, error, extra={'site': self.site.name, 'page_url': page_url})
+
+    def _discover(self, kind, links):
+        # La página siguiente de un tag sigue siendo del tag
+        for link_kind, url in links:
+            self.frontier.add(url, kind if link_kind == 'next' else link_kind)
+
+    @staticmethod
+    def _unseen_frases(frases, seen):
+        # Las páginas de tags repiten frases del listado: cada frase se procesa una sola vez
+        unseen = []
+        for frase in frases:
+            key = (frase['frase_texto'], frase['autor_url'])
+            if key not in seen:
+                seen.add(key)
+                unseen.append(frase)
+        return unseen
+
+    def _log_frontier(self):
+        stats = self.frontier.stats()
+        self.logger.info("Recorrido terminado: %d URLs vistas, %d reintentos, %d páginas descartadas",
+                         stats['seen'], stats['retries'], stats['failed'], extra=dict(stats, site=self.site.name))
+
+    def _parse_author_page(self, html):
+        """
+        Convierte el HTML de la página de un autor en el diccionario de detalles.
+        """
+        with self.metrics.timer('scraper_parse_seconds', page_type='author'):
+            if self._parse_pool is not None:
+                return self._parse_pool.parse_author(html)
+            return self.site.parse_author_page(html)
+
+    async def _parse_quotes_page_in_pool(self, html):
+        """
+        Versión de `_parse_quotes_page` que parsea en el pool de procesos sin bloquear el bucle de eventos.
+        """
+        with self.metrics.timer('scraper_parse_seconds', page_type='listing'):
+            frases, errors = await self._parse_pool.parse_listing(html)
+        for error in errors:
+            self.logger.error(f"Error al procesar una frase: {error}")
+        return frases
+
+    async def _has_next_page(self, html):
+        # Si la página del listado enlaza a la siguiente; None si el adaptador no lo sabe
+        if self._parse_pool is not None:
+            return await self._parse_pool.has_next_page(html)
+        return self.site.has_next_page(html)
+
+    @contextmanager
+    def _parse_pipeline(self):
+        # Pool de procesos de parseo durante un recorrido concurrente, si se pidieron `parse_workers`
+        if not self.parse_workers:
+            yield
+            return
+        self._parse_pool = ParsePool(self.site, self.parse_workers)
+        try:
+            yield
+        finally:
+            pool, self._parse_pool = self._parse_pool, None
+            # Sin esperar a los parseos cancelados, para no bloquear el bucle de eventos
+            pool.shutdown(wait=False)
+
+    @staticmethod
+    @contextmanager
+    def _download_pool(workers):
+        # Hilos de descarga de un recorrido concurrente. Al terminar no se espera a las descargas
+        # que ya no hacen falta (acaban solas en sus hilos) para no bloquear el bucle de eventos
+        executor = ThreadPoolExecutor(max_workers=workers)
+        try:
+            yield executor
+        finally:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def _parse_quotes_page(self, html):
+        """
+        Extrae las frases de una página del listado. Devuelve una lista de diccionarios
+        con el texto, el nombre completo del autor, la URL del autor y los tags.
+        Una lista vacía indica que no quedan más páginas.
+        """
+        frases = []
+
+        with self.metrics.timer('scraper_parse_seconds', page_type='listing'):
+            for element in self.site.quote_elements(html):
+                try:
+                    frase = self.site.parse_quote(element)
+                    self.logger.debug("Frase obtenida: %s (tags: %s)", frase['frase_texto'], frase['tags'])
+                    frases.append(frase)
+                except Exception as e:
+                    self.logger.error(f"Error al procesar una frase: {e}")
+                    continue
+
+        return frases
+
+    def _build_row(self, frase, details):
+        """
+        Combina una frase extraída del listado con los detalles de su autor y asigna
+        los IDs de los tags. Sin detalles (`details` None) los datos del autor quedan vacíos.
+        """
+        nombres = frase['autor_nombre_completo'].split()
+        nombre = nombres[0]
+        apellido = " ".join(nombres[1:]) if len(nombres) > 1 else ""
+
+        tags = frase['tags']
+        tags_ids = []
+
+        for tag in tags:
+            tags_ids.append(self.tags.id_for(tag))
+        self.logger.debug("IDs de los tags: %s", tags_ids)
+        details = details or {}
+
+        return {
+            'frase_texto': frase['frase_texto'],
+            'autor_nombre': nombre,
+            'autor_apellido': apellido,
+            'autor_url': frase['autor_url'],
+            'autor_fecha_nac': details.get('author-born-date'),
+            'autor_lugar_nac': details.get('author-born-location'),
+            'autor_descripcion': details.get('author-description'),
+            'Tags': tags,
+            'Tags_IDs': tags_ids,
+            'fuente': self.site.source
+        }
+
+    def _build_dataframes(self, data):
+        """
+        Construye los DataFrames de frases y tags a partir de las filas obtenidas.
+        """
+        try:
+            frases_df = pd.DataFrame(data)
+            frases_df['autor_descripcion'] = frases_df['autor_descripcion'].str.strip()
+            tags_df = pd.DataFrame(list(self.tags_dict.items()), columns=['tag_texto', 'tag_id'])
+
+            self.logger.info(f"Scraping completado. Total de frases: {len(frases_df)}. Total de tags: {len(tags_df)}.")
+        except Exception as e:
+            self.logger.error(f"Error al crear los DataFrames: {e}")
+            frases_df, tags_df = pd.DataFrame(), pd.DataFrame()
+
+        return frases_df, tags_df
+
+    def _page_rows(self, frases, details_list):
+        """
+        Construye las filas de una página. Una frase cuyo autor no se pudo obtener se conserva con
+        los datos del autor vacíos; la página no guarda huella y se vuelve a procesar en la
+        siguiente ejecución (ver `_record_listing`).
+        """
+        rows = []
+        for frase, details in zip(frases, details_list):
+            if details is None:
+                self.logger.warning("No se pudieron obtener detalles del autor para la frase: %s", frase['frase_texto'])
+            try:
+                rows.append(self._build_row(frase, details))
+            except Exception as e:
+                self.logger.error(f"Error al procesar una frase: {e}")
+        return rows
+
+    def iter_quotes(self):
         """
+        Recorre el listado página a página y devuelve (yield) las filas de cada página
+        en cuanto están listas, sin acumular todo el sitio en memoria.
+        """
+        if self.frontier is not None:
+            yield from self._iter_frontier()
+            self.revisit_authors()
+            return
+
         self.logger.info("Iniciando scraping de frases")
-        data = []
         page_number = 1
+        failed_pages = 0
 
         while True:
-            page_url = f"{self.base_url}page/{page_number}/"
-            self.logger.info(f"Scraping página: {page_url}")
+            page_url = self.site.listing_url(page_number)
+            self.logger.debug("Scraping página: %s", page_url)
 
             try:
-                frases_to_scrape = requests.get(page_url)
-                frases_to_scrape.raise_for_status()
+                frases_to_scrape = self._get(page_url, headers=self._conditional_headers(page_url))
             except requests.exceptions.RequestException as e:
-                self.logger.error(f"Error al realizar la petición: {e}")
-                break
+                failed_pages += 1
+                if not self._skip_failed_listing(page_url, e, failed_pages):
+                    break
+                page_number += 1
+                continue
+            failed_pages = 0
 
             try:
-                soup = BeautifulSoup(frases_to_scrape.text, 'lxml')
-                frases_html = soup.find_all('div', attrs={'class': 'quote'})
+                unchanged, fingerprint = self._listing_unchanged(page_url, frases_to_scrape)
+                if unchanged:
+                    page_number += 1
+                    continue
 
-                if not frases_html:
+                frases = self._parse_quotes_page(frases_to_scrape.text)
+
+                if not frases:
                     self.logger.info("No se encontraron más frases.")
                     break
 
-                for frase in frases_html:
-                    try:
-                        contenido_frase = frase.find('span', class_='text').get_text()
-                        self.logger.info(f"Frase obtenida: {contenido_frase}")
-                        
-                        autor_nombre_completo = frase.find('small', class_='author').get_text()
-                        autor_url = frase.find('a')['href']
-                        autor_url = self.base_url + autor_url
-                        
-                        details = self.get_author_details(autor_url)
-                        
-                        if details is None:
-                            self.logger.warning(f"No se pudieron obtener detalles del autor para la frase: {contenido_frase}")
-                            continue
-                        
-                        nombres = autor_nombre_completo.split()
-                        nombre = nombres[0]
-                        apellido = " ".join(nombres[1:]) if len(nombres) > 1 else ""
-
-                        tags = [tag.get_text() for tag in frase.find_all('a', class_='tag')]
-                        self.logger.info(f"Tags obtenidos: {tags}")
-                        
-                        tags_ids = []
-                        
-                        for tag in tags:
-                            if tag not in self.tags_dict:
-                                self.tags_dict[tag] = self.next_tag_id
-                                self.next_tag_id += 1
-                            tags_ids.append(self.tags_dict[tag])
-                        self.logger.info(f"IDs de los tags: {tags_ids}")
-                        
-                        temp_row = {
-                            'frase_texto': contenido_frase,
-                            'autor_nombre': nombre,
-                            'autor_apellido': apellido,
-                            'autor_url': autor_url,
-                            'autor_fecha_nac': details['author-born-date'],
-                            'autor_lugar_nac': details['author-born-location'],
-                            'autor_descripcion': details['author-description'],
-                            'Tags': tags,
-                            'Tags_IDs': tags_ids
-                        }
-                        data.append(temp_row)
-                    except Exception as e:
-                        self.logger.error(f"Error al procesar una frase: {e}")
-                        continue
+                details_list = [self.get_author_details(frase['autor_url']) for frase in frases]
+                rows = self._page_rows(frases, details_list)
+                self._record_listing(page_url, fingerprint, frases, rows, details_list)
+                self._log_page(page_url, frases, rows)
 
                 page_number += 1
             except Exception as e:
                 self.logger.error(f"Error al procesar la página de frases: {e}")
                 break
-        
-        try:
-            frases_df = pd.DataFrame(data)
-            frases_df['autor_descripcion'] = frases_df['autor_descripcion'].str.strip()
-            tags_df = pd.DataFrame(list(self.tags_dict.items()), columns=['tag_texto', 'tag_id'])
-            
-            self.logger.info(f"Scraping completado. Total de frases: {len(frases_df)}. Total de tags: {len(tags_df)}.")
-        except Exception as e:
-            self.logger.error(f"Error al crear los DataFrames: {e}")
-            frases_df, tags_df = pd.DataFrame(), pd.DataFrame()
-        
-        return frases_df, tags_df
+
+            yield rows
+
+        self.revisit_authors()
+
+    def _iter_frontier(self):
+        """
+        Versión de `iter_quotes` que sigue enlaces: empieza en la primera página del listado y
+        visita las páginas siguientes y de tags que descubre el adaptador, cada URL una sola vez.
+        """
+        self.logger.info("Iniciando scraping de frases siguiendo enlaces")
+        self.frontier.add(self.site.listing_url(1), 'listing')
+        seen = set()
+
+        while True:
+            entry = self.frontier.pop()
+            if entry is None:
+                # Solo quedan reintentos que aún no tocan: se espera al primero
+                wait = self.frontier.wait_time()
+                if wait is None:
+                    break
+                time.sleep(wait)
+                continue
+            page_url, kind = entry
+            self.logger.debug("Scraping página: %s", page_url)
+
+            try:
+                response = self._get(page_url, kind, self._conditional_headers(page_url, with_data=True))
+            except requests.exceptions.RequestException as e:
+                self._retry_page(page_url, kind, e)
+                continue
+
+            try:
+                links = self._page_links(page_url, response)
+                self._discover(kind, links)
+                unchanged, fingerprint = self._listing_unchanged(page_url, response, links)
+                if unchanged:
+                    continue
+
+                frases = self._unseen_frases(self._parse_quotes_page(response.text), seen)
+                details_list = [self.get_author_details(frase['autor_url']) for frase in frases]
+                rows = self._page_rows(frases, details_list)
+                self._record_listing(page_url, fingerprint, frases, rows, details_list)
+            except Exception as e:
+                self.logger.error(f"Error al procesar la página de frases: {e}")
+                continue
+
+            if frases:
+                self._log_page(page_url, frases, rows)
+                yield rows
+
+        self._log_frontier()
+
+    def scrape_quotes(self):
+        """
+        Realiza el scraping de frases, autores y etiquetas desde la página especificada.
+        """
+        data = []
+        for rows in self.iter_quotes():
+            data.extend(rows)
+        return self._build_dataframes(data)
+
+    async def aiter_quotes(self, concurrency=None):
+        """
+        Versión concurrente de `iter_quotes`. Descarga las páginas del listado por
+        bloques de `concurrency` páginas (el bloque siguiente mientras se recorre el actual)
+        y las páginas de autores en paralelo, con un semáforo que limita las peticiones
+        simultáneas. Las filas de cada página se
+        devuelven en el mismo orden que la versión secuencial, mientras las descargas
+        siguientes continúan en segundo plano.
+
+        Con `parse_workers` el HTML se parsea en un pool de procesos: los parseos de un
+        bloque de páginas corren en paralelo mientras el bucle de eventos sigue descargando.
+
+        Con una frontera se siguen los enlaces (ver `_iter_frontier`), con hasta `concurrency`
+        páginas en curso; las filas se devuelven entonces en el orden en que se completan.
+        """
+        concurrency = concurrency or self.concurrency
+        self.logger.info(f"Iniciando scraping concurrente de frases (concurrencia: {concurrency})")
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(concurrency)
+        # Cola acotada: si el consumidor se retrasa, se dejan de pedir páginas nuevas
+        pages = asyncio.Queue(maxsize=2 * concurrency)
+
+        with self._parse_pipeline(), self._download_pool(concurrency) as executor:
+            async def run_limited(func, *args):
+                async with semaphore:
+                    return await loop.run_in_executor(executor, func, *args)
+
+            def fetch_block(first, size=concurrency):
+                # Lanza en segundo plano las descargas de un bloque de `size` páginas del listado
+                page_numbers = range(first, first + size)
+                return page_numbers, asyncio.ensure_future(asyncio.gather(
+                    *(run_limited(self._get, self.site.listing_url(n), 'listing',
+                                  self._conditional_headers(self.site.listing_url(n)))
+                      for n in page_numbers),
+                    return_exceptions=True
+                ))
+
+            async def produce_listing():
+                # Cada página del listado lanza sus descargas de autores sin esperar a las demás
+                failed_pages = 0
+                # Frases de la página más larga vista: una página más corta puede ser la última
+                page_size = 0
+                page_numbers, fetching = fetch_block(1)
+                try:
+                    while True:
+                        responses = await fetching
+
+                        # Primero se lanzan los parseos de todo el bloque (en paralelo con el pool de procesos);
+                        # después se recorren en orden de página
+                        listing, stop = [], False
+                        for n, response in zip(page_numbers, responses):
+                            page_url = self.site.listing_url(n)
+                            self.logger.debug("Scraping página: %s", page_url)
+                            if isinstance(response, requests.exceptions.RequestException):
+                                failed_pages += 1
+                                if self._skip_failed_listing(page_url, response, failed_pages):
+                                    continue
+                                stop = True
+                                break
+                            failed_pages = 0
+
+                            try:
+                                if isinstance(response, Exception):
+                                    raise response
+                                unchanged, fingerprint = self._listing_unchanged(page_url, response)
+                                if unchanged:
+                                    continue
+                                parse = (asyncio.ensure_future(self._parse_quotes_page_in_pool(response.text))
+                                         if self._parse_pool is not None else None)
+                                listing.append((page_url, fingerprint, response.text, parse))
+                            except Exception as e:
+                                self.logger.error(f"Error al procesar la página de frases: {e}")
+                                stop = True
+                                break
+
+                        parsed, short = [], False
+                        try:
+                            for page_url, fingerprint, html, parse in listing:
+                                try:
+                                    frases = await parse if parse is not None else self._parse_quotes_page(html)
+                                except Exception as e:
+                                    self.logger.error(f"Error al procesar la página de frases: {e}")
+                                    stop = True
+                                    break
+
+                                if not frases:
+                                    self.logger.info("No se encontraron más frases.")
+                                    stop = True
+                                    break
+                                parsed.append((page_url, fingerprint, frases))
+                                if await self._has_next_page(html) is False:
+                                    # Última página del listado: no se adelantan más descargas
+                                    self.logger.debug("Última página del listado: %s", page_url)
+                                    stop = True
+                                    break
+                                short = len(frases) < page_size
+                                page_size = max(page_size, len(frases))
+                        finally:
+                            # Parseos de páginas posteriores al final del listado que ya no hacen falta
+                            for _, _, _, parse in listing:
+                                if parse is None:
+                                    continue
+                                if not parse.done():
+                                    parse.cancel()
+                                elif not parse.cancelled():
+                                    parse.exception()  # Marca el error como recogido
+
+                        # El bloque siguiente se descarga mientras se recorren las páginas de este, salvo
+                        # si ya apareció el final del listado; tras una página más corta que las anteriores
+                        # solo se pide la siguiente, para confirmar que está vacía
+                        if not stop:
+                            page_numbers, fetching = fetch_block(page_numbers[-1] + 1, 1 if short else concurrency)
+
+                        for page_url, fingerprint, frases in parsed:
+                            author_tasks = [
+                                asyncio.ensure_future(run_limited(self.get_author_details, frase['autor_url']))
+                                for frase in frases
+                            ]
+                            await pages.put((page_url, fingerprint, frases, author_tasks))
+
+                        if stop:
+                            return
+                finally:
+                    # Descargas del bloque siguiente que ya no hacen falta si el recorrido se interrumpe;
+                    # el error de la cancelación se recoge para que asyncio no lo avise
+                    fetching.cancel()
+                    fetching.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+            async def crawl_page(page_url, kind, seen):
+                # Una página de la frontera: encola los enlaces descubiertos y lanza sus autores
+                self.logger.debug("Scraping página: %s", page_url)
+                try:
+                    response = await run_limited(self._get, page_url, kind,
+                                                 self._conditional_headers(page_url, with_data=True))
+                except requests.exceptions.RequestException as e:
+                    self._retry_page(page_url, kind, e)
+                    return
+
+                try:
+                    html = response.text
+                    if self._parse_pool is not None and response.status_code != 304:
+                        links = await self._parse_pool.page_links(html, page_url)
+                    else:
+                        links = self._page_links(page_url, response)
+                    self._discover(kind, links)
+                    unchanged, fingerprint = self._listing_unchanged(page_url, response, links)
+                    if unchanged:
+                        return
+                    if self._parse_pool is not None:
+                        frases = await self._parse_quotes_page_in_pool(html)
+                    else:
+                        frases = self._parse_quotes_page(html)
+                except Exception as e:
+                    self.logger.error(f"Error al procesar la página de frases: {e}")
+                    return
+
+                frases = self._unseen_frases(frases, seen)
+                if not frases:
+                    self._record_listing(page_url, fingerprint, frases, [])
+                    return
+                author_tasks = [
+                    asyncio.ensure_future(run_limited(self.get_author_details, frase['autor_url']))
+                    for frase in frases
+                ]
+                await pages.put((page_url, fingerprint, frases, author_tasks))
+
+            async def produce_frontier():
+                # Hasta `concurrency` páginas en curso; cada una puede añadir más URLs a la frontera
+                self.logger.info("Iniciando scraping de frases siguiendo enlaces")
+                self.frontier.add(self.site.listing_url(1), 'listing')
+                seen = set()
+                in_flight = set()
+                try:
+                    while True:
+                        while len(in_flight) < concurrency:
+                            entry = self.frontier.pop()
+                            if entry is None:
+                                break
+                            in_flight.add(asyncio.ensure_future(crawl_page(*entry, seen)))
+                        # Con huecos libres se espera como mucho hasta que toque el siguiente reintento
+                        wait = self.frontier.wait_time() if len(in_flight) < concurrency else None
+                        if not in_flight:
+                            if wait is None:
+                                break
+                            await asyncio.sleep(wait)
+                            continue
+                        done, in_flight = await asyncio.wait(in_flight, timeout=wait,
+                                                             return_when=asyncio.FIRST_COMPLETED)
+                        for task in done:
+                            task.result()
+                finally:
+                    for task in in_flight:
+                        task.cancel()
+                self._log_frontier()
+
+            async def produce_pages():
+                try:
+                    if self.frontier is not None:
+                        await produce_frontier()
+                    else:
+                        await produce_listing()
+                except Exception as e:
+                    self.logger.error(f"Error al recorrer el listado de frases: {e}")
+                # Marca de fin para el consumidor
+                await pages.put(None)
+
+            producer = asyncio.ensure_future(produce_pages())
+            try:
+                # Las filas se construyen en orden de página para que los IDs de tags coincidan
+                while True:
+                    page = await pages.get()
+                    if page is None:
+                        break
+                    page_url, fingerprint, frases, author_tasks = page
+                    details_list = await asyncio.gather(*author_tasks)
+                    rows = self._page_rows(frases, details_list)
+                    self._record_listing(page_url, fingerprint, frases, rows, details_list)
+                    self._log_page(page_url, frases, rows)
+                    yield rows
+                await producer
+                # Autores con huella que no nombra ninguna página procesada (ver `revisit_authors`)
+                await asyncio.gather(*(run_limited(self._revisit_author, autor_url)
+                                       for autor_url in self._authors_to_revisit()))
+            finally:
+                producer.cancel()
+
+    async def scrape_quotes_async(self, concurrency=None):
+        """
+        Versión concurrente de `scrape_quotes`: devuelve los mismos `(frases_df, tags_df)`.
+        """
+        data = []
+        async for rows in self.aiter_quotes(concurrency):
+            data.extend(rows)
+        return self._build_dataframes(data)
+
+    def scrape_result(self):
+        """
+        Como `scrape_quotes`, pero devuelve un ScrapeResult (ver results.py): tablas normalizadas
+        de autores, frases, tags y frase-tag, sin repetir los datos del autor en cada frase.
+        """
+        result = ScrapeResult()
+        for rows in self.iter_quotes():
+            result.add_rows(rows)
+        result.add_tags(self.tags_dict)
+        return result
+
+    async def scrape_result_async(self, concurrency=None):
+        """
+        Versión concurrente de `scrape_result`.
+        """
+        result = ScrapeResult()
+        async for rows in self.aiter_quotes(concurrency):
+            result.add_rows(rows)
+        result.add_tags(self.tags_dict)
+        return result
+
+    def _log_export(self, exporter):
+        self.logger.info(f"Datos exportados en {exporter.filename} ({exporter.rows} frases, {len(self.tags_dict)} tags)")
+
+    def export(self, exporter):
+        """
+        Recorre el sitio y escribe las filas de cada página en `exporter` (ver exporters.py) en
+        cuanto llegan, sin construir los DataFrames; al terminar escribe los tags.
+        """
+        for rows in self.iter_quotes():
+            exporter.write_rows(rows)
+        exporter.write_tags(self.tags_dict)
+        self._log_export(exporter)
+
+    async def export_async(self, exporter, concurrency=None):
+        """
+        Versión concurrente de `export`.
+        """
+        async for rows in self.aiter_quotes(concurrency):
+            exporter.write_rows(rows)
+        exporter.write_tags(self.tags_dict)
+        self._log_export(exporter)
 
     def save_to_excel(self, frases_df, tags_df, filename='frases_autores_detalles.xlsx'):
         """
         Guarda los DataFrames en un archivo Excel con dos hojas: una para las frases y otra para los tags.
+        Es el formato más lento; para recorridos grandes, `export` con Parquet o CSV.
         """
         try:
             with pd.ExcelWriter(filename) as writer:
@@ -167,9 +842,66 @@ class Scraper:
             self.logger.error(f"Error al guardar los datos en Excel: {e}")
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Scraper de quotes.toscrape.com")
+    parser.add_argument('--concurrency', type=int, default=1,
+                        help="Número de peticiones simultáneas (1 = modo secuencial)")
+    parser.add_argument('--author-cache', default=None,
+                        help="Archivo SQLite donde reutilizar los detalles de autores entre ejecuciones")
+    parser.add_argument('--rate-limit', type=float, default=None,
+                        help="Máximo de peticiones por segundo a cada host (sin límite por defecto)")
+    parser.add_argument('--timeout', type=float, default=30,
+                        help="Timeout de lectura de cada petición, en segundos")
+    parser.add_argument('--parser', choices=sorted(PARSERS), default='lxml',
+                        help="Backend de parseo del HTML")
+    parser.add_argument('--log-level', default=LOG_LEVEL, choices=['DEBUG', 'INFO', 'WARNING', 'ERROR'],
+                        help="Nivel de logs (DEBUG incluye el detalle de cada frase y autor)")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="Procesos que parsean el HTML en el modo concurrente (0 = en el propio proceso)")
+    parser.add_argument('--follow-links', action='store_true',
+                        help="Seguir los enlaces 'Next' y de tags en lugar de numerar las páginas del listado")
+    parser.add_argument('--bloom-capacity', type=int, default=None,
+                        help="Con --follow-links, guardar las URLs vistas en un filtro de Bloom para este número de URLs")
+    parser.add_argument('--max-retries', type=int, default=3,
+                        help="Con --follow-links, reintentos de cada página antes de descartarla")
+    parser.add_argument('--store', default=None,
+                        help="Carpeta donde guardar las respuestas HTTP en bruto (ver response_store.py)")
+    parser.add_argument('--replay', action='store_true',
+                        help="Parsear las respuestas guardadas en --store, sin acceder a la red")
+    parser.add_argument('--http-retries', type=int, default=3,
+                        help="Reintentos de cada petición ante 429, 5xx y errores de red (con espera exponencial)")
+    parser.add_argument('--fixed-concurrency', action='store_true',
+                        help="Mantener siempre --concurrency peticiones en curso en lugar de ajustarlas (AIMD)")
+    parser.add_argument('--format', choices=sorted(EXPORTERS), default='parquet',
+                        help="Formato de exportación (excel es el más lento y acumula todo en memoria)")
+    parser.add_argument('--output', default=None,
+                        help="Archivo de salida (por defecto frases_autores_detalles con la extensión del formato)")
+    args = parser.parse_args()
+    if args.replay and not args.store:
+        parser.error("--replay necesita --store")
+    configure_logging('scraper', level=args.log_level)
+
     base_url = "https://quotes.toscrape.com/"
-    scraper = Scraper(base_url)
-    
-    frases_df, tags_df = scraper.scrape_quotes()
-    
-    scraper.save_to_excel(frases_df, tags_df)
+    metrics = Metrics()
+    if args.replay:
+        transport = ReplayTransport(ResponseStore(args.store))
+    else:
+        transport = HttpTransport(pool_size=max(args.concurrency, 10), timeout=(5, args.timeout),
+                                  rate_limit=args.rate_limit)
+        limiter = None if args.fixed_concurrency else AdaptiveLimiter(max(args.concurrency, 1))
+        transport = ResilientTransport(transport, max_retries=args.http_retries, limiter=limiter, metrics=metrics)
+        if args.store:
+            transport = RecordingTransport(transport, ResponseStore(args.store))
+    frontier = None
+    if args.follow_links:
+        visited = BloomFilter(args.bloom_capacity) if args.bloom_capacity else None
+        frontier = CrawlFrontier(visited, max_retries=args.max_retries)
+    scraper = Scraper(base_url, concurrency=args.concurrency,
+                      author_cache=AuthorCache(path=args.author_cache), transport=transport,
+                      parser=args.parser, parse_workers=args.parse_workers, frontier=frontier, metrics=metrics)
+
+    # Las filas se exportan a medida que llega cada página
+    with get_exporter(args.format, args.output) as exporter:
+        if args.concurrency > 1:
+            asyncio.run(scraper.export_async(exporter))
+        else:
+            scraper.export(exporter)
@@ -0,0 +1,230 @@
+from abc import ABC, abstractmethod
+from urllib.parse import urldefrag, urljoin, urlsplit
+
+import lxml.etree
+
+from parsers import element_text, get_parser, html_document, xpath_has_class
+
+class SiteAdapter(ABC):
+    """
+    Describe cómo recorrer un sitio de frases: la URL de cada página del listado, cómo
+    extraer las frases de esa página y los detalles de un autor de su página propia.
+
+    Cada adaptador lleva también los límites de su dominio (`concurrency` peticiones
+    simultáneas y `rate_limit` peticiones por segundo), que el MultiSiteCrawler respeta
+    por separado para cada sitio.
+    """
+
+    name = None
+
+    def __init__(self, base_url, concurrency=8, rate_limit=None):
+        self.base_url = base_url
+        self.concurrency = concurrency
+        self.rate_limit = rate_limit
+
+    @property
+    def source(self):
+        """
+        Dominio del sitio; se guarda con cada frase como su fuente.
+        """
+        return urlsplit(self.base_url).netloc
+
+    @abstractmethod
+    def listing_url(self, page_number):
+        """
+        URL de la página `page_number` (empezando en 1) del listado de frases.
+        """
+
+    @abstractmethod
+    def quote_elements(self, html):
+        """
+        Devuelve los bloques de frase de una página del listado (vacío si no quedan más).
+        """
+
+    @abstractmethod
+    def parse_quote(self, element):
+        """
+        Devuelve `frase_texto`, `autor_nombre_completo`, `autor_url` (absoluta) y `tags`
+        de un bloque de frase. Lanza una excepción si el bloque está incompleto.
+        """
+
+    @abstractmethod
+    def parse_author_page(self, html):
+        """
+        Devuelve `author-born-date`, `author-born-location` y `author-description`.
+        """
+
+    def page_links(self, html, page_url):
+        """
+        Enlaces que seguir desde una página con frases, como pares `(tipo, url)`: 'next' para
+        la página siguiente y 'tag' para el listado de un tag. Por defecto ninguno.
+        """
+        return []
+
+    def has_next_page(self, html):
+        """
+        Indica si una página del listado enlaza a la siguiente, o None si el adaptador no lo sabe.
+        Con False el recorrido concurrente no adelanta descargas más allá de esa página.
+        """
+        return None
+
+    def _site_links(self, page_url, links):
+        # URLs absolutas, sin fragmento y solo del propio sitio
+        resolved = []
+        for kind, href in links:
+            url = urldefrag(urljoin(page_url, href.strip()))[0]
+            if urlsplit(url).netloc == self.source:
+                resolved.append((kind, url))
+        return resolved
+
+class QuotesToScrapeAdapter(SiteAdapter):
+    """
+    quotes.toscrape.com: listado en /page/N/ y el marcado que entienden los backends de parsers.py.
+    """
+
+    name = 'quotes.toscrape.com'
+
+    NEXT_LINK = lxml.etree.XPath(f"(//li[{xpath_has_class('next')}]/a/@href)[1]")
+    TAG_LINKS = lxml.etree.XPath(f"//a[{xpath_has_class('tag')}]/@href")
+
+    def __init__(self, base_url="https://quotes.toscrape.com/", concurrency=8, rate_limit=None, parser='lxml'):
+        super().__init__(base_url, concurrency, rate_limit)
+        self.parser = get_parser(parser)
+
+    def listing_url(self, page_number):
+        return f"{self.base_url}page/{page_number}/"
+
+    def quote_elements(self, html):
+        return self.parser.quote_elements(html)
+
+    def parse_quote(self, element):
+        return self.parser.parse_quote(element, self.base_url)
+
+    def parse_author_page(self, html):
+        return self.parser.parse_author_page(html)
+
+    def page_links(self, html, page_url):
+        document = html_document(html)
+        if document is None:
+            return []
+        links = [('next', href) for href in self.NEXT_LINK(document)]
+        links.extend(('tag', href) for href in self.TAG_LINKS(document))
+        return self._site_links(page_url, links)
+
+    def has_next_page(self, html):
+        document = html_document(html)
+        return document is not None and bool(self.NEXT_LINK(document))
+
+class XPathSiteAdapter(SiteAdapter):
+    """
+    Adaptador configurable para otros sitios: las expresiones XPath de `selectors` se evalúan
+    con lxml (las de la frase, relativas a cada bloque) y `listing_path` es la ruta de cada página
+    del listado con `{page}` como número de página (p. ej. 'quotes?page={page}').
+
+    Claves de `selectors`: 'quote', 'text', 'author', 'author_link' (elemento con el href del autor),
+    'tags', 'born_date', 'born_location' y 'description'. Las tres últimas son opcionales, igual
+    que 'next_link' y 'tag_links' (elementos con el href de la página siguiente y de los tags),
+    que se usan al seguir enlaces (ver frontier.py).
+    """
+
+    REQUIRED = ('quote', 'text', 'author', 'author_link', 'tags')
+
+    def __init__(self, name, base_url, listing_path, selectors, concurrency=8, rate_limit=None):
+        super().__init__(base_url, concurrency, rate_limit)
+        missing = [key for key in self.REQUIRED if key not in selectors]
+        if missing:
+            raise ValueError(f"Faltan selectores para {name}: {', '.join(missing)}")
+        self.name = name
+        self.listing_path = listing_path
+        self.expressions = dict(selectors)
+        self.selectors = self._compile(self.expressions)
+
+    @staticmethod
+    def _compile(expressions):
+        return {key: lxml.etree.XPath(expression) for key, expression in expressions.items()}
+
+    def __getstate__(self):
+        # Las expresiones compiladas no se pueden serializar (pool de procesos de ParsePool)
+        state = dict(self.__dict__)
+        del state['selectors']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.selectors = self._compile(self.expressions)
+
+    @staticmethod
+    def class_selector(tag, class_name, first=True, relative=True):
+        """
+        XPath de los elementos `tag` con la clase `class_name` (el primero si `first`).
+        """
+        expression = f"{'.' if relative else ''}//{tag}[{xpath_has_class(class_name)}]"
+        return f"({expression})[1]" if first else expression
+
+    def listing_url(self, page_number):
+        return urljoin(self.base_url, self.listing_path.format(page=page_number))
+
+    def _first_text(self, key, element):
+        found = self.selectors[key](element) if key in self.selectors else []
+        return element_text(found[0]).strip() if found else None
+
+    def quote_elements(self, html):
+        document = html_document(html)
+        return self.selectors['quote'](document) if document is not None else []
+
+    def parse_quote(self, element):
+        texto = self._first_text('text', element)
+        autor = self._first_text('author', element)
+        if not texto or not autor:
+            raise ValueError("Bloque de frase sin texto o sin autor")
+        href = self.selectors['author_link'](element)[0].attrib['href']
+
+        return {
+            'frase_texto': texto,
+            'autor_nombre_completo': autor,
+            'autor_url': urljoin(self.base_url, href),
+            'tags': [element_text(tag).strip() for tag in self.selectors['tags'](element)]
+        }
+
+    def parse_author_page(self, html):
+        document = html_document(html)
+        if document is None:
+            return {'author-born-date': '', 'author-born-location': '', 'author-description': ''}
+
+        return {
+            'author-born-date': self._first_text('born_date', document) or '',
+            'author-born-location': self._first_text('born_location', document) or '',
+            'author-description': self._first_text('description', document) or ''
+        }
+
+    def page_links(self, html, page_url):
+        document = html_document(html)
+        if document is None:
+            return []
+        links = []
+        for kind, key in (('next', 'next_link'), ('tag', 'tag_links')):
+            if key in self.selectors:
+                links.extend((kind, element.get('href')) for element in self.selectors[key](document)
+                             if element.get('href'))
+        return self._site_links(page_url, links)
+
+    def has_next_page(self, html):
+        if 'next_link' not in self.selectors:
+            return None
+        document = html_document(html)
+        return document is not None and bool(self.selectors['next_link'](document))
+
+# Sitios conocidos, por nombre. Otros sitios se recorren pasando su adaptador (p. ej. un XPathSiteAdapter)
+SITES = {
+    QuotesToScrapeAdapter.name: QuotesToScrapeAdapter,
+}
+
+def get_site(site, **options):
+    """
+    Devuelve un adaptador a partir de su nombre (ver SITES) o lo deja tal cual si ya es una instancia.
+    """
+    if not isinstance(site, str):
+        return site
+    if site not in SITES:
+        raise ValueError(f"Sitio desconocido: {site}")
+    return SITES[site](**options)
@@ -0,0 +1,74 @@
+import pandas as pd
+import pytest
+
+# El frontend necesita streamlit y sqlalchemy (requirements.txt)
+pytest.importorskip('streamlit')
+pytest.importorskip('sqlalchemy')
+from app import DataFetcher
+
+
+class RecordingConnector:
+    # Anota las consultas y devuelve un DataFrame por consulta, en orden
+    def __init__(self, *frames):
+        self.frames = list(frames)
+        self.queries = []
+
+    def fetch_data(self, query, params=None):
+        self.queries.append((' '.join(query.split()), params))
+        return self.frames.pop(0) if self.frames else pd.DataFrame()
+
+
+def test_statistics_are_read_from_the_materialized_views():
+    por_autor = pd.DataFrame({'full_name': ['Albert Einstein'], 'counts': [10]})
+    por_tag = pd.DataFrame({'tags': ['love'], 'counts': [14]})
+    totales = pd.DataFrame({'total_frases': [100], 'total_autores': [50], 'total_tags': [120]})
+    connector = RecordingConnector(por_autor, por_tag, totales)
+
+    result = DataFetcher(connector).get_statistics()
+
+    assert [query for query, _ in connector.queries] == [
+        "SELECT full_name, counts FROM mv_frases_por_autor ORDER BY full_name",
+        "SELECT tags, counts FROM mv_frases_por_tag ORDER BY tags",
+        "SELECT total_frases, total_autores, total_tags FROM mv_totales",
+    ]
+    assert result[0] is por_autor and result[1] is por_tag and result[2] is totales
+
+
+@pytest.mark.parametrize('text, pattern', [
+    ('Einstein', '%Einstein%'),
+    ('100%', '%100\\%%'),
+    ('a_b', '%a\\_b%'),
+    ('C:\\temp', '%C:\\\\temp%'),
+])
+def test_like_wildcards_in_the_search_text_are_escaped(text, pattern):
+    assert DataFetcher._contains_pattern(text) == pattern
+
+
+def test_searches_by_author_and_tag_use_an_escaped_ilike_pattern():
+    connector = RecordingConnector()
+    fetcher = DataFetcher(connector)
+
+    fetcher.get_quotes_by_author('Mark_Twain')
+    fetcher.get_quotes_by_tag('50%')
+
+    (author_query, author_params), (tag_query, tag_params) = connector.queries
+    # La expresión del nombre completo es la del índice de trigramas de autor
+    assert "WHERE (autor.autor_nombre || ' ' || autor.autor_apellido) ILIKE %(pattern)s" in author_query
+    assert author_params == {'pattern': '%Mark\\_Twain%'}
+    assert "WHERE tag.tag_texto ILIKE %(pattern)s" in tag_query
+    assert tag_params == {'pattern': '%50\\%%'}
+
+
+def test_ranked_search_combines_full_text_and_trigram_matches():
+    connector = RecordingConnector()
+
+    DataFetcher(connector).search('love & life', limit='5')
+
+    (query, params), = connector.queries
+    assert params == {'query': 'love & life', 'limit': 5}
+    assert "websearch_to_tsquery('english', %(query)s)" in query
+    assert "frase.frase_tsv @@ q.tsq" in query
+    # '%%' es el '%' literal del operador de trigramas con parámetros pyformat
+    assert "q.txt <%% (autor.autor_nombre || ' ' || autor.autor_apellido)" in query
+    assert "q.txt <%% tag.tag_texto" in query
+    assert query.endswith("ORDER BY ranked.score DESC, frase.frase_id")
@@ -0,0 +1,63 @@
+from unittest.mock import Mock
+from author_cache import AuthorCache
+
+DETAILS = {
+    'author-born-date': 'January 1, 1900',
+    'author-born-location': 'in Testland',
+    'author-description': 'Test author description.'
+}
+
+
+def test_disk_cache_is_reused_between_runs(tmp_path):
+    path = str(tmp_path / 'autores.sqlite')
+    fetch = Mock(return_value=DETAILS)
+
+    first_run = AuthorCache(path=path)
+    assert first_run.get_or_fetch('https://example.com/author/a', fetch) == DETAILS
+    first_run.close()
+
+    # Una nueva ejecución lee el autor del disco sin volver a descargarlo
+    second_run = AuthorCache(path=path)
+    assert second_run.get_or_fetch('https://example.com/author/a', fetch) == DETAILS
+    second_run.close()
+    assert fetch.call_count == 1
+
+
+def test_expired_and_evicted_entries(tmp_path):
+    path = str(tmp_path / 'autores.sqlite')
+
+    cache = AuthorCache(path=path, ttl=0)
+    cache.set('https://example.com/author/a', DETAILS)
+    cache.close()
+    assert AuthorCache(path=path, ttl=0).get('https://example.com/author/a') is None
+
+    cache = AuthorCache(path=path, max_entries=2)
+    for name in ('a', 'b', 'c'):
+        cache.set(f'https://example.com/author/{name}', DETAILS)
+    cache.close()
+
+    reopened = AuthorCache(path=path, max_entries=2)
+    assert reopened.get('https://example.com/author/a') is None
+    assert reopened.get('https://example.com/author/c') == DETAILS
+
+
+def test_memory_cache_keeps_the_most_recently_used_entries():
+    cache = AuthorCache(max_entries=2)
+    cache.set('https://example.com/author/a', DETAILS)
+    cache.set('https://example.com/author/b', DETAILS)
+    # Leer 'a' la marca como reciente: al añadir 'c' se descarta 'b'
+    assert cache.get('https://example.com/author/a') == DETAILS
+    cache.set('https://example.com/author/c', DETAILS)
+
+    assert len(cache._memory) == 2
+    assert cache.get('https://example.com/author/b') is None
+    assert cache.get('https://example.com/author/a') == DETAILS
+    assert cache.get('https://example.com/author/c') == DETAILS
+
+
+def test_failed_fetch_is_not_cached():
+    cache = AuthorCache()
+    fetch = Mock(side_effect=[None, DETAILS])
+
+    assert cache.get_or_fetch('https://example.com/author/a', fetch) is None
+    assert cache.get_or_fetch('https://example.com/author/a', fetch) == DETAILS
@@ -0,0 +1,12 @@
+import pytest
+from logging_config import configure_logging, shutdown_logging
+
+
+@pytest.fixture(autouse=True)
+def temp_log_dir(tmp_path_factory):
+    # El registro de las pruebas va a una carpeta temporal y no a logs/ del repositorio
+    log_dir = tmp_path_factory.mktemp('logs')
+    shutdown_logging()
+    configure_logging('scraper', log_dir=str(log_dir))
+    yield log_dir
+    shutdown_logging()
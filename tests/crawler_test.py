@@ -0,0 +1,94 @@
+import asyncio
+import pytest
+from crawler import MultiSiteCrawler
+from sites import QuotesToScrapeAdapter, SiteAdapter, XPathSiteAdapter, get_site
+from benchmarks.quotes_site import QuotesSite
+
+OTHER_SITE_HTML = """
+<html><body>
+    <article class="cita">
+        <p class="contenido"> “Una frase de otro sitio.” </p>
+        <a class="autor" href="/autores/ana-garcia">Ana García</a>
+        <ul><li class="etiqueta">vida</li><li class="etiqueta">amor</li></ul>
+    </article>
+    <article class="cita">
+        <p class="contenido">Sin autor</p>
+    </article>
+</body></html>
+"""
+
+OTHER_SELECTORS = {
+    'quote': XPathSiteAdapter.class_selector('article', 'cita', first=False, relative=False),
+    'text': XPathSiteAdapter.class_selector('p', 'contenido'),
+    'author': XPathSiteAdapter.class_selector('a', 'autor'),
+    'author_link': XPathSiteAdapter.class_selector('a', 'autor'),
+    'tags': XPathSiteAdapter.class_selector('li', 'etiqueta', first=False),
+    'born_date': "//time[@itemprop='birthDate']",
+}
+
+# Los selectores de quotes.toscrape.com, para recorrer la réplica local con un XPathSiteAdapter
+QUOTES_SELECTORS = {
+    'quote': XPathSiteAdapter.class_selector('div', 'quote', first=False, relative=False),
+    'text': XPathSiteAdapter.class_selector('span', 'text'),
+    'author': XPathSiteAdapter.class_selector('small', 'author'),
+    'author_link': "(.//a)[1]",
+    'tags': XPathSiteAdapter.class_selector('a', 'tag', first=False),
+    'born_date': XPathSiteAdapter.class_selector('span', 'author-born-date', relative=False),
+    'born_location': XPathSiteAdapter.class_selector('span', 'author-born-location', relative=False),
+    'description': XPathSiteAdapter.class_selector('div', 'author-description', relative=False),
+}
+
+
+def test_xpath_adapter_parses_other_markup():
+    site = XPathSiteAdapter('frases.example', 'https://frases.example/', 'lista?pagina={page}', OTHER_SELECTORS)
+
+    elements = site.quote_elements(OTHER_SITE_HTML)
+    frase = site.parse_quote(elements[0])
+
+    assert site.listing_url(3) == 'https://frases.example/lista?pagina=3'
+    assert site.source == 'frases.example'
+    assert frase == {
+        'frase_texto': '“Una frase de otro sitio.”',
+        'autor_nombre_completo': 'Ana García',
+        'autor_url': 'https://frases.example/autores/ana-garcia',
+        'tags': ['vida', 'amor']
+    }
+    with pytest.raises(ValueError):
+        site.parse_quote(elements[1])
+    assert site.parse_author_page('<html><time itemprop="birthDate">1900</time></html>')['author-born-date'] == '1900'
+
+
+def test_xpath_adapter_requires_selectors():
+    with pytest.raises(ValueError):
+        XPathSiteAdapter('frases.example', 'https://frases.example/', 'page/{page}/', {'quote': '//div'})
+
+
+def test_get_site():
+    assert isinstance(get_site('quotes.toscrape.com'), QuotesToScrapeAdapter)
+    with pytest.raises(ValueError):
+        get_site('desconocido.example')
+    # Un adaptador tiene que implementar el listado y el parseo de frases y autores
+    with pytest.raises(TypeError):
+        SiteAdapter('https://frases.example/')
+
+
+def test_crawls_sites_in_parallel_with_shared_tags():
+    with QuotesSite(pages=4, quotes_per_page=5, authors=4, tags=6, latency=0.05) as first, \
+            QuotesSite(pages=4, quotes_per_page=5, authors=4, tags=6, latency=0.05) as second:
+        sites = [
+            QuotesToScrapeAdapter(first.url, concurrency=1),
+            XPathSiteAdapter('replica', second.url, 'page/{page}/', QUOTES_SELECTORS, concurrency=1),
+        ]
+
+        crawler = MultiSiteCrawler(sites)
+        frases_df, tags_df = asyncio.run(crawler.scrape_quotes_async())
+
+    assert len(frases_df) == 40
+    assert set(frases_df['fuente']) == {site.source for site in sites}
+    # Los dos sitios usan los mismos tags: un único ID por tag
+    assert len(tags_df) == len(set(tags_df['tag_texto']))
+    by_source = frases_df.groupby('fuente')['Tags_IDs'].apply(lambda ids: sorted({i for l in ids for i in l}))
+    assert by_source.iloc[0] == by_source.iloc[1]
+    # Los dos sitios se recorren a la vez: hay peticiones a uno mientras otras al otro están en curso
+    assert any(start < other_end and other_start < end
+               for start, end in first.intervals for other_start, other_end in second.intervals)
@@ -0,0 +1,47 @@
+import asyncio
+import re
+from unittest.mock import AsyncMock, MagicMock
+from create_database import STATS_VIEWS, STATS_VIEWS_SQL, AsyncDatabaseManager, refresh_statistics
+
+
+def make_conn():
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    return conn
+
+
+def executed(conn):
+    return [' '.join(call.args[0].split()) for call in conn.execute.await_args_list]
+
+
+def test_refresh_statistics_does_not_block_readers():
+    conn = make_conn()
+
+    asyncio.run(refresh_statistics(conn))
+
+    assert executed(conn) == [f"REFRESH MATERIALIZED VIEW CONCURRENTLY {view}" for view in STATS_VIEWS]
+
+
+def test_every_statistics_view_has_a_unique_index():
+    # REFRESH ... CONCURRENTLY falla si la vista no tiene un índice único
+    unique_indexes = {match.group(1) for statement in STATS_VIEWS_SQL
+                      for match in [re.search(r"CREATE UNIQUE INDEX .* ON (\w+)", statement)] if match}
+
+    assert unique_indexes == set(STATS_VIEWS)
+
+
+def test_create_tables_creates_the_statistics_views():
+    conn = make_conn()
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+    manager = AsyncDatabaseManager('quotes_db', 'postgres', 'postgres', 'localhost', 5432, pool=pool)
+
+    asyncio.run(manager.create_tables())
+
+    statements = executed(conn)
+    for view in STATS_VIEWS:
+        assert any(statement.startswith(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {view} ") for statement in statements)
+    # Las vistas se crean después de las tablas que leen
+    assert statements.index(next(s for s in statements if 'MATERIALIZED VIEW' in s)) > \
+        statements.index(next(s for s in statements if s.startswith('CREATE TABLE IF NOT EXISTS frase_tag')))
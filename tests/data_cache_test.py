@@ -0,0 +1,72 @@
+from unittest.mock import MagicMock, Mock
+import psycopg2
+import data_cache
+from data_cache import CachedDataFetcher, DataChangeListener
+
+
+def make_fetcher():
+    data_fetcher = Mock()
+    data_fetcher.get_data.side_effect = lambda: object()
+    data_fetcher.get_quotes_by_tag.side_effect = lambda tag: [tag]
+    return data_fetcher
+
+
+def test_results_are_reused_until_version_changes():
+    data_fetcher = make_fetcher()
+    version = {'value': 1}
+    cache = CachedDataFetcher(data_fetcher, ttl=600, version_loader=lambda: version['value'],
+                              version_check_interval=0)
+
+    first = cache.get_data()
+    assert cache.get_data() is first
+    assert cache.get_quotes_by_tag('love') == ['love']
+    assert cache.get_quotes_by_tag('life') == ['life']
+    assert data_fetcher.get_data.call_count == 1
+    assert data_fetcher.get_quotes_by_tag.call_count == 2
+
+    # El actualizador incrementa la versión: la siguiente lectura vuelve a consultar
+    version['value'] = 2
+    assert cache.get_data() is not first
+    assert data_fetcher.get_data.call_count == 2
+
+
+def test_ttl_and_explicit_invalidation():
+    data_fetcher = make_fetcher()
+    cache = CachedDataFetcher(data_fetcher, ttl=0, version_loader=lambda: 1)
+
+    cache.get_data()
+    cache.get_data()
+    assert data_fetcher.get_data.call_count == 2
+
+    cache = CachedDataFetcher(data_fetcher, ttl=600, version_loader=lambda: 1, version_check_interval=600)
+    first = cache.get_data()
+    cache.invalidate(version=2)
+    assert cache.get_data() is not first
+
+
+def test_version_errors_fall_back_to_ttl():
+    data_fetcher = make_fetcher()
+    cache = CachedDataFetcher(data_fetcher, ttl=600, version_loader=Mock(side_effect=Exception("sin tabla")),
+                              version_check_interval=0)
+
+    assert cache.get_data() is cache.get_data()
+
+
+def test_listener_closes_the_connection_before_reconnecting(monkeypatch):
+    connections = []
+
+    def connect(dsn):
+        conn = MagicMock()
+        conn.cursor.return_value.__enter__.return_value.execute.side_effect = psycopg2.OperationalError('caída')
+        connections.append(conn)
+        if len(connections) == 3:
+            listener.stop()
+        return conn
+
+    monkeypatch.setattr(data_cache.psycopg2, 'connect', connect)
+    listener = DataChangeListener('dbname=citas', on_change=Mock(), poll_timeout=0)
+    listener.run()
+
+    # Cada intento fallido cierra su conexión antes del siguiente
+    assert len(connections) == 3
+    assert all(conn.close.call_count == 1 for conn in connections)
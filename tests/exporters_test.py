@@ -0,0 +1,107 @@
+import csv
+import gzip
+import json
+import os
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+import pytest
+from exporters import CsvExporter, ExcelExporter, ParquetExporter, get_exporter, tags_path
+from scraper import Scraper
+from transport import HttpTransport
+from benchmarks.quotes_site import QuotesSite
+
+
+def make_row(i):
+    return {
+        'frase_texto': f"Frase {i}",
+        'autor_nombre': 'Ana',
+        'autor_apellido': 'García López',
+        'autor_url': 'https://quotes.example/author/ana',
+        'autor_fecha_nac': 'January 1, 1900',
+        'autor_lugar_nac': 'in Madrid',
+        'autor_descripcion': '  Descripción.  ',
+        'Tags': ['vida', 'amor'][:i % 3],
+        'Tags_IDs': [1, 2][:i % 3],
+        'fuente': 'quotes.example',
+    }
+
+
+def test_parquet_is_written_in_chunks_with_list_columns(tmp_path):
+    filename = str(tmp_path / 'frases.parquet')
+    with ParquetExporter(filename, chunk_rows=2) as exporter:
+        exporter.write_rows([make_row(0), make_row(1), make_row(2)])
+        exporter.write_rows([make_row(3), make_row(4)])
+        exporter.write_tags({'vida': 1, 'amor': 2})
+
+    parquet = pq.ParquetFile(filename)
+    table = parquet.read()
+    assert parquet.metadata.num_row_groups == 2
+    assert table.schema.field('Tags_IDs').type.value_type == pa.int32()
+    assert table.column('Tags').to_pylist() == [[], ['vida'], ['vida', 'amor'], [], ['vida']]
+    assert table.column('autor_descripcion').to_pylist()[0] == 'Descripción.'
+    assert pd.read_parquet(tags_path(filename)).to_dict('records') == [
+        {'tag_texto': 'vida', 'tag_id': 1}, {'tag_texto': 'amor', 'tag_id': 2}]
+
+
+def test_csv_stores_lists_as_json(tmp_path):
+    filename = str(tmp_path / 'frases.csv.gz')
+    with CsvExporter(filename) as exporter:
+        exporter.write_rows([make_row(2)])
+        exporter.write_tags({'vida': 1, 'amor': 2})
+
+    with gzip.open(filename, 'rt', encoding='utf-8', newline='') as f:
+        rows = list(csv.DictReader(f))
+    assert json.loads(rows[0]['Tags']) == ['vida', 'amor']
+    assert json.loads(rows[0]['Tags_IDs']) == [1, 2]
+    assert rows[0]['autor_apellido'] == 'García López'
+    assert tags_path(filename).endswith('frases_tags.csv.gz')
+
+
+@pytest.mark.parametrize('exporter_class', [ParquetExporter, CsvExporter, ExcelExporter])
+def test_failed_export_leaves_no_partial_files(tmp_path, exporter_class):
+    filename = str(tmp_path / f"frases{exporter_class.extension}")
+    with open(filename, 'wb') as f:
+        f.write(b'exportacion anterior')
+
+    with pytest.raises(RuntimeError):
+        with exporter_class(filename) as exporter:
+            exporter.write_rows([make_row(1)])
+            exporter.write_tags({'vida': 1})
+            raise RuntimeError("recorrido interrumpido")
+
+    # El archivo anterior sigue intacto y no quedan archivos a medio escribir
+    assert sorted(os.listdir(tmp_path)) == [os.path.basename(filename)]
+    with open(filename, 'rb') as f:
+        assert f.read() == b'exportacion anterior'
+
+
+def test_excel_is_written_on_close(tmp_path):
+    filename = str(tmp_path / 'frases.xlsx')
+    with ExcelExporter(filename) as exporter:
+        exporter.write_rows([make_row(1), make_row(2)])
+        exporter.write_tags({'vida': 1, 'amor': 2})
+
+    assert sorted(os.listdir(tmp_path)) == ['frases.xlsx']
+    assert len(pd.read_excel(filename, sheet_name='Frases_Autores_Detalles')) == 2
+
+
+def test_get_exporter(tmp_path):
+    assert isinstance(get_exporter('excel', str(tmp_path / 'frases.xlsx')), ExcelExporter)
+    with pytest.raises(ValueError):
+        get_exporter('xml')
+
+
+def test_scraper_exports_while_crawling(tmp_path):
+    filename = str(tmp_path / 'frases.parquet')
+    with QuotesSite(pages=3, quotes_per_page=4, authors=5, tags=6) as site:
+        scraper = Scraper(site.url, transport=HttpTransport())
+        with ParquetExporter(filename) as exporter:
+            scraper.export(exporter)
+        expected_df, _ = Scraper(site.url, transport=HttpTransport()).scrape_quotes()
+
+    exported_df = pd.read_parquet(filename)
+    assert exporter.rows == 12
+    assert list(exported_df['frase_texto']) == list(expected_df['frase_texto'])
+    assert [list(ids) for ids in exported_df['Tags_IDs']] == list(expected_df['Tags_IDs'])
+    assert len(pd.read_parquet(tags_path(filename))) == len(scraper.tags_dict)
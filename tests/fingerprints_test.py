@@ -0,0 +1,116 @@
+import asyncio
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from author_cache import AuthorCache
+from fingerprints import PageFingerprints
+from frontier import CrawlFrontier
+from scraper import Scraper
+from transport import HttpTransport
+from benchmarks.quotes_site import QuotesSite
+
+
+def test_request_headers():
+    previous = PageFingerprints({
+        'https://quotes.example/page/1/': ('h1', None, ('"abc"', 'Mon, 05 Jan 2026 10:00:00 GMT')),
+        'https://quotes.example/page/2/': ('h2', None),
+        'https://quotes.example/author/ana': ('h3', {'author-born-date': ''}, (None, 'Tue, 06 Jan 2026 10:00:00 GMT')),
+    })
+
+    assert previous.request_headers('https://quotes.example/page/1/') == {
+        'If-None-Match': '"abc"', 'If-Modified-Since': 'Mon, 05 Jan 2026 10:00:00 GMT'}
+    assert previous.request_headers('https://quotes.example/page/2/') is None
+    # Sin datos guardados, un 304 no se podría resolver
+    assert previous.request_headers('https://quotes.example/page/1/', with_data=True) is None
+    assert previous.request_headers('https://quotes.example/author/ana', with_data=True) == {
+        'If-Modified-Since': 'Tue, 06 Jan 2026 10:00:00 GMT'}
+
+
+def test_stats_are_counted_from_many_threads():
+    fingerprints = PageFingerprints({'https://quotes.example/page/1/': ('h1', None)})
+    # Cambios de hilo muy frecuentes para que una actualización sin cerrojo perdiera cuentas
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        def work(_):
+            for _ in range(2000):
+                fingerprints.is_unchanged('https://quotes.example/page/1/', 'h1')
+                fingerprints.is_unchanged('https://quotes.example/page/1/', 'h2')
+                fingerprints.not_modified('https://quotes.example/page/1/')
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(work, range(8)))
+    finally:
+        sys.setswitchinterval(interval)
+
+    assert fingerprints.stats == {'changed': 8 * 2000, 'unchanged': 2 * 8 * 2000}
+
+
+def test_second_run_revalidates_with_304():
+    with QuotesSite(pages=4, quotes_per_page=5, authors=6, tags=6) as site:
+        first = Scraper(site.url, transport=HttpTransport(), fingerprints=PageFingerprints())
+        frases_df, _ = first.scrape_quotes()
+        first_bytes = site.bytes_sent
+
+        previous = PageFingerprints(first.fingerprints.changed)
+        second = Scraper(site.url, transport=HttpTransport(), fingerprints=previous)
+        assert list(second.iter_quotes()) == []
+        second_bytes = site.bytes_sent - first_bytes
+
+    assert len(frases_df) == 20
+    # Las 4 páginas con frases responden 304; la página vacía del final no tiene huella. Los 6 autores
+    # se revisan aparte (ninguna página procesada los nombra) y también responden 304
+    assert site.not_modified == 4 + 6
+    assert previous.stats['unchanged'] == 4 + 6
+    assert second.metrics.counter_value('scraper_http_requests_total', page_type='listing', status='304') == 4
+    assert second.metrics.counter_value('scraper_http_requests_total', page_type='author', status='304') == 6
+    # Solo se parsea la página vacía que termina el listado; ningún autor
+    parse = second.metrics.summary()['histograms']['scraper_parse_seconds']
+    assert list(parse) == ['page_type=listing']
+    assert parse['page_type=listing']['count'] == 1
+    assert second_bytes * 10 < first_bytes
+
+
+def test_author_change_is_found_when_only_the_author_page_changed():
+    author_cache = AuthorCache()
+    with QuotesSite(pages=2, quotes_per_page=4, authors=3, tags=6) as site:
+        first = Scraper(site.url, transport=HttpTransport(), author_cache=author_cache,
+                        fingerprints=PageFingerprints())
+        frases_df, _ = first.scrape_quotes()
+
+        site.site.author_details[2]['born_location'] = 'in Otra Ciudad'
+        previous = PageFingerprints(first.fingerprints.changed)
+        second = Scraper(site.url, transport=HttpTransport(), author_cache=author_cache, fingerprints=previous)
+        rows = list(second.iter_quotes())
+
+        # Actualización completa: el listado se procesa entero y la caché de antes no se usa
+        third = Scraper(site.url, transport=HttpTransport(), author_cache=author_cache, refresh_authors=True,
+                        fingerprints=PageFingerprints())
+        full_df, _ = third.scrape_quotes()
+
+    # Sin cambios en el listado, la página del autor se revisa directamente desde su huella
+    assert rows == []
+    autor_url, = second.author_updates
+    assert second.author_updates[autor_url]['author-born-location'] == 'in Otra Ciudad'
+    assert previous.changed[autor_url][1] == second.author_updates[autor_url]
+    assert set(frases_df['autor_lugar_nac']) != set(full_df['autor_lugar_nac'])
+    assert 'in Otra Ciudad' in set(full_df['autor_lugar_nac'])
+
+
+def test_frontier_reuses_links_after_304():
+    with QuotesSite(pages=4, quotes_per_page=5, authors=6, tags=3) as site:
+        first = Scraper(site.url, transport=HttpTransport(), fingerprints=PageFingerprints(),
+                        frontier=CrawlFrontier())
+        asyncio.run(first.scrape_quotes_async(concurrency=4))
+        pages_first = dict(site.requests)
+
+        # El sitio cambia una frase de la última página: solo esa página se vuelve a procesar
+        site.site.quotes[-1]['text'] = "“Una frase nueva.”"
+        previous = PageFingerprints(first.fingerprints.changed)
+        second = Scraper(site.url, transport=HttpTransport(), fingerprints=previous, frontier=CrawlFrontier())
+        frases_df, _ = asyncio.run(second.scrape_quotes_async(concurrency=4))
+
+    # Se visitan las mismas páginas que en la primera ejecución, aunque casi todas respondan 304
+    assert site.requests['listing'] == 2 * pages_first['listing']
+    assert site.requests['tag'] == 2 * pages_first['tag']
+    assert "“Una frase nueva.”" in set(frases_df['frase_texto'])
+    assert site.not_modified > 0
@@ -0,0 +1,135 @@
+import asyncio
+import requests
+from frontier import BloomFilter, CrawlFrontier, normalize_url
+from scraper import Scraper
+from sites import XPathSiteAdapter
+from transport import HttpTransport
+from benchmarks.quotes_site import QuotesSite
+from tests.crawler_test import QUOTES_SELECTORS
+
+
+class FlakyTransport(HttpTransport):
+    # Falla la primera petición de cada URL de `failing`
+    def __init__(self, failing):
+        super().__init__()
+        self.failing = set(failing)
+
+    def get(self, url, **kwargs):
+        if url in self.failing:
+            self.failing.discard(url)
+            raise requests.exceptions.ConnectionError(f"Conexión rechazada: {url}")
+        return super().get(url, **kwargs)
+
+
+def tag_pages(site):
+    # Páginas de tags que tiene el sitio sintético
+    synthetic = site.site
+    counts = [sum(tag in quote['tags'] for quote in synthetic.quotes) for tag in synthetic.tag_names]
+    return sum(-(-count // synthetic.quotes_per_page) for count in counts)
+
+
+def test_frontier_deduplicates_and_prioritizes():
+    frontier = CrawlFrontier()
+
+    assert frontier.add('https://Quotes.example/tag/vida/page/1/', 'tag')
+    assert frontier.add('https://quotes.example/page/2/')
+    assert not frontier.add('https://quotes.example/page/2/#arriba')
+    assert not frontier.add('HTTPS://QUOTES.EXAMPLE/tag/vida/page/1/', 'tag')
+
+    assert frontier.pop() == ('https://quotes.example/page/2/', 'listing')
+    assert frontier.pop() == ('https://quotes.example/tag/vida/page/1/', 'tag')
+    assert frontier.pop() is None
+    assert normalize_url('https://quotes.example') == 'https://quotes.example/'
+
+
+def test_frontier_retry_accounting():
+    now = [0.0]
+    frontier = CrawlFrontier(max_retries=2, backoff=1.0, clock=lambda: now[0])
+    frontier.add('https://quotes.example/page/1/')
+    url, kind = frontier.pop()
+
+    # Cada reintento espera el doble que el anterior antes de volver a salir
+    assert frontier.retry(url, kind, 'timeout')
+    assert frontier.pop() is None
+    assert frontier.wait_time() == 1.0
+    now[0] = 1.0
+    assert frontier.pop() == (url, kind)
+    assert frontier.retry(url, kind, 'timeout')
+    assert frontier.stats()['pending'] == 1
+    now[0] = 2.5
+    assert frontier.pop() is None
+    assert frontier.wait_time() == 0.5
+    now[0] = 3.0
+    assert frontier.pop() == (url, kind)
+    assert not frontier.retry(url, kind, 'timeout')
+    assert frontier.pop() is None
+    assert frontier.failed == {url: 'timeout'}
+    # Un error permanente no se reintenta
+    assert not frontier.retry('https://quotes.example/page/9/', 'listing', '404', permanent=True)
+    assert frontier.stats() == {'pending': 0, 'seen': 1, 'retries': 2, 'failed': 2}
+
+
+def test_bloom_filter():
+    bloom = BloomFilter(2000, error_rate=0.01)
+    urls = [f"https://quotes.example/page/{i}/" for i in range(2000)]
+    for url in urls:
+        bloom.add(url)
+
+    assert all(url in bloom for url in urls)
+    false_positives = sum(f"https://quotes.example/tag/{i}/" in bloom for i in range(10000))
+    assert false_positives < 300
+    assert len(bloom) == 2000
+
+
+def test_follows_links_without_fetching_twice():
+    with QuotesSite(pages=4, quotes_per_page=5, authors=4, tags=6) as site:
+        scraper = Scraper(site.url, transport=HttpTransport(), frontier=CrawlFrontier())
+        frases_df, tags_df = scraper.scrape_quotes()
+
+        assert len(frases_df) == 20
+        assert frases_df['frase_texto'].is_unique
+        # Sin la página vacía del final del listado y cada página de tag una sola vez
+        assert site.requests['listing'] == 4
+        assert site.requests['tag'] == tag_pages(site)
+        assert site.requests['author'] == 4
+
+
+def test_concurrent_crawl_with_bloom_filter():
+    with QuotesSite(pages=6, quotes_per_page=5, authors=4, tags=6) as site:
+        expected_df, _ = Scraper(site.url, transport=HttpTransport()).scrape_quotes()
+        scraper = Scraper(site.url, transport=HttpTransport(), frontier=CrawlFrontier(BloomFilter(1000)))
+        frases_df, _ = asyncio.run(scraper.scrape_quotes_async(concurrency=4))
+
+        assert sorted(frases_df['frase_texto']) == sorted(expected_df['frase_texto'])
+        assert site.requests['listing'] == 7 + 6
+
+
+def test_failed_page_is_retried_without_stopping_the_crawl():
+    with QuotesSite(pages=3, quotes_per_page=5, authors=4, tags=6) as site:
+        transport = FlakyTransport([site.url + 'page/2/'])
+        scraper = Scraper(site.url, transport=transport, frontier=CrawlFrontier(backoff=0.05))
+        frases_df, _ = asyncio.run(scraper.scrape_quotes_async(concurrency=2))
+        sync_scraper = Scraper(site.url, transport=FlakyTransport([site.url + 'page/2/']),
+                               frontier=CrawlFrontier(backoff=0.05))
+        sync_frases_df, _ = sync_scraper.scrape_quotes()
+
+    assert len(frases_df) == 15
+    assert scraper.metrics.counter_value('scraper_retries_total', page_type='listing') == 1
+    assert scraper.frontier.failed == {}
+    assert sorted(sync_frases_df['frase_texto']) == sorted(frases_df['frase_texto'])
+
+
+def test_xpath_adapter_links():
+    selectors = dict(QUOTES_SELECTORS, next_link="//li[@class='next']/a",
+                     tag_links=XPathSiteAdapter.class_selector('a', 'tag', first=False, relative=False))
+    site = XPathSiteAdapter('replica', 'https://replica.example/', 'page/{page}/', selectors)
+    html = """
+        <a class="tag" href="/tag/vida/page/1/">vida</a>
+        <a class="tag" href="https://otro.example/tag/amor/">amor</a>
+        <li class="next"><a href="/page/3/#inicio">Next</a></li>
+    """
+
+    assert site.page_links(html, 'https://replica.example/page/2/') == [
+        ('next', 'https://replica.example/page/3/'),
+        ('tag', 'https://replica.example/tag/vida/page/1/'),
+    ]
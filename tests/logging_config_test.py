@@ -0,0 +1,63 @@
+import json
+import logging
+import logging.handlers
+import os
+from unittest.mock import Mock
+import pytest
+from logging_config import configure_logging, shutdown_logging
+from scraper import Scraper
+from tests.scraper_test import fake_site
+
+
+@pytest.fixture
+def log_dir(tmp_path):
+    # Cada prueba parte de un logging sin configurar y escribe en su propia carpeta
+    shutdown_logging()
+    configure_logging('scraper', log_dir=str(tmp_path), level='INFO')
+    yield tmp_path
+    shutdown_logging()
+
+
+def read_records(log_dir):
+    shutdown_logging()
+    with open(os.path.join(log_dir, 'scraper.log'), encoding='utf-8') as f:
+        return [json.loads(line) for line in f]
+
+
+def queue_handlers():
+    return [h for h in logging.getLogger('scraper').handlers if isinstance(h, logging.handlers.QueueHandler)]
+
+
+def test_configured_once(log_dir):
+    configure_logging('scraper', log_dir=str(log_dir))
+    for _ in range(3):
+        Scraper("https://quotes.toscrape.com/", transport=Mock())
+
+    assert len(queue_handlers()) == 1
+
+
+def test_structured_records(log_dir):
+    logging.getLogger('scraper').info("Página procesada: %s", 'page/1/', extra={'page_url': 'page/1/', 'frases': 10})
+
+    records = read_records(log_dir)
+
+    assert records[0]['message'] == "Página procesada: page/1/"
+    assert records[0]['level'] == 'INFO'
+    assert records[0]['page_url'] == 'page/1/'
+    assert records[0]['frases'] == 10
+
+
+def test_page_summary_instead_of_item_lines(log_dir):
+    transport = Mock()
+    transport.get.side_effect = fake_site
+
+    list(Scraper("https://quotes.toscrape.com/", transport=transport).iter_quotes())
+
+    records = read_records(log_dir)
+    messages = [r['message'] for r in records]
+    # El detalle de cada frase queda en DEBUG; a INFO solo llega el resumen de la página
+    assert not any(m.startswith("Frase obtenida") for m in messages)
+    summaries = [r for r in records if r.get('page_url')]
+    assert len(summaries) == 1
+    assert summaries[0]['frases'] == 1
+    assert summaries[0]['filas'] == 1
@@ -0,0 +1,90 @@
+import asyncio
+import json
+import os
+from unittest.mock import Mock
+from metrics import Metrics, write_run_summary
+from scraper import Scraper
+from tests.scraper_test import fake_site
+from tests.save_data_to_db_test import ROW, make_saver
+
+
+def test_counters_and_histograms():
+    metrics = Metrics(buckets=(0.1, 1))
+    metrics.inc('scraper_http_requests_total', page_type='listing', status='200')
+    metrics.inc('scraper_http_requests_total', 2, page_type='listing', status='200')
+    metrics.observe('scraper_parse_seconds', 0.05, page_type='listing')
+    metrics.observe('scraper_parse_seconds', 0.5, page_type='listing')
+
+    assert metrics.counter_value('scraper_http_requests_total', page_type='listing', status='200') == 3
+    summary = metrics.summary()
+    parse = summary['histograms']['scraper_parse_seconds']['page_type=listing']
+    assert parse['count'] == 2
+    assert parse['p50'] == 0.1
+    assert parse['p95'] == 1
+
+
+def test_render_prometheus():
+    metrics = Metrics(buckets=(0.1, 1))
+    metrics.inc('saver_rows_total', 5, table='frase', result='inserted')
+    metrics.observe('saver_transaction_seconds', 0.2, mode='batch')
+
+    text = metrics.render_prometheus()
+
+    assert '# TYPE saver_rows_total counter' in text
+    assert 'saver_rows_total{result="inserted",table="frase"} 5' in text
+    assert 'saver_transaction_seconds_bucket{mode="batch",le="0.1"} 0' in text
+    assert 'saver_transaction_seconds_bucket{mode="batch",le="1"} 1' in text
+    assert 'saver_transaction_seconds_bucket{mode="batch",le="+Inf"} 1' in text
+    assert 'saver_transaction_seconds_count{mode="batch"} 1' in text
+
+
+def test_merge_accumulates_runs():
+    total = Metrics()
+    for _ in range(2):
+        run = Metrics()
+        run.inc('updater_runs_total', outcome='ok')
+        run.observe('updater_stage_seconds', 1.5, stage='total')
+        total.merge(run)
+
+    assert total.counter_value('updater_runs_total', outcome='ok') == 2
+    assert total.summary()['histograms']['updater_stage_seconds']['stage=total']['sum'] == 3.0
+
+
+def test_scraper_records_requests_and_parse_time():
+    transport = Mock()
+    transport.get.side_effect = fake_site
+    scraper = Scraper("https://quotes.toscrape.com/", transport=transport)
+
+    list(scraper.iter_quotes())
+
+    metrics = scraper.metrics
+    assert metrics.counter_value('scraper_http_requests_total', page_type='listing', status='200') == 2
+    assert metrics.counter_value('scraper_http_requests_total', page_type='author', status='200') == 1
+    histograms = metrics.summary()['histograms']
+    assert histograms['scraper_parse_seconds']['page_type=listing']['count'] == 2
+    assert histograms['scraper_http_request_seconds']['page_type=author,status=200']['count'] == 1
+
+
+def test_saver_records_rows_and_transactions():
+    saver, conn = make_saver('batch')
+
+    asyncio.run(saver.save_stream([[ROW]]))
+
+    metrics = saver.metrics
+    assert metrics.counter_value('saver_quotes_total', mode='batch') == 1
+    assert metrics.counter_value('saver_rows_total', table='autor', result='updated') == 1
+    assert metrics.counter_value('saver_rows_total', table='frase', result='unchanged') == 1
+    assert metrics.summary()['histograms']['saver_transaction_seconds']['mode=batch']['count'] == 1
+
+
+def test_write_run_summary(tmp_path):
+    metrics = Metrics()
+    metrics.inc('updater_runs_total', outcome='ok')
+    path = os.path.join(tmp_path, 'run.json')
+
+    write_run_summary(path, metrics, outcome='ok', frases=10)
+
+    with open(path, encoding='utf-8') as f:
+        summary = json.load(f)
+    assert summary['frases'] == 10
+    assert summary['metrics']['counters']['updater_runs_total'] == {'outcome=ok': 1}
@@ -0,0 +1,94 @@
+import asyncio
+import gc
+import os
+import pickle
+import time
+import parse_pool
+from scraper import Scraper
+from sites import XPathSiteAdapter
+from benchmarks.quotes_site import QuotesSite
+from tests.crawler_test import QUOTES_SELECTORS
+
+
+_parse_listing = parse_pool._parse_listing
+
+
+def _parse_listing_with_pid(html):
+    # Solo para las pruebas: añade a cada frase un tag con el PID del proceso que la parseó
+    frases, errors = _parse_listing(html)
+    return [frase[:3] + (frase[3] + (f'pid-{os.getpid()}',),) for frase in frases], errors
+
+
+def crawl(url, concurrency=4, **options):
+    scraper = Scraper(url, concurrency=concurrency, **options)
+    frases_df, tags_df = asyncio.run(scraper.scrape_quotes_async())
+    return frases_df.sort_values('frase_texto').reset_index(drop=True), tags_df
+
+
+def test_process_pool_gives_same_rows():
+    with QuotesSite(pages=5, quotes_per_page=6, authors=8, tags=10) as site:
+        expected_df, expected_tags = crawl(site.url)
+        frases_df, tags_df = crawl(site.url, parse_workers=2)
+
+    assert len(frases_df) == 30
+    assert frases_df.to_dict('records') == expected_df.to_dict('records')
+    assert sorted(tags_df['tag_texto']) == sorted(expected_tags['tag_texto'])
+
+
+def test_listing_pages_are_parsed_in_worker_processes(monkeypatch):
+    monkeypatch.setattr(parse_pool, '_parse_listing', _parse_listing_with_pid)
+    with QuotesSite(pages=5, quotes_per_page=6, authors=8, tags=10) as site:
+        frases_df, tags_df = crawl(site.url, parse_workers=2)
+
+    assert len(frases_df) == 30
+    pids = {int(tag[len('pid-'):]) for tag in tags_df['tag_texto'] if tag.startswith('pid-')}
+    # Las páginas se parsearon en los procesos del pool, no en el proceso principal
+    assert pids
+    assert os.getpid() not in pids
+
+
+def test_next_listing_block_is_discarded_cleanly(caplog):
+    with QuotesSite(pages=3, quotes_per_page=6, authors=8, tags=10) as site:
+        frases_df, _ = crawl(site.url)
+    gc.collect()
+
+    # Las descargas adelantadas tras el final del listado se cancelan sin errores sin recoger
+    assert len(frases_df) == 18
+    assert [record.getMessage() for record in caplog.records if record.name == 'asyncio'] == []
+
+
+def test_short_page_stops_prefetching():
+    with QuotesSite(pages=4, quotes_per_page=6, authors=8, tags=10) as site:
+        del site.site.quotes[-2:]
+        # Sin selector del enlace 'Next' el final solo se conoce por la página corta
+        adapter = XPathSiteAdapter('replica', site.url, 'page/{page}/', QUOTES_SELECTORS)
+        frases_df, _ = crawl(site.url, site=adapter, concurrency=2)
+
+    # Bloques de 2 páginas: 1-2, 3-4 y, tras la página 4 (corta), solo la 5 para confirmar el final
+    assert len(frases_df) == 22
+    assert site.requests['listing'] == 5
+
+
+def test_stopping_early_does_not_wait_for_pending_downloads():
+    async def first_page(scraper):
+        rows = scraper.aiter_quotes()
+        async for first in rows:
+            break
+        started = time.perf_counter()
+        await rows.aclose()
+        return first, time.perf_counter() - started
+
+    with QuotesSite(pages=6, quotes_per_page=2, authors=4, tags=4, latency=0.5) as site:
+        first, closing = asyncio.run(first_page(Scraper(site.url, concurrency=2)))
+
+    # El bloque siguiente sigue descargándose en sus hilos, pero el cierre no lo espera
+    assert len(first) == 2
+    assert closing < 0.25
+
+
+def test_xpath_adapter_can_be_pickled():
+    site = XPathSiteAdapter('replica', 'https://replica.example/', 'page/{page}/', QUOTES_SELECTORS)
+    copy = pickle.loads(pickle.dumps(site))
+
+    html = '<div class="quote"><span class="text">Hola</span><small class="author">Ana</small><a href="/author/ana">(about)</a></div>'
+    assert copy.parse_quote(copy.quote_elements(html)[0]) == site.parse_quote(site.quote_elements(html)[0])
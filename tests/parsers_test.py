@@ -0,0 +1,109 @@
+import pytest
+from unittest.mock import Mock
+from scraper import Scraper
+from parsers import LxmlParser, SoupParser, get_parser
+import os
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+BASE_URL = "https://quotes.toscrape.com/"
+
+QUOTES_FIXTURES = ['quotes_page_1.html', 'quotes_page_edge.html']
+AUTHOR_FIXTURES = ['author_albert_einstein.html', 'author_incomplete.html']
+
+
+def read_fixture(name):
+    with open(os.path.join(FIXTURES_DIR, name), encoding='utf-8') as f:
+        return f.read()
+
+
+def make_scraper(parser, site=None):
+    transport = Mock()
+    if site is not None:
+        transport.get.side_effect = site
+    return Scraper(BASE_URL, transport=transport, parser=parser)
+
+
+@pytest.mark.parametrize('fixture', QUOTES_FIXTURES)
+def test_quotes_page_equivalence(fixture):
+    html = read_fixture(fixture)
+
+    reference = make_scraper('soup')._parse_quotes_page(html)
+    fast = make_scraper('lxml')._parse_quotes_page(html)
+
+    assert reference
+    assert fast == reference
+
+
+@pytest.mark.parametrize('fixture', AUTHOR_FIXTURES + ['quotes_page_1.html'])
+def test_author_page_equivalence(fixture):
+    html = read_fixture(fixture)
+
+    assert LxmlParser().parse_author_page(html) == SoupParser().parse_author_page(html)
+
+
+@pytest.mark.parametrize('html', ['', '   ', '<html></html>'])
+def test_empty_pages_equivalence(html):
+    assert make_scraper('lxml')._parse_quotes_page(html) == make_scraper('soup')._parse_quotes_page(html) == []
+    assert LxmlParser().parse_author_page(html) == SoupParser().parse_author_page(html)
+
+
+def test_quotes_page_values():
+    frases = make_scraper('lxml')._parse_quotes_page(read_fixture('quotes_page_1.html'))
+
+    assert len(frases) == 4
+    assert frases[0]['autor_nombre_completo'] == 'Albert Einstein'
+    assert frases[0]['autor_url'] == BASE_URL + '/author/Albert-Einstein'
+    # Los tags de la barra lateral no pertenecen a ninguna frase
+    assert frases[0]['tags'] == ['change', 'deep-thoughts', 'thinking', 'world']
+    assert all(type(frase['frase_texto']) is str for frase in frases)
+
+
+def test_malformed_quote_is_skipped():
+    frases = make_scraper('lxml')._parse_quotes_page(read_fixture('quotes_page_edge.html'))
+
+    assert [frase['autor_nombre_completo'].split() for frase in frases] == [
+        ['Dr.', 'Seuss'], ['Albert', 'Einstein'], ['Gabriel', 'García', 'Márquez']]
+    assert frases[0]['tags'] == []
+    assert frases[1]['tags'] == ['adulthood', 'success', 'value']
+
+
+def fixture_site(url):
+    # Dos páginas del listado guardadas y las páginas de autores; el resto vienen vacías
+    mock_response = Mock()
+    mock_response.status_code = 200
+    if '/author/' in url:
+        name = 'author_albert_einstein.html' if 'Einstein' in url else 'author_incomplete.html'
+        mock_response.text = read_fixture(name)
+    elif url.endswith('page/1/'):
+        mock_response.text = read_fixture('quotes_page_1.html')
+    elif url.endswith('page/2/'):
+        mock_response.text = read_fixture('quotes_page_edge.html')
+    else:
+        mock_response.text = "<html></html>"
+    return mock_response
+
+
+def test_scraped_rows_equivalence():
+    reference = list(make_scraper('soup', fixture_site).iter_quotes())
+    fast = list(make_scraper('lxml', fixture_site).iter_quotes())
+
+    # Mismas filas completas (frase, autor, detalles y tags con sus IDs) página a página
+    assert len(reference) == 2
+    assert fast == reference
+
+
+def test_get_parser():
+    assert isinstance(get_parser('lxml'), LxmlParser)
+    assert isinstance(get_parser('soup'), SoupParser)
+    parser = SoupParser()
+    assert get_parser(parser) is parser
+    with pytest.raises(ValueError):
+        get_parser('html5lib')
+
+
+def test_text_extraction_matches_beautifulsoup():
+    # Espacios, comentarios, scripts y <pre>: get_text() de BeautifulSoup tiene reglas propias
+    html = ('<div class="author-description"> \n <p>a</p> <script>x=1</script><style>s</style>'
+            '<!-- c --> <pre>  \n <b> </b></pre><textarea> </textarea>  t \xa0</div>')
+
+    assert LxmlParser().parse_author_page(html) == SoupParser().parse_author_page(html)
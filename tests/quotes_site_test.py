@@ -0,0 +1,40 @@
+import asyncio
+from scraper import Scraper
+from transport import HttpTransport
+from benchmarks.quotes_site import QuotesSite, SyntheticSite
+
+
+def test_synthetic_site_pages():
+    site = SyntheticSite(pages=2, quotes_per_page=3, authors=2, tags=5)
+
+    assert site.listing_page(1).count('class="quote"') == 3
+    assert 'No quotes found!' in site.listing_page(3)
+    assert 'author-born-date' in site.author_page('Nombre1-Apellido1')
+    assert site.author_page('Nadie') is None
+
+
+def test_scraper_crawls_local_site():
+    with QuotesSite(pages=3, quotes_per_page=4, authors=5, tags=6) as site:
+        frases_df, tags_df = Scraper(site.url, transport=HttpTransport()).scrape_quotes()
+        async_df, _ = asyncio.run(
+            Scraper(site.url, transport=HttpTransport()).scrape_quotes_async(concurrency=4)
+        )
+
+    assert len(frases_df) == 12
+    assert len(async_df) == 12
+    assert set(frases_df['autor_apellido']) == {f"Apellido{i}" for i in range(5)}
+    assert frases_df.iloc[0]['autor_fecha_nac'] == 'January 1, 1800'
+    # Cada autor se descarga una sola vez por ejecución del scraper
+    assert site.requests['author'] == 10
+
+
+def test_no_listing_pages_are_prefetched_past_the_last_one():
+    for parse_workers in (0, 2):
+        with QuotesSite(pages=4, quotes_per_page=3, authors=5, tags=6) as site:
+            frases_df, _ = asyncio.run(
+                Scraper(site.url, parse_workers=parse_workers).scrape_quotes_async(concurrency=4)
+            )
+
+        # La página 4 no enlaza a la siguiente: no se piden las páginas 5 a 8
+        assert len(frases_df) == 12
+        assert site.requests['listing'] == 4
@@ -0,0 +1,195 @@
+import asyncio
+import os
+import signal
+from unittest.mock import AsyncMock, MagicMock
+import update_database
+from author_cache import AuthorCache
+from fingerprints import PageFingerprints
+from recrawl import REFRESH_CHANNEL, RecrawlSchedule
+from scraper import Scraper
+from transport import HttpTransport
+from update_database import DatabaseUpdater
+from benchmarks.quotes_site import QuotesSite
+
+HOUR = 3600
+DAY = 24 * HOUR
+INTERVALS = {'listing': (HOUR, 8 * HOUR, 2 * HOUR), 'author': (DAY, 30 * DAY, 7 * DAY)}
+
+
+class Clock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+def test_interval_adapts_to_how_often_the_page_changes():
+    clock = Clock()
+    schedule = RecrawlSchedule(intervals=INTERVALS, clock=clock)
+    url = 'https://quotes.example/page/1/'
+
+    assert schedule.is_due(url)
+    schedule.observe(url, changed=True)
+    assert schedule.next_check(url) == clock.now + 2 * HOUR
+    assert not schedule.is_due(url)
+
+    # Sin cambios el intervalo se duplica hasta el máximo; con cambios se divide hasta el mínimo
+    for _ in range(5):
+        schedule.observe(url, changed=False)
+    assert schedule.entries[url][2] == 8 * HOUR
+    for _ in range(5):
+        schedule.observe(url, changed=True)
+    assert schedule.entries[url][2] == HOUR
+    assert schedule.entries[url][3:] == (11, 6)
+
+    clock.now += HOUR
+    assert schedule.is_due(url)
+    assert RecrawlSchedule(schedule.entries, force=True, clock=clock).is_due('https://quotes.example/page/1/')
+
+
+def test_author_pages_use_their_own_intervals():
+    schedule = RecrawlSchedule(intervals=INTERVALS, clock=Clock())
+    url = 'https://quotes.example/author/ana'
+
+    schedule.is_due(url, 'author')
+    schedule.observe(url, changed=True)
+    schedule.observe(url, changed=False)
+
+    assert schedule.updated[url][0] == 'author'
+    assert schedule.updated[url][2] == 14 * DAY
+
+
+def test_pages_that_are_not_due_are_not_requested():
+    clock = Clock()
+    with QuotesSite(pages=3, quotes_per_page=5, authors=4, tags=6) as site:
+        first = Scraper(site.url, transport=HttpTransport(),
+                        fingerprints=PageFingerprints(schedule=RecrawlSchedule(intervals=INTERVALS, clock=clock)))
+        frases_df, _ = first.scrape_quotes()
+        requests_first = dict(site.requests)
+
+        # Una hora después no toca ninguna página con huella: solo se pide la página vacía del final
+        clock.now += HOUR
+        schedule = RecrawlSchedule(first.fingerprints.schedule.entries, intervals=INTERVALS, clock=clock)
+        second = Scraper(site.url, transport=HttpTransport(),
+                         fingerprints=PageFingerprints(first.fingerprints.changed, schedule))
+        assert list(second.iter_quotes()) == []
+        assert site.requests['listing'] == requests_first['listing'] + 1
+        assert site.requests['author'] == requests_first['author']
+        assert second.metrics.counter_value('scraper_recrawl_skipped_total', page_type='listing') == 3
+
+        # Pasado el intervalo del listado se revisan sus páginas, pero no las biografías
+        site.site.quotes[-1]['text'] = "“Una frase nueva.”"
+        clock.now += 2 * HOUR
+        schedule = RecrawlSchedule(schedule.entries, intervals=INTERVALS, clock=clock)
+        third = Scraper(site.url, transport=HttpTransport(),
+                        fingerprints=PageFingerprints(first.fingerprints.changed, schedule))
+        rows = [row for page in third.iter_quotes() for row in page]
+
+    assert len(frases_df) == 15
+    assert [row['frase_texto'] for row in rows] == list(frases_df['frase_texto'][10:14]) + ["“Una frase nueva.”"]
+    assert site.requests['author'] == requests_first['author']
+    # La página que cambió vuelve antes; las que no, más tarde
+    last_page = site.url + 'page/3/'
+    assert schedule.entries[last_page][2] == HOUR
+    assert schedule.entries[site.url + 'page/1/'][2] == 4 * HOUR
+
+
+def test_forced_run_picks_up_an_author_that_changed_behind_an_unchanged_listing():
+    clock = Clock()
+    author_cache = AuthorCache()
+    with QuotesSite(pages=2, quotes_per_page=4, authors=3, tags=6) as site:
+        first = Scraper(site.url, transport=HttpTransport(), author_cache=author_cache,
+                        fingerprints=PageFingerprints(schedule=RecrawlSchedule(intervals=INTERVALS, clock=clock)))
+        first.scrape_quotes()
+        requests_first = dict(site.requests)
+
+        # Cambia solo la página de un autor; el listado sigue igual y su caché aún está vigente
+        site.site.author_details[1]['description'] = 'Biografía revisada.'
+        schedule = RecrawlSchedule(first.fingerprints.schedule.entries, intervals=INTERVALS, force=True,
+                                   clock=clock)
+        second = Scraper(site.url, transport=HttpTransport(), author_cache=author_cache, refresh_authors=True,
+                         fingerprints=PageFingerprints(first.fingerprints.changed, schedule))
+        frases_df, _ = asyncio.run(second.scrape_quotes_async(concurrency=4))
+
+    assert frases_df.empty
+    # Se piden de nuevo los tres autores (condicionales: dos responden 304) sin pasar por la caché
+    assert site.requests['author'] == requests_first['author'] + 3
+    autor_url, = second.author_updates
+    assert autor_url.endswith('/author/Nombre1-Apellido1')
+    assert second.author_updates[autor_url]['author-description'].strip() == 'Biografía revisada.'
+    assert author_cache.get(autor_url) == second.author_updates[autor_url]
+
+
+def test_refresh_requests_during_a_run_are_coalesced():
+    updater = DatabaseUpdater('quotes_db', 'postgres', 'postgres', 'localhost', 5432)
+    runs = []
+
+    async def run_update(force=False):
+        runs.append(force)
+        await asyncio.sleep(0.01)
+
+    updater._run_update = run_update
+
+    async def main():
+        first = asyncio.ensure_future(updater.update_database())
+        await asyncio.sleep(0)
+        # Una ejecución programada que coincide se omite; varias peticiones de "ahora" se agrupan
+        await updater.update_database()
+        await updater.update_database(force=True)
+        await updater.update_database(force=True)
+        await first
+
+    asyncio.run(main())
+    assert runs == [False, True]
+
+
+def make_listener():
+    conn = MagicMock()
+    conn.add_listener = AsyncMock()
+    conn.close = AsyncMock()
+    return conn
+
+
+def test_notify_and_sigusr1_request_a_refresh_on_a_dedicated_connection(monkeypatch):
+    pool = MagicMock()
+    pool.close = AsyncMock()
+    updater = DatabaseUpdater('quotes_db', 'postgres', 'postgres', 'localhost', 5432, pool=pool)
+    updater._run_update = AsyncMock()
+    first, second = make_listener(), make_listener()
+    connect = AsyncMock(side_effect=[first, ConnectionRefusedError("sin servidor"), second])
+    monkeypatch.setattr(update_database.asyncpg, 'connect', connect)
+    monkeypatch.setattr(DatabaseUpdater, 'LISTEN_RETRY_DELAY', 0)
+
+    async def main():
+        await updater.listen_for_refresh()
+        # LISTEN va en una conexión propia, no en una del pool
+        assert connect.await_args.kwargs['database'] == 'quotes_db'
+        pool.acquire.assert_not_called()
+        channel, on_notify = first.add_listener.await_args.args
+        assert channel == REFRESH_CHANNEL
+
+        on_notify(first, 1234, REFRESH_CHANNEL, '')
+        await updater._refresh_task
+        updater._run_update.assert_awaited_once_with(True)
+
+        if hasattr(signal, 'SIGUSR1'):
+            asyncio.get_running_loop().add_signal_handler(signal.SIGUSR1, updater.request_refresh)
+            os.kill(os.getpid(), signal.SIGUSR1)
+            while updater._run_update.await_count < 2:
+                await asyncio.sleep(0.01)
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR1)
+
+        # Si la conexión se cae, se vuelve a abrir (reintentando si el servidor no responde)
+        on_terminated, = first.add_termination_listener.call_args.args
+        on_terminated(first)
+        await updater._reconnect_task
+        assert connect.await_count == 3
+        assert updater._listener is second
+        second.add_listener.assert_awaited_once_with(REFRESH_CHANNEL, on_notify)
+
+        await updater.close()
+        second.remove_termination_listener.assert_called_once_with(on_terminated)
+        second.close.assert_awaited_once()
+
+    asyncio.run(main())
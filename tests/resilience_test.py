@@ -0,0 +1,212 @@
+import asyncio
+import pytest
+import requests
+from resilience import AdaptiveLimiter, CircuitBreaker, ResilientTransport, parse_retry_after
+from scraper import Scraper
+from transport import HttpTransport
+from benchmarks.quotes_site import QuotesSite
+
+
+def make_response(status, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    response.url = 'https://quotes.example/page/1/'
+    return response
+
+
+class ScriptedTransport:
+    # Devuelve (o lanza) los resultados de `script` en orden, y después siempre un 200
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        result = self.script.pop(0) if self.script else make_response(200)
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    def close(self):
+        pass
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def make_transport(script, **options):
+    clock = FakeClock()
+    inner = ScriptedTransport(script)
+    transport = ResilientTransport(inner, sleep=clock.sleep, clock=clock, random=lambda: 1.0, **options)
+    return transport, inner, clock
+
+
+def test_transient_errors_are_retried_with_exponential_backoff():
+    transport, inner, clock = make_transport(
+        [make_response(503), requests.exceptions.ReadTimeout('timeout'), make_response(502)], backoff=0.5)
+
+    response = transport.get('https://quotes.example/page/1/')
+
+    assert response.status_code == 200
+    assert inner.calls == 4
+    assert clock.sleeps == [0.5, 1.0, 2.0]
+    assert transport.metrics.counter_value('scraper_retries_total', host='quotes.example', reason='503') == 1
+    assert transport.metrics.counter_value('scraper_retries_total', host='quotes.example', reason='ReadTimeout') == 1
+
+
+def test_retry_after_is_honored_and_too_long_waits_are_not():
+    transport, inner, clock = make_transport([make_response(429, {'Retry-After': '7'})])
+    assert transport.get('https://quotes.example/page/1/').status_code == 200
+    assert clock.sleeps == [7.0]
+
+    transport, inner, clock = make_transport([make_response(503, {'Retry-After': '3600'})], max_retry_after=60)
+    assert transport.get('https://quotes.example/page/1/').status_code == 503
+    assert inner.calls == 1
+
+
+def test_exhausted_retries_return_last_response_or_raise():
+    transport, inner, _ = make_transport([make_response(500)] * 3, max_retries=2)
+    assert transport.get('https://quotes.example/page/1/').status_code == 500
+    # Un 404 no se reintenta
+    transport, inner, _ = make_transport([make_response(404)])
+    assert transport.get('https://quotes.example/page/1/').status_code == 404
+    assert inner.calls == 1
+
+    transport, _, _ = make_transport([requests.exceptions.ConnectionError('caído')] * 2, max_retries=1)
+    with pytest.raises(requests.exceptions.ConnectionError):
+        transport.get('https://quotes.example/page/1/')
+
+
+def test_parse_retry_after_http_date():
+    response = make_response(503, {'Retry-After': 'Wed, 21 Oct 2015 07:28:30 GMT'})
+    assert parse_retry_after(response, now=lambda: 1445412480) == 30
+    assert parse_retry_after(make_response(503, {'Retry-After': 'pronto'})) is None
+    assert parse_retry_after(make_response(503)) is None
+
+
+def test_circuit_breaker_opens_and_probes():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    assert not breaker.record_failure()
+    assert breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert breaker.wait_time() == 10
+
+    clock.now = 10
+    # Semiabierto: una sola petición de prueba
+    assert breaker.wait_time() == 0
+    assert breaker.wait_time() > 0
+    assert breaker.record_failure()
+    assert breaker.wait_time() == 10
+
+    clock.now = 20
+    assert breaker.wait_time() == 0
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.opened == 2
+
+
+def test_open_circuit_pauses_requests_to_the_host():
+    transport, inner, clock = make_transport([make_response(503)] * 3, failure_threshold=3, reset_timeout=20,
+                                             max_retries=5, backoff=0.5)
+
+    assert transport.get('https://quotes.example/page/1/').status_code == 200
+    # Tras el tercer fallo se espera a que el interruptor admita una prueba
+    assert clock.sleeps[:2] == [0.5, 1.0]
+    assert sum(clock.sleeps) >= 20
+    assert transport.metrics.counter_value('scraper_circuit_opened_total', host='quotes.example') == 1
+    assert transport.breaker_for('quotes.example').state == CircuitBreaker.CLOSED
+
+
+def test_adaptive_limiter_is_aimd():
+    limiter = AdaptiveLimiter(maximum=16, latency_tolerance=0.05)
+
+    # Arranque lento: una unidad por respuesta
+    for _ in range(5):
+        limiter.release(limiter.acquire(), latency=0.01)
+    assert limiter.limit == 6
+
+    # Las peticiones de la misma ventana reducen el límite una sola vez
+    windows = [limiter.acquire() for _ in range(4)]
+    for window in windows:
+        limiter.release(window, congested=True)
+    assert limiter.limit == 3
+    assert limiter.in_flight == 0
+
+    # Después, aumento aditivo: una unidad por cada `limit` respuestas
+    for _ in range(3):
+        limiter.release(limiter.acquire(), latency=0.01)
+    assert limiter.limit == pytest.approx(4, abs=0.1)
+
+    # Una respuesta lenta también es congestión
+    limiter.release(limiter.acquire(), latency=1.0)
+    assert limiter.limit == pytest.approx(2, abs=0.1)
+
+
+def test_scraper_survives_server_errors():
+    with QuotesSite(pages=3, quotes_per_page=5, authors=4, tags=6, error_rate=0.3) as site:
+        transport = ResilientTransport(HttpTransport(), max_retries=10, sleep=lambda seconds: None)
+        scraper = Scraper(site.url, transport=transport)
+        frases_df, _ = scraper.scrape_quotes()
+        errors = site.errors
+
+    assert errors > 0
+    assert len(frases_df) == 15
+
+
+def test_failed_listing_page_is_skipped():
+    with QuotesSite(pages=3, quotes_per_page=5, authors=4, tags=6) as site:
+        class BrokenPage(HttpTransport):
+            def get(self, url, **kwargs):
+                if url == site.url + 'page/2/':
+                    raise requests.exceptions.ConnectionError('caído')
+                return super().get(url, **kwargs)
+
+        scraper = Scraper(site.url, transport=BrokenPage())
+        frases_df, _ = scraper.scrape_quotes()
+        async_scraper = Scraper(site.url, transport=BrokenPage())
+        async_frases_df, _ = asyncio.run(async_scraper.scrape_quotes_async(concurrency=2))
+
+    # Las páginas 1 y 3 se recorren igualmente
+    assert len(frases_df) == 10
+    assert scraper.metrics.counter_value('scraper_failed_urls_total', page_type='listing') == 1
+    assert sorted(async_frases_df['frase_texto']) == sorted(frases_df['frase_texto'])
+
+
+def test_quote_is_kept_when_its_author_keeps_failing():
+    with QuotesSite(pages=1, quotes_per_page=5, authors=4, tags=6) as site:
+        class BrokenAuthors(HttpTransport):
+            def __init__(self):
+                super().__init__()
+                self.author_calls = 0
+
+            def get(self, url, **kwargs):
+                if '/author/' in url:
+                    self.author_calls += 1
+                    return make_response(503)
+                return super().get(url, **kwargs)
+
+        inner = BrokenAuthors()
+        options = dict(max_retries=2, failure_threshold=1000, sleep=lambda seconds: None)
+        frases_df, _ = Scraper(site.url, transport=ResilientTransport(inner, **options)).scrape_quotes()
+        async_scraper = Scraper(site.url, transport=ResilientTransport(BrokenAuthors(), **options))
+        async_frases_df, _ = asyncio.run(async_scraper.scrape_quotes_async())
+
+    # Agotados los reintentos, las frases se conservan con los datos del autor vacíos
+    assert inner.author_calls > 0 and inner.author_calls % 3 == 0
+    assert len(frases_df) == 5
+    assert len(async_frases_df) == 5
+    assert frases_df['autor_nombre'].notna().all()
+    assert frases_df['autor_descripcion'].isna().all()
@@ -0,0 +1,66 @@
+import os
+import pytest
+import requests
+from response_store import ReplayTransport, RecordingTransport, ResponseStore
+from scraper import Scraper
+from transport import HttpTransport
+from benchmarks.quotes_site import QuotesSite
+
+
+def test_store_round_trip_and_dedup(tmp_path):
+    store = ResponseStore(str(tmp_path))
+    body = '<html>“Frase” de prueba</html>'.encode('utf-8')
+    store.put('https://quotes.example/page/1/', 200, body, 'utf-8', {'ETag': '"abc"', 'Server': 'x'})
+    store.put('https://quotes.example/page/2/', 200, body, 'utf-8')
+    store.close()
+    # El cuerpo repetido se guarda una sola vez
+    assert os.path.getsize(tmp_path / ResponseStore.BODIES_FILE) < len(body) + 20
+
+    with open(tmp_path / ResponseStore.INDEX_FILE, 'a', encoding='utf-8') as f:
+        f.write('{"url": "https://quotes.example/pa')  # Línea a medio escribir
+
+    store = ResponseStore(str(tmp_path))
+    response = store.get('https://quotes.example/page/1/')
+    assert len(store) == 2
+    assert response.status_code == 200
+    assert response.text == '<html>“Frase” de prueba</html>'
+    assert response.headers['etag'] == '"abc"'
+    assert 'Server' not in response.headers
+    assert store.get('https://quotes.example/page/3/') is None
+    store.close()
+
+
+def test_record_after_a_truncated_index_line_survives_reopening(tmp_path):
+    store = ResponseStore(str(tmp_path))
+    store.put('https://quotes.example/page/1/', 200, b'uno')
+    store.close()
+    with open(tmp_path / ResponseStore.INDEX_FILE, 'a', encoding='utf-8') as f:
+        f.write('{"url": "https://quotes.example/pa')  # Línea a medio escribir
+
+    store = ResponseStore(str(tmp_path))
+    store.put('https://quotes.example/page/2/', 200, b'dos')
+    store.close()
+
+    # El registro nuevo no queda pegado a la línea cortada
+    store = ResponseStore(str(tmp_path))
+    assert sorted(store.urls()) == ['https://quotes.example/page/1/', 'https://quotes.example/page/2/']
+    assert store.get('https://quotes.example/page/2/').content == b'dos'
+    store.close()
+
+
+def test_replay_without_network(tmp_path):
+    with QuotesSite(pages=3, quotes_per_page=4, authors=5, tags=6) as site:
+        store = ResponseStore(str(tmp_path))
+        recorded_df, _ = Scraper(site.url, transport=RecordingTransport(HttpTransport(), store)).scrape_quotes()
+        url = site.url
+
+    # El servidor ya no existe: todas las respuestas salen del almacén
+    transport = ReplayTransport(ResponseStore(str(tmp_path)))
+    replayed_df, _ = Scraper(url, transport=transport).scrape_quotes()
+
+    assert replayed_df.to_dict('records') == recorded_df.to_dict('records')
+    assert transport.misses == []
+    missing = transport.get(url + 'page/99/')
+    with pytest.raises(requests.exceptions.HTTPError):
+        missing.raise_for_status()
+    assert transport.misses == [url + 'page/99/']
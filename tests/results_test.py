@@ -0,0 +1,78 @@
+from results import ScrapeResult
+from save_data_to_db import AsyncDataSaver
+from scraper import Scraper
+from transport import HttpTransport
+from benchmarks.quotes_site import QuotesSite
+
+
+def make_rows(n_quotes, n_authors):
+    return [{
+        'frase_texto': f"Frase {i}",
+        'autor_nombre': f"Nombre{i % n_authors}",
+        'autor_apellido': f"Apellido {i % n_authors}",
+        'autor_url': f"https://quotes.example/author/{i % n_authors}",
+        'autor_fecha_nac': 'January 1, 1900',
+        'autor_lugar_nac': 'in Madrid',
+        'autor_descripcion': ' Lorem ipsum dolor sit amet. ' * 40,
+        'Tags': ['vida', 'amor'][:i % 3],
+        'Tags_IDs': [1, 2][:i % 3],
+        'fuente': 'quotes.example',
+    } for i in range(n_quotes)]
+
+
+def test_authors_are_stored_once():
+    result = ScrapeResult()
+    rows = make_rows(1000, 10)
+    result.add_rows(rows[:500])
+    result.add_rows(rows[500:])
+
+    assert len(result) == 1000
+    assert len(result.authors) == 10
+    assert result.authors['autor_descripcion'][0] == rows[0]['autor_descripcion'].strip()
+    assert result.quotes['autor_id'].dtype == 'int32'
+    assert str(result.quotes['fuente'].dtype) == 'category'
+    assert result.quote_tags['tag_id'].dtype == 'int32'
+    assert len(result.quote_tags) == sum(len(row['Tags_IDs']) for row in rows)
+    assert result.tags.to_dict('records') == [{'tag_texto': 'vida', 'tag_id': 1}, {'tag_texto': 'amor', 'tag_id': 2}]
+
+    # La memoria crece con los autores distintos, no con frases × biografía
+    flat_df, _ = AsyncDataSaver.batch_to_frames(rows)
+    assert result.memory_usage() * 5 < flat_df.memory_usage(deep=True).sum()
+
+
+def test_missing_author_details_do_not_overwrite_known_ones():
+    result = ScrapeResult()
+    row, = make_rows(1, 1)
+    result.add_rows([row, dict(row, frase_texto='Otra frase', autor_fecha_nac=None, autor_lugar_nac=None,
+                               autor_descripcion=None)])
+
+    assert result.authors.to_dict('records')[0]['autor_lugar_nac'] == 'in Madrid'
+    assert result.authors['autor_descripcion'][0] == row['autor_descripcion'].strip()
+
+
+def test_to_frames_matches_flat_rows():
+    rows = make_rows(7, 3)
+    rows[2] = dict(rows[2], fuente=None)
+    result = ScrapeResult()
+    result.add_rows(rows)
+
+    frases_df, tags_df = result.to_frames()
+    expected = [dict(row, autor_descripcion=row['autor_descripcion'].strip()) for row in rows]
+    assert frases_df[list(rows[0])].to_dict('records') == expected
+    assert [ids.tolist() for ids in result.tag_ids()] == [row['Tags_IDs'] for row in rows]
+    assert sorted(tags_df['tag_id']) == [1, 2]
+
+
+def test_scraper_builds_result_while_crawling():
+    with QuotesSite(pages=3, quotes_per_page=4, authors=5, tags=6) as site:
+        scraper = Scraper(site.url, transport=HttpTransport())
+        result = scraper.scrape_result()
+        expected_df, expected_tags_df = Scraper(site.url, transport=HttpTransport()).scrape_quotes()
+
+    frases_df, tags_df = result.to_frames()
+    assert len(result.authors) == 5
+    assert list(frases_df['frase_texto']) == list(expected_df['frase_texto'])
+    assert list(frases_df['autor_descripcion']) == list(expected_df['autor_descripcion'])
+    assert list(frases_df['Tags_IDs']) == list(expected_df['Tags_IDs'])
+    assert len(tags_df) == len(expected_tags_df)
+
@@ -0,0 +1,185 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+from results import ScrapeResult
+from save_data_to_db import AsyncDataSaver
+
+ROW = {
+    'frase_texto': 'Test quote',
+    'autor_nombre': 'Test',
+    'autor_apellido': 'Author',
+    'autor_url': 'https://quotes.toscrape.com/author/test_author',
+    'autor_fecha_nac': 'January 1, 1900',
+    'autor_lugar_nac': 'in Testland',
+    'autor_descripcion': 'Test author description.',
+    'Tags': ['test', 'quote'],
+    'Tags_IDs': [1, 2]
+}
+
+
+def make_saver(mode='rows'):
+    saver = AsyncDataSaver('quotes_db', 'postgres', 'postgres', 'localhost', 5432, mode=mode)
+    conn = MagicMock()
+    conn.execute = AsyncMock()
+    conn.copy_records_to_table = AsyncMock()
+    conn.fetchval = AsyncMock(return_value=1)
+    conn.fetch = AsyncMock(side_effect=[
+        [{'inserted': True}],
+        [{'autor_id': 7, 'autor_nombre': 'Test', 'autor_apellido': 'Author', 'inserted': False, 'written': True}],
+        [{'frase_id': 3, 'frase_texto': 'Test quote', 'inserted': False, 'written': False}],
+        [{'frase_id': 3}]
+    ])
+    conn.close = AsyncMock()
+    conn.transaction.return_value.__aenter__ = AsyncMock()
+    conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    async def connect():
+        saver.conn = conn
+
+    saver.connect = connect
+    return saver, conn
+
+
+def test_batch_to_frames_collects_batch_tags():
+    frases_df, tags_df = AsyncDataSaver.batch_to_frames([ROW, dict(ROW, Tags=['test'], Tags_IDs=[1])])
+
+    assert len(frases_df) == 2
+    assert sorted(tags_df['tag_id']) == [1, 2]
+
+
+def test_save_stream_commits_each_batch():
+    saver, conn = make_saver()
+
+    async def batches():
+        yield [ROW]
+        yield []
+        yield [dict(ROW, frase_texto='Another quote')]
+
+    total = asyncio.run(saver.save_stream(batches()))
+
+    assert total == 2
+    # Una transacción por lote no vacío y una sola conexión para todo el flujo
+    assert conn.transaction.call_count == 2
+    conn.close.assert_awaited_once()
+
+
+def test_copy_mode_uses_staging_tables():
+    saver, conn = make_saver(mode='copy')
+    frases_df, tags_df = AsyncDataSaver.batch_to_frames([ROW] * 50)
+
+    asyncio.run(saver.save_to_database(frases_df, tags_df))
+
+    # Dos COPY y un número fijo de sentencias, independiente del número de filas
+    assert conn.copy_records_to_table.await_count == 2
+    assert conn.execute.await_count == 5
+    conn.fetchval.assert_not_awaited()
+    staged = conn.copy_records_to_table.await_args_list[1].kwargs['records']
+    assert len(staged) == 50
+    assert staged[0][-1] == [1, 2]
+
+
+def test_batch_mode_resolves_ids_in_memory():
+    saver, conn = make_saver(mode='batch')
+    frases_df, tags_df = AsyncDataSaver.batch_to_frames([ROW] * 50)
+
+    asyncio.run(saver.save_to_database(frases_df, tags_df))
+
+    # Sin consultas por frase: autores y frases se resuelven con RETURNING
+    conn.fetchval.assert_not_awaited()
+    assert conn.fetch.await_count == 4
+    autores_args = conn.fetch.await_args_list[1].args
+    assert autores_args[1] == ['Test']
+    frases_args = conn.fetch.await_args_list[2].args
+    # Sin columna 'fuente' en las filas, la fuente de la frase queda en NULL
+    assert frases_args[1:] == (['Test quote'], [7], [None])
+    frase_tag_args = conn.fetch.await_args_list[3].args
+    assert sorted(zip(frase_tag_args[1], frase_tag_args[2])) == [(3, 1), (3, 2)]
+
+    # Contadores de filas insertadas, actualizadas y sin cambios
+    assert saver.stats['tag'] == {'inserted': 1, 'updated': 0, 'unchanged': 1}
+    assert saver.stats['autor'] == {'inserted': 0, 'updated': 1, 'unchanged': 0}
+    assert saver.stats['frase'] == {'inserted': 0, 'updated': 0, 'unchanged': 1}
+    assert saver.stats['frase_tag'] == {'inserted': 1, 'updated': 0, 'unchanged': 1}
+
+
+def test_batch_mode_loads_normalized_result_once():
+    saver, conn = make_saver(mode='batch')
+    result = ScrapeResult()
+    result.add_rows([dict(ROW, fuente='quotes.toscrape.com')] * 50)
+    result.add_tags({'test': 1, 'quote': 2})
+
+    asyncio.run(saver.save_result(result))
+
+    # Las mismas cuatro sentencias, con un solo autor aunque aparezca en 50 frases
+    conn.transaction.assert_called_once()
+    assert conn.fetch.await_count == 4
+    assert conn.fetch.await_args_list[0].args[1:] == ([1, 2], ['test', 'quote'])
+    autores_args = conn.fetch.await_args_list[1].args
+    assert autores_args[1:] == (['Test'], ['Author'], [ROW['autor_url']], [ROW['autor_fecha_nac']],
+                                [ROW['autor_lugar_nac']], [ROW['autor_descripcion']])
+    frases_args = conn.fetch.await_args_list[2].args
+    assert frases_args[1:] == (['Test quote'], [7], ['quotes.toscrape.com'])
+    frase_tag_args = conn.fetch.await_args_list[3].args
+    assert sorted(zip(frase_tag_args[1], frase_tag_args[2])) == [(3, 1), (3, 2)]
+    conn.close.assert_awaited_once()
+
+
+def test_pool_connection_is_borrowed_and_returned():
+    conn = MagicMock()
+    conn.transaction.return_value.__aenter__ = AsyncMock()
+    conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+    pool = MagicMock()
+    pool.acquire = AsyncMock(return_value=conn)
+    pool.release = AsyncMock()
+    saver = AsyncDataSaver('quotes_db', 'postgres', 'postgres', 'localhost', 5432, mode='rows', pool=pool)
+
+    asyncio.run(saver.save_stream([[ROW]]))
+
+    # La conexión vuelve al pool en lugar de cerrarse
+    pool.acquire.assert_awaited_once()
+    pool.release.assert_awaited_once_with(conn)
+    conn.close.assert_not_called()
+
+
+def test_pool_connection_is_returned_when_the_save_fails():
+    conn = MagicMock()
+    conn.transaction.return_value.__aenter__ = AsyncMock(side_effect=ConnectionResetError("conexión perdida"))
+    conn.transaction.return_value.__aexit__ = AsyncMock(return_value=False)
+    pool = MagicMock()
+    pool.acquire = AsyncMock(return_value=conn)
+    pool.release = AsyncMock()
+    saver = AsyncDataSaver('quotes_db', 'postgres', 'postgres', 'localhost', 5432, mode='rows', pool=pool)
+    frases_df, tags_df = AsyncDataSaver.batch_to_frames([ROW])
+
+    with pytest.raises(ConnectionResetError):
+        asyncio.run(saver.save_to_database(frases_df, tags_df))
+
+    # El error no deja la conexión prestada para siempre
+    pool.release.assert_awaited_once_with(conn)
+
+
+def test_source_is_saved_with_each_quote():
+    saver, conn = make_saver(mode='copy')
+    frases_df, tags_df = AsyncDataSaver.batch_to_frames([dict(ROW, fuente='quotes.toscrape.com')])
+
+    asyncio.run(saver.save_to_database(frases_df, tags_df))
+
+    staged = conn.copy_records_to_table.await_args_list[1].kwargs['records']
+    assert staged[0][-2] == 'quotes.toscrape.com'
+
+
+def test_author_details_update_existing_authors_by_url():
+    saver, conn = make_saver('batch')
+    conn.fetch = AsyncMock(return_value=[{'autor_id': 7}])
+    url = 'https://quotes.toscrape.com/author/test_author'
+    details = {'author-born-date': 'January 1, 1900', 'author-born-location': 'in Testland',
+               'author-description': 'Nueva biografía.'}
+
+    assert asyncio.run(saver.save_author_details({url: details})) == 1
+    assert asyncio.run(saver.save_author_details({})) == 0
+
+    sql, *params = conn.fetch.call_args.args
+    assert sql.strip().startswith('UPDATE autor')
+    assert params == [[url], ['January 1, 1900'], ['in Testland'], ['Nueva biografía.']]
+    assert conn.fetch.await_count == 1
+    assert conn.close.await_count == 1
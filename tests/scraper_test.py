@@ -1,7 +1,9 @@
 import pytest
-from unittest.mock import patch, Mock
+from unittest.mock import Mock
 from scraper import Scraper
+from fingerprints import PageFingerprints
 import pandas as pd
+import asyncio
 import os
 
 """
@@ -13,11 +15,12 @@ para ejecutar indicar: pytest en el directorio raiz
 @pytest.fixture
 def scraper():
     base_url = "https://quotes.toscrape.com/"
-    return Scraper(base_url)
+    # El transporte HTTP se inyecta para no hacer peticiones reales
+    return Scraper(base_url, transport=Mock())
 
-@patch('scraper.requests.get')
-def test_get_author_details(mock_get, scraper):
-    # Configurar el mock para la respuesta de requests
+def test_get_author_details(scraper):
+    mock_get = scraper.transport.get
+    # Configurar el mock para la respuesta del transporte
     mock_response = Mock()
     mock_response.status_code = 200
     mock_response.text = """
@@ -38,25 +41,46 @@ def test_get_author_details(mock_get, scraper):
     assert details['author-born-location'] == 'in Testland'
     assert details['author-description'] == 'Test author description.'
 
-@patch('scraper.requests.get')
-def test_scrape_quotes(mock_get, scraper):
-    # Configurar el mock para la respuesta de requests
+QUOTES_PAGE_HTML = """
+<html>
+    <div class="quote">
+        <span class="text">“Test quote”</span>
+        <small class="author">Test Author</small>
+        <a href="/author/test_author">(author details)</a>
+        <div class="tags">
+            <a class="tag">test</a>
+            <a class="tag">quote</a>
+        </div>
+    </div>
+</html>
+"""
+
+AUTHOR_PAGE_HTML = """
+<html>
+    <span class="author-born-date">January 1, 1900</span>
+    <span class="author-born-location">in Testland</span>
+    <div class="author-description">  Test author description.  </div>
+</html>
+"""
+
+
+def fake_site(url):
+    # Solo la primera página del listado tiene frases; el resto vienen vacías
     mock_response = Mock()
     mock_response.status_code = 200
-    mock_response.text = """
-    <html>
-        <div class="quote">
-            <span class="text">“Test quote”</span>
-            <small class="author">Test Author</small>
-            <a href="/author/test_author">(author details)</a>
-            <div class="tags">
-                <a class="tag">test</a>
-                <a class="tag">quote</a>
-            </div>
-        </div>
-    </html>
-    """
-    mock_get.return_value = mock_response
+    if '/author/' in url:
+        mock_response.text = AUTHOR_PAGE_HTML
+    elif url.endswith('page/1/'):
+        mock_response.text = QUOTES_PAGE_HTML
+    else:
+        mock_response.text = "<html></html>"
+    return mock_response
+
+
+def test_scrape_quotes(scraper):
+    mock_get = scraper.transport.get
+    # Configurar el mock para la respuesta del transporte
+    mock_get.side_effect = fake_site
 
     # Probar el scraping
     frases_df, tags_df = scraper.scrape_quotes()
@@ -68,6 +92,61 @@ def test_scrape_quotes(mock_get, scraper):
     assert 'test' in frases_df.iloc[0]['Tags']
     assert 'quote' in frases_df.iloc[0]['Tags']
 
+def test_scrape_quotes_async():
+    transport = Mock()
+    transport.get.side_effect = fake_site
+
+    sync_df, sync_tags = Scraper("https://quotes.toscrape.com/", transport=transport).scrape_quotes()
+    async_df, async_tags = asyncio.run(
+        Scraper("https://quotes.toscrape.com/", transport=transport).scrape_quotes_async(concurrency=4)
+    )
+
+    # El modo concurrente debe producir exactamente las mismas filas
+    pd.testing.assert_frame_equal(sync_df, async_df)
+    pd.testing.assert_frame_equal(sync_tags, async_tags)
+    assert async_df.iloc[0]['autor_descripcion'] == 'Test author description.'
+
+def test_iter_quotes_yields_one_batch_per_page(scraper):
+    scraper.transport.get.side_effect = fake_site
+
+    batches = list(scraper.iter_quotes())
+
+    # Una sola página con frases; la página vacía termina el recorrido
+    assert len(batches) == 1
+    assert batches[0][0]['frase_texto'] == '“Test quote”'
+    assert batches[0][0]['Tags_IDs'] == [1, 2]
+
+def test_incremental_scrape_skips_unchanged_pages():
+    transport = Mock()
+    transport.get.side_effect = fake_site
+
+    first = Scraper("https://quotes.toscrape.com/", transport=transport, fingerprints=PageFingerprints())
+    first_batches = list(first.iter_quotes())
+    assert len(first_batches) == 1
+
+    # Segunda ejecución con las huellas de la primera: la página 1 no ha cambiado
+    previous = PageFingerprints(first.fingerprints.changed)
+    second = Scraper("https://quotes.toscrape.com/", transport=transport, fingerprints=previous)
+    second.seed_tags(first.tags_dict)
+
+    assert list(second.iter_quotes()) == []
+    # La página 1 y, revisada aparte, la de su autor
+    assert previous.stats['unchanged'] == 2
+    assert second.next_tag_id == 3
+
+def test_author_details_fetched_once_per_author(scraper):
+    mock_get = scraper.transport.get
+    mock_get.side_effect = fake_site
+    autor_url = scraper.base_url + 'author/test_author'
+
+    # Varias frases del mismo autor solo descargan su página una vez
+    for _ in range(3):
+        details = scraper.get_author_details(autor_url)
+
+    assert details['author-born-location'] == 'in Testland'
+    author_calls = [c for c in mock_get.call_args_list if '/author/' in c.args[0]]
+    assert len(author_calls) == 1
+
 def test_save_to_excel(scraper):
     # Crear dataframes de prueba
     frases_df = pd.DataFrame({
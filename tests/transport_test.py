@@ -0,0 +1,29 @@
+import time
+from unittest.mock import patch
+from transport import HttpTransport, TokenBucket
+
+
+def test_token_bucket_limits_rate():
+    bucket = TokenBucket(rate=10, capacity=2)
+
+    # La ráfaga inicial no espera; las siguientes se espacian a 1/rate segundos
+    start = time.monotonic()
+    waits = [bucket.acquire() for _ in range(4)]
+    elapsed = time.monotonic() - start
+
+    assert waits[0] == 0 and waits[1] == 0
+    assert waits[2] > 0 and waits[3] > 0
+    assert 0.18 < elapsed < 0.5
+
+
+def test_transport_uses_pooled_session_with_timeout():
+    transport = HttpTransport(pool_size=4, timeout=(1, 2), rate_limit=1000)
+
+    with patch.object(transport.session, 'get') as mock_get:
+        transport.get('https://quotes.toscrape.com/page/1/')
+        transport.get('https://example.com/')
+
+    mock_get.assert_called_with('https://example.com/', timeout=(1, 2))
+    assert transport.session.get_adapter('https://quotes.toscrape.com/')._pool_maxsize == 4
+    # Un limitador independiente por host
+    assert set(transport._buckets) == {'quotes.toscrape.com', 'example.com'}
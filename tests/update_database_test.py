@@ -0,0 +1,76 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+import pytest
+import update_database
+from fingerprints import PageFingerprints
+from update_database import DatabaseUpdater
+
+
+class FakeCrawler:
+    instances = []
+
+    def __init__(self, sites, **options):
+        self.options = options
+        self.author_updates = {}
+        self.instances.append(self)
+
+    def seed_tags(self, tags):
+        pass
+
+    async def aiter_quotes(self):
+        yield [{'frase_texto': '“Una frase.”'}]
+
+
+class FakeSaver:
+    def __init__(self, *args, **kwargs):
+        self.errors = 0
+        self.stats = {'frase': {'inserted': 1, 'updated': 0, 'unchanged': 0}}
+
+    async def save_stream(self, stream):
+        return sum([len(rows) async for rows in stream])
+
+    async def save_author_details(self, details_by_url):
+        return len(details_by_url)
+
+
+@pytest.fixture
+def updater(monkeypatch):
+    conn = MagicMock()
+    conn.fetch = AsyncMock(return_value=[])
+    pool = MagicMock()
+    pool.acquire.return_value.__aenter__ = AsyncMock(return_value=conn)
+    pool.acquire.return_value.__aexit__ = AsyncMock(return_value=False)
+
+    monkeypatch.setattr(update_database, 'MultiSiteCrawler', FakeCrawler)
+    monkeypatch.setattr(update_database, 'AsyncDataSaver', FakeSaver)
+    monkeypatch.setattr(update_database, 'load_fingerprints', AsyncMock(return_value=PageFingerprints()))
+    monkeypatch.setattr(update_database, 'load_schedule', AsyncMock(return_value=None))
+    for name in ('save_fingerprints', 'save_schedule', 'refresh_statistics', 'bump_data_version'):
+        monkeypatch.setattr(update_database, name, AsyncMock())
+    return DatabaseUpdater('quotes_db', 'postgres', 'postgres', 'localhost', 5432, pool=pool)
+
+
+def test_fingerprints_are_saved_after_the_statistics_refresh(updater):
+    update_database.refresh_statistics.side_effect = OSError('sin conexión')
+    asyncio.run(updater._run_update())
+
+    # Sin estadísticas recalculadas no se guardan las huellas: la siguiente ejecución repite el recálculo
+    update_database.bump_data_version.assert_not_awaited()
+    update_database.save_fingerprints.assert_not_awaited()
+    assert updater.metrics.counter_value('updater_runs_total', outcome='error') == 1
+
+    update_database.refresh_statistics.side_effect = None
+    asyncio.run(updater._run_update())
+    update_database.bump_data_version.assert_awaited_once()
+    update_database.save_fingerprints.assert_awaited_once()
+    assert updater.metrics.counter_value('updater_runs_total', outcome='ok') == 1
+
+
+def test_full_and_forced_runs_do_not_reuse_cached_authors(updater):
+    FakeCrawler.instances.clear()
+    asyncio.run(updater._run_update())
+    asyncio.run(updater._run_update(force=True))
+    updater.incremental = False
+    asyncio.run(updater._run_update())
+
+    assert [crawler.options['refresh_authors'] for crawler in FakeCrawler.instances] == [False, True, True]
@@ -0,0 +1,78 @@
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+class TokenBucket:
+    """
+    Limitador de peticiones por cubo de tokens: permite ráfagas de hasta `capacity`
+    peticiones y un ritmo sostenido de `rate` peticiones por segundo. Es seguro entre hilos.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """
+        Consume un token, esperando lo necesario si el cubo está vacío.
+        Devuelve los segundos esperados.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            # El saldo puede quedar negativo: cada hilo reserva su turno y espera fuera del lock
+            self._tokens -= 1
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0
+
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+class HttpTransport:
+    """
+    Capa de transporte HTTP del scraper: una sesión de `requests` con conexiones
+    keep-alive reutilizadas, tamaño de pool configurable, timeouts y un límite de
+    peticiones por segundo independiente para cada host.
+    """
+
+    def __init__(self, pool_size=10, timeout=(5, 30), rate_limit=None, burst=None, headers=None):
+        self.timeout = timeout
+        self.rate_limit = rate_limit
+        self.burst = burst
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        if headers:
+            self.session.headers.update(headers)
+
+    def _bucket_for(self, url):
+        host = urlsplit(url).netloc
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.rate_limit, self.burst)
+                self._buckets[host] = bucket
+        return bucket
+
+    def get(self, url, **kwargs):
+        """
+        Realiza una petición GET respetando el límite de peticiones del host.
+        """
+        if self.rate_limit:
+            self._bucket_for(url).acquire()
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.get(url, **kwargs)
+
+    def close(self):
+        self.session.close()
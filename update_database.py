@@ -1,32 +1,139 @@
+import argparse
 import asyncio
+import os
+import signal
 import asyncpg
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
-from scraper import Scraper
+from crawler import MultiSiteCrawler
+from sites import get_site
+from author_cache import AuthorCache
 import db  # Asegúrate de que este módulo tenga la configuración de la base de datos
 from save_data_to_db import AsyncDataSaver
+from fingerprints import PageFingerprints, load_fingerprints, save_fingerprints
+from recrawl import REFRESH_CHANNEL, load_schedule, save_schedule
+from data_cache import bump_data_version
+from create_database import refresh_statistics
+from metrics import Metrics, serve_metrics, write_run_summary
+from datetime import datetime
 import time  # Para medir el tiempo de ejecución
 
 class DatabaseUpdater:
-    def __init__(self, db_name, db_user, db_password, db_host, db_port):
+    # Espera antes de reintentar la conexión de LISTEN perdida; se duplica en cada intento fallido
+    LISTEN_RETRY_DELAY = 1
+    LISTEN_MAX_RETRY_DELAY = 60
+
+    def __init__(self, db_name, db_user, db_password, db_host, db_port, concurrency=8,
+                 author_cache_path=None, author_cache_ttl=7 * 24 * 3600, rate_limit=None,
+                 load_mode='batch', incremental=True, pool=None, metrics=None, metrics_dir=None,
+                 sites=('quotes.toscrape.com',), parse_workers=0, follow_links=False, bloom_capacity=None,
+                 recrawl=True, recrawl_intervals=None):
         self.db_name = db_name
         self.db_user = db_user
         self.db_password = db_password
         self.db_host = db_host
         self.db_port = db_port
+        self.concurrency = concurrency
+        self.load_mode = load_mode
+        # En modo incremental se omiten las páginas cuyo contenido no cambió desde la última ejecución
+        self.incremental = incremental
+        # Pool de conexiones compartido con AsyncDataSaver; se crea en la primera ejecución si no se pasa
+        self.pool = pool
+        # La caché de autores se comparte entre ejecuciones del scheduler
+        self.author_cache = AuthorCache(path=author_cache_path, ttl=author_cache_ttl)
+        # Sitios a recorrer en paralelo, cada uno con su concurrencia y su límite de peticiones
+        self.sites = [get_site(site, concurrency=concurrency, rate_limit=rate_limit) for site in sites]
+        # Una sesión HTTP por sitio, reutilizada entre ejecuciones para aprovechar las conexiones keep-alive
+        self.transports = {}
+        # Procesos de parseo por sitio (ver Scraper.aiter_quotes)
+        self.parse_workers = parse_workers
+        # Seguir los enlaces de cada página (frontera con deduplicación de URLs y reintentos)
+        self.follow_links = follow_links
+        self.bloom_capacity = bloom_capacity
+        # Métricas acumuladas de todas las ejecuciones (las que expone el endpoint de Prometheus)
+        self.metrics = metrics if metrics is not None else Metrics()
+        # Carpeta donde se escriben metrics.prom y el resumen JSON de cada ejecución (None = no se escriben)
+        self.metrics_dir = metrics_dir
+        # Calendario de revisitas por URL (ver recrawl.py): cada ejecución pide solo las páginas que tocan
+        self.recrawl = recrawl
+        self.recrawl_intervals = recrawl_intervals
+        # Una sola actualización a la vez; un "actualizar ahora" durante una ejecución se hace al terminarla
+        self._running = False
+        self._refresh_pending = False
+        self._refresh_task = None
+        # Conexión propia (fuera del pool) que escucha REFRESH_CHANNEL, y su reconexión en curso
+        self._listener = None
+        self._listening = False
+        self._reconnect_task = None
 
-    async def update_database(self):
-        start_time = time.time()  # Marca el inicio del proceso
-        print("Iniciando actualización de base de datos...")
+    async def get_pool(self):
+        if self.pool is None:
+            self.pool = await db.create_pool(self.db_name, self.db_user, self.db_password,
+                                             self.db_host, self.db_port)
+        return self.pool
+
+    async def close(self):
+        self._listening = False
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            self._reconnect_task = None
+        if self._listener is not None:
+            listener, self._listener = self._listener, None
+            listener.remove_termination_listener(self._on_listener_terminated)
+            await listener.close()
+        if self.pool is not None:
+            await self.pool.close()
+            self.pool = None
+
+    @staticmethod
+    def _data_changed(data_saver, total):
+        # Los contadores solo existen en modo 'batch'; en los demás modos basta con haber guardado frases
+        if not data_saver.stats:
+            return total > 0
+        return any(counts['inserted'] or counts['updated'] for counts in data_saver.stats.values())
+
+    async def update_database(self, force=False):
+        """
+        Ejecuta una actualización. Con `force` se piden todas las páginas aunque según el
+        calendario aún no toquen ("actualizar ahora"). Nunca hay dos actualizaciones a la vez:
+        una ejecución programada que coincide con otra en curso se omite, y las peticiones de
+        actualizar ahora que llegan durante una ejecución se agrupan en una sola, al terminar.
+        """
+        if self._running:
+            if force:
+                self._refresh_pending = True
+                print("Hay una actualización en curso; la actualización inmediata se hará al terminar.")
+            else:
+                print("Hay una actualización en curso; se omite esta ejecución.")
+            return
+        self._running = True
+        try:
+            await self._run_update(force)
+            while self._refresh_pending:
+                self._refresh_pending = False
+                await self._run_update(force=True)
+        finally:
+            self._running = False
+
+    def request_refresh(self):
+        """
+        Pide una actualización inmediata de todas las páginas (señal SIGUSR1 o `NOTIFY actualizar_ahora`).
+        """
+        print("Actualización inmediata solicitada.")
+        self._refresh_task = asyncio.ensure_future(self.update_database(force=True))
+        return self._refresh_task
 
-        # Crear una instancia del scraper
-        base_url = "https://quotes.toscrape.com/"
-        scraper = Scraper(base_url)
-        
-        # Obtener datos de las citas y etiquetas
-        frases_df, tags_df = scraper.scrape_quotes()
+    def _on_refresh_notify(self, conn, pid, channel, payload):
+        self.request_refresh()
 
-        # Conectar a la base de datos
+    async def listen_for_refresh(self):
+        """
+        Escucha el canal REFRESH_CHANNEL: cualquier cliente de la base de datos puede pedir una
+        actualización inmediata con `NOTIFY actualizar_ahora`. Se usa una conexión propia, fuera
+        del pool, para no tener una conexión del pool prestada para siempre; si se pierde, se
+        vuelve a abrir en segundo plano (ver `_reconnect_listener`).
+        """
+        self._listening = True
         conn = await asyncpg.connect(
             database=self.db_name,
             user=self.db_user,
@@ -34,52 +141,215 @@ class DatabaseUpdater:
             host=self.db_host,
             port=self.db_port
         )
+        try:
+            await conn.add_listener(REFRESH_CHANNEL, self._on_refresh_notify)
+        except Exception:
+            await conn.close()
+            raise
+        conn.add_termination_listener(self._on_listener_terminated)
+        self._listener = conn
+
+    def _on_listener_terminated(self, conn):
+        if conn is not self._listener:
+            return
+        self._listener = None
+        if self._listening:
+            print(f"Se perdió la conexión que escucha el canal {REFRESH_CHANNEL}; reconectando...")
+            self._reconnect_task = asyncio.ensure_future(self._reconnect_listener())
+
+    async def _reconnect_listener(self):
+        delay = self.LISTEN_RETRY_DELAY
+        while self._listening:
+            try:
+                await self.listen_for_refresh()
+                print(f"Escuchando de nuevo el canal {REFRESH_CHANNEL}.")
+                return
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                print(f"No se pudo volver a escuchar el canal {REFRESH_CHANNEL}: {e}. Reintento en {delay} s.")
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, self.LISTEN_MAX_RETRY_DELAY)
+
+    async def _run_update(self, force=False):
+        start_time = time.time()  # Marca el inicio del proceso
+        started_at = datetime.now()
+        print("Iniciando actualización de base de datos...")
+        # Métricas de esta ejecución; al terminar se suman a las acumuladas
+        run_metrics = Metrics(self.metrics.buckets)
+        total = 0
+        outcome = 'error'
 
         try:
-            async with conn.transaction():
-                # Insertar o actualizar datos en la base de datos
-                data_saver = AsyncDataSaver(self.db_name, self.db_user, self.db_password, self.db_host, self.db_port)
-                await data_saver.save_to_database(frases_df, tags_df)
-                print("Actualización completada.")
+            pool = await self.get_pool()
+            with run_metrics.timer('updater_stage_seconds', stage='load_state'):
+                # Huellas de la ejecución anterior (o ninguna en una actualización completa)
+                async with pool.acquire() as conn:
+                    fingerprints = await load_fingerprints(conn) if self.incremental else PageFingerprints()
+                    if self.incremental and self.recrawl:
+                        fingerprints.schedule = await load_schedule(conn, self.recrawl_intervals, force=force)
+                    # Conservar los IDs de los tags ya guardados
+                    tags = await conn.fetch("SELECT tag_texto, tag_id FROM tag")
+
+            # Un scraper por sitio; todos comparten los IDs de tags y la caché de autores
+            crawler = MultiSiteCrawler(self.sites, author_cache=self.author_cache, fingerprints=fingerprints,
+                                       metrics=run_metrics, transports=self.transports,
+                                       parse_workers=self.parse_workers, follow_links=self.follow_links,
+                                       bloom_capacity=self.bloom_capacity,
+                                       refresh_authors=force or not self.incremental)
+            crawler.seed_tags({r['tag_texto']: r['tag_id'] for r in tags})
+
+            # Insertar o actualizar los datos a medida que el scraper entrega cada página
+            data_saver = AsyncDataSaver(self.db_name, self.db_user, self.db_password, self.db_host, self.db_port,
+                                        mode=self.load_mode, pool=pool, metrics=run_metrics)
+            with run_metrics.timer('updater_stage_seconds', stage='scrape_and_load'):
+                total = await data_saver.save_stream(crawler.aiter_quotes())
+                # Autores cuya página cambió sin que cambiara ninguna página del listado
+                authors_updated = await data_saver.save_author_details(crawler.author_updates)
+
+            if data_saver.errors:
+                outcome = 'partial'
+                print(f"Actualización con {data_saver.errors} lotes fallidos; no se guardan las huellas.")
+            else:
+                async with pool.acquire() as conn:
+                    # Recalcular las estadísticas y avisar al frontend (caché de DataFetcher) solo si algo cambió.
+                    # Las huellas se guardan después: si esto falla, la siguiente ejecución vuelve a ver los
+                    # cambios y repite el recálculo
+                    if self._data_changed(data_saver, total) or authors_updated:
+                        with run_metrics.timer('updater_stage_seconds', stage='refresh_statistics'):
+                            await refresh_statistics(conn)
+                        version = await bump_data_version(conn)
+                        print(f"Nueva versión de los datos: {version}")
+                    with run_metrics.timer('updater_stage_seconds', stage='save_fingerprints'):
+                        await save_fingerprints(conn, fingerprints)
+                        if fingerprints.schedule is not None:
+                            await save_schedule(conn, fingerprints.schedule)
+                outcome = 'ok'
+
+            print(f"Actualización completada. Frases procesadas: {total}, "
+                  f"autores actualizados fuera del listado: {authors_updated}")
+            print(f"Páginas sin cambios: {fingerprints.stats['unchanged']}, "
+                  f"con cambios o nuevas: {fingerprints.stats['changed']}")
+            if fingerprints.schedule is not None:
+                print(f"Páginas que tocaba revisar: {fingerprints.schedule.stats['due']}, "
+                      f"aplazadas según el calendario: {fingerprints.schedule.stats['skipped']}")
+            for table, counts in data_saver.stats.items():
+                print(f"  {table}: {counts['inserted']} insertadas, {counts['updated']} actualizadas, "
+                      f"{counts['unchanged']} sin cambios")
         except Exception as e:
             print(f"Error durante la actualización: {e}")
-        finally:
-            await conn.close()
 
         end_time = time.time()  # Marca el final del proceso
         elapsed_time = end_time - start_time
+        run_metrics.observe('updater_stage_seconds', elapsed_time, stage='total')
+        run_metrics.inc('updater_runs_total', outcome=outcome)
+        self._publish_metrics(run_metrics, started_at, elapsed_time, outcome, total)
         print(f"Tiempo total de actualización: {elapsed_time:.2f} segundos")
 
+    def _publish_metrics(self, run_metrics, started_at, elapsed_time, outcome, total):
+        self.metrics.merge(run_metrics)
+        if self.metrics_dir is None:
+            return
+        try:
+            self.metrics.write_prometheus(os.path.join(self.metrics_dir, 'metrics.prom'))
+            write_run_summary(os.path.join(self.metrics_dir, f"run_{started_at:%Y%m%d_%H%M%S}.json"), run_metrics,
+                              started_at=started_at.isoformat(timespec='seconds'), seconds=elapsed_time,
+                              outcome=outcome, frases=total)
+        except OSError as e:
+            print(f"No se pudieron escribir las métricas: {e}")
+
 # Configuración del scheduler
 def main():
+    parser = argparse.ArgumentParser(description="Actualización periódica de la base de datos de frases")
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="Número de peticiones simultáneas durante el scraping")
+    parser.add_argument('--author-cache', default=os.path.join('cache', 'autores.sqlite'),
+                        help="Archivo SQLite con los detalles de autores reutilizados entre ejecuciones")
+    parser.add_argument('--author-cache-ttl', type=int, default=7 * 24 * 3600,
+                        help="Segundos que se consideran vigentes los detalles de un autor")
+    parser.add_argument('--rate-limit', type=float, default=None,
+                        help="Máximo de peticiones por segundo a cada host")
+    parser.add_argument('--parse-workers', type=int, default=0,
+                        help="Procesos que parsean el HTML de cada sitio (0 = en el propio proceso)")
+    parser.add_argument('--follow-links', action='store_true',
+                        help="Seguir los enlaces 'Next' y de tags en lugar de numerar las páginas del listado")
+    parser.add_argument('--bloom-capacity', type=int, default=None,
+                        help="Con --follow-links, guardar las URLs vistas en un filtro de Bloom para este número de URLs")
+    parser.add_argument('--load-mode', choices=AsyncDataSaver.MODES, default='batch',
+                        help="Estrategia de carga en la base de datos")
+    parser.add_argument('--full', action='store_true',
+                        help="Procesar todas las páginas aunque no hayan cambiado, sin usar los autores de la caché")
+    parser.add_argument('--interval', type=int, default=3600,
+                        help="Segundos entre ejecuciones; cada una pide solo las páginas que tocan según el calendario")
+    parser.add_argument('--no-schedule', action='store_true',
+                        help="Pedir todas las páginas en cada ejecución, sin calendario de revisitas por URL")
+    parser.add_argument('--refresh-now', action='store_true',
+                        help="Hacer una actualización completa nada más arrancar")
+    parser.add_argument('--metrics-dir', default='metrics',
+                        help="Carpeta para metrics.prom y el resumen JSON de cada ejecución")
+    parser.add_argument('--metrics-port', type=int, default=None,
+                        help="Puerto en el que exponer /metrics para Prometheus (desactivado por defecto)")
+    args = parser.parse_args()
+
     db_name = db.DB_NAME
     db_user = db.DB_USER
     db_password = db.DB_PASSWORD
     db_host = db.DB_HOST
     db_port = db.DB_PORT
 
-    updater = DatabaseUpdater(db_name, db_user, db_password, db_host, db_port)
+    updater = DatabaseUpdater(db_name, db_user, db_password, db_host, db_port,
+                              concurrency=args.concurrency,
+                              author_cache_path=args.author_cache,
+                              author_cache_ttl=args.author_cache_ttl,
+                              rate_limit=args.rate_limit,
+                              load_mode=args.load_mode,
+                              incremental=not args.full,
+                              metrics_dir=args.metrics_dir,
+                              parse_workers=args.parse_workers,
+                              follow_links=args.follow_links,
+                              bloom_capacity=args.bloom_capacity,
+                              recrawl=not args.no_schedule)
+
+    if args.metrics_port is not None:
+        serve_metrics(updater.metrics, args.metrics_port)
+        print(f"Métricas disponibles en http://localhost:{args.metrics_port}/metrics")
 
     scheduler = AsyncIOScheduler()
 
-    # Programar la tarea para que se ejecute cada 24 horas (86400 segundos)
+    # Una ejecución cada `--interval` segundos; si una se alarga, las que coinciden con ella
+    # no se acumulan (una sola instancia, y las ejecuciones perdidas se agrupan en una)
     scheduler.add_job(
         updater.update_database,
-        trigger=IntervalTrigger(seconds=86400),
+        trigger=IntervalTrigger(seconds=args.interval),
+        id='update_database',
         name="Update Database",
+        max_instances=1,
+        coalesce=True,
+        misfire_grace_time=args.interval,
         replace_existing=True
     )
+    if args.refresh_now:
+        # Sin trigger: se ejecuta una vez, en cuanto arranca el scheduler
+        scheduler.add_job(updater.update_database, kwargs={'force': True}, name="Refresh now")
 
     # Iniciar el scheduler
     scheduler.start()
 
+    loop = asyncio.get_event_loop()
+    # "Actualizar ahora": con `kill -USR1 <pid>` o con `NOTIFY actualizar_ahora` desde la base de datos
+    if hasattr(signal, 'SIGUSR1'):
+        loop.add_signal_handler(signal.SIGUSR1, updater.request_refresh)
+    try:
+        loop.run_until_complete(updater.listen_for_refresh())
+    except Exception as e:
+        print(f"No se pudo escuchar el canal {REFRESH_CHANNEL}: {e}")
+
     # Mantener el script corriendo
     try:
         print("Scheduler iniciado. Presiona Ctrl+C para salir.")
-        asyncio.get_event_loop().run_forever()
+        loop.run_forever()
     except (KeyboardInterrupt, SystemExit):
         print("Deteniendo scheduler...")
         scheduler.shutdown()
+        asyncio.get_event_loop().run_until_complete(updater.close())
 
 if __name__ == "__main__":
     main()